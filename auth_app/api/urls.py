@@ -1,9 +1,10 @@
 from django.urls import path
 
-from .views import RegistrationAPIView, CustomLoginView, email_check_view
+from .views import RegistrationAPIView, CustomLoginView, email_check_view, user_search_view
 
 urlpatterns = [
     path('registration/', RegistrationAPIView.as_view(), name='registration'),
     path('login/', CustomLoginView.as_view(), name='login'),
-    path('email-check/', email_check_view)
+    path('email-check/', email_check_view),
+    path('users/search/', user_search_view, name='user_search')
 ]
@@ -1,4 +1,3 @@
-from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
@@ -7,6 +6,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from auth_app.directory import MIN_PREFIX_LENGTH, SEARCH_LIMIT, find_user_by_email, search_users
 from .serializers import CustomLoginEmailOnlySerializer, RegistrationSerializer
 
 
@@ -69,6 +69,8 @@ def email_check_view(request):
     """
     Check if a user exists with the provided email.
     Returns user details if found.
+
+    Thin wrapper over the cached user directory lookup.
     """
     email = request.query_params.get('email')
     
@@ -77,12 +79,31 @@ def email_check_view(request):
     if '@' not in email or '.' not in email:
         return Response({"Error": "Invalid email format"}, status=status.HTTP_400_BAD_REQUEST)
     
-    try:
-        user = User.objects.get(email=email)
-        return Response({
-            "id": user.id,
-            "email": user.email,
-            "fullname": user.first_name
-        })
-    except User.DoesNotExist:
+    user = find_user_by_email(email)
+    if user is None:
         return Response({"Error": "Email not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response(user)
+
+
+@api_view()
+def user_search_view(request):
+    """
+    Autocomplete users by email or full name prefix.
+
+    - Query parameter 'q' is required, with at least MIN_PREFIX_LENGTH
+      characters; 'limit' caps the result list, up to MAX_SEARCH_LIMIT.
+    - Hits and misses are cached briefly.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({"Error": "Query missing"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(query) < MIN_PREFIX_LENGTH:
+        return Response({"Error": f"Query needs at least {MIN_PREFIX_LENGTH} characters"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limit = int(request.query_params.get('limit', SEARCH_LIMIT))
+    except ValueError:
+        return Response({"Error": "Invalid limit"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(search_users(query, limit))
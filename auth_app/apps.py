@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_app'
+
+    def ready(self):
+        # Register the signal handlers for the token cache and user directory
+        from auth_app import signals  # noqa: F401
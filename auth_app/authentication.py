@@ -0,0 +1,195 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+DEFAULT_TOKEN_CACHE = {
+    # Entries kept in the process-local LRU
+    'MAX_SIZE': 10000,
+    # Seconds a cached token stays valid; bounds staleness across processes
+    # that do not share Django's cache
+    'TTL': 300,
+    # Also share entries between processes through Django's cache framework
+    'USE_DJANGO_CACHE': False,
+    # Seconds between checks for invalidations made by other processes
+    'POLL_INTERVAL': 1,
+}
+DJANGO_CACHE_KEY = 'kanmind:token:{key}'
+# When the tokens of a user were last invalidated, as a Unix timestamp
+INVALIDATED_KEY = 'kanmind:token-invalidated:{user_id}'
+# Changes on every invalidation; processes poll it to notice invalidations of others
+GENERATION_KEY = 'kanmind:token-generation'
+
+
+class TokenCache:
+    """
+    Bounded, TTL-based cache of token key -> Token (with its user).
+
+    - A process-local LRU answers most lookups without the database.
+    - Optionally, misses fall through to Django's cache framework before the database.
+    - Invalidation drops the local entries of the user, records a per-user
+      timestamp and changes a generation value in Django's cache.
+    - Local hits do not read Django's cache. Each process polls the
+      generation at most every POLL_INTERVAL seconds and drops all its
+      entries when it changed, so processes sharing the cache (CACHE_DIR
+      or any shared backend) reject a deleted token or deactivated user
+      within POLL_INTERVAL. Processes with their own cache keep their
+      entries for up to TTL.
+    - Entries from a query that ran before an invalidation are not stored.
+    - Records hits, misses and evictions for monitoring.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self._generation = None
+        self._polled_at = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def config(self):
+        return {**DEFAULT_TOKEN_CACHE, **getattr(settings, 'TOKEN_CACHE', {})}
+
+    def get(self, key):
+        self.poll()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= now:
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        if self.config['USE_DJANGO_CACHE']:
+            shared = cache.get(DJANGO_CACHE_KEY.format(key=key))
+            if shared is not None and not self.is_invalidated(shared[0].user_id, shared[1]):
+                self._store(key, *shared)
+                with self._lock:
+                    self.hits += 1
+                return shared[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, token, loaded_at=None):
+        """
+        Cache a token; loaded_at is when it was read from the database (defaults to now).
+        """
+        loaded_at = time.time() if loaded_at is None else loaded_at
+        # Polled first, so the next poll cannot drop this entry for older invalidations
+        self.poll()
+        if self.is_invalidated(token.user_id, loaded_at):
+            return
+        self._store(key, token, loaded_at)
+        if self.config['USE_DJANGO_CACHE']:
+            cache.set(DJANGO_CACHE_KEY.format(key=key), (token, loaded_at), self.config['TTL'])
+
+    def is_invalidated(self, user_id, loaded_at):
+        invalidated_at = cache.get(INVALIDATED_KEY.format(user_id=user_id))
+        return invalidated_at is not None and invalidated_at >= loaded_at
+
+    def poll(self):
+        """
+        Drop every local entry if the generation changed since the last poll.
+        Reads Django's cache at most once per POLL_INTERVAL.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._polled_at is not None and now - self._polled_at < self.config['POLL_INTERVAL']:
+                return
+            self._polled_at = now
+        generation = cache.get(GENERATION_KEY)
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._keys_by_user.clear()
+                self._generation = generation
+
+    def invalidate(self, key):
+        with self._lock:
+            self._remove(key)
+        if self.config['USE_DJANGO_CACHE']:
+            cache.delete(DJANGO_CACHE_KEY.format(key=key))
+
+    def invalidate_user(self, user_id):
+        # Outlives every entry loaded before it, local or shared
+        cache.set(INVALIDATED_KEY.format(user_id=user_id), time.time(), self.config['TTL'])
+        # Set after the timestamp, so a process that sees it also sees the timestamp
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+        with self._lock:
+            keys = set(self._keys_by_user.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+        if self.config['USE_DJANGO_CACHE']:
+            # Other processes may have cached a key this process never saw
+            keys.update(Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+            cache.delete_many([DJANGO_CACHE_KEY.format(key=key) for key in keys])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self._generation = self._polled_at = None
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'size': len(self._entries)}
+
+    def _store(self, key, token, loaded_at):
+        config = self.config
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (token, time.monotonic() + config['TTL'], loaded_at)
+            self._keys_by_user.setdefault(token.user_id, set()).add(key)
+            while len(self._entries) > config['MAX_SIZE']:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            user_id = entry[0].user_id
+            keys = self._keys_by_user.get(user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[user_id]
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for TokenAuthentication that caches token lookups.
+
+    Entries are dropped when the token is deleted or its user is saved
+    (e.g. deactivated); see auth_app.signals and TokenCache for how far
+    that reaches across processes.
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            # Taken before the query, so an invalidation during it still counts
+            loaded_at = time.time()
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, token, loaded_at)
+        # Hand out a copy, so changes made during one request never leak into another
+        return (copy.copy(token.user), token)
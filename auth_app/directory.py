@@ -0,0 +1,105 @@
+import hashlib
+
+from django.core.cache import cache
+
+from auth_app.models import UserDirectoryEntry
+
+SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 25
+# Shorter prefixes would let any user page through the whole directory
+MIN_PREFIX_LENGTH = 3
+CACHE_TIMEOUT = 30
+GENERATION_KEY = 'kanmind:directory:generation'
+# Upper bound for prefix ranges: sorts after every character that can follow the prefix
+PREFIX_END = '\U0010ffff'
+
+
+def normalize(value):
+    return (value or '').strip().casefold()
+
+
+def sync_directory(users):
+    """
+    Create or refresh the directory entries of the given users in bulk.
+    Used for bulk inserts, which skip the User post_save signal.
+    """
+    entries = [
+        UserDirectoryEntry(user_id=user.pk, email_key=normalize(user.email),
+                           fullname_key=normalize(user.first_name))
+        for user in users
+    ]
+    UserDirectoryEntry.objects.bulk_create(
+        entries, batch_size=1000, update_conflicts=True,
+        unique_fields=['user'], update_fields=['email_key', 'fullname_key'],
+    )
+    bump_generation()
+
+
+def bump_generation():
+    """
+    Invalidate every cached lookup, including cached misses.
+    """
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def _cached(kind, value, loader):
+    generation = cache.get(GENERATION_KEY, 0)
+    digest = hashlib.sha1(value.encode()).hexdigest()
+    key = f'kanmind:directory:{generation}:{kind}:{digest}'
+    result = cache.get(key)
+    if result is None:
+        result = loader()
+        # Empty results are cached too, so repeated misses stay cheap
+        cache.set(key, result, CACHE_TIMEOUT)
+    return result
+
+
+def _rows(queryset):
+    return [
+        {'id': user_id, 'email': email, 'fullname': fullname}
+        for user_id, email, fullname in queryset.values_list('user_id', 'user__email', 'user__first_name')
+    ]
+
+
+def search_users(query, limit=SEARCH_LIMIT):
+    """
+    Return up to `limit` users whose email or full name starts with `query`.
+
+    - Each field is searched with an index range scan that stops after
+      `limit` rows, instead of a LIKE scan over the whole user table.
+    - Prefixes shorter than MIN_PREFIX_LENGTH return no users, and
+      `limit` is capped at MAX_SEARCH_LIMIT.
+    """
+    prefix = normalize(query)
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    if len(prefix) < MIN_PREFIX_LENGTH:
+        return []
+
+    def load():
+        entries = UserDirectoryEntry.objects.all()
+        by_email = entries.filter(email_key__gte=prefix, email_key__lt=prefix + PREFIX_END).order_by('email_key')
+        by_name = entries.filter(fullname_key__gte=prefix, fullname_key__lt=prefix + PREFIX_END).order_by('fullname_key')
+        results = {}
+        for row in _rows(by_email[:limit]) + _rows(by_name[:limit]):
+            results.setdefault(row['id'], row)
+        return list(results.values())[:limit]
+
+    return _cached(f'search:{limit}', prefix, load)
+
+
+def find_user_by_email(email):
+    """
+    Return the user with exactly this email or None.
+
+    The casefolded email key narrows the lookup to the index; the stored
+    email must then match as given, like a plain User email lookup.
+    """
+    def load():
+        entries = UserDirectoryEntry.objects.filter(email_key=normalize(email), user__email=email)
+        return _rows(entries.order_by('user_id')[:1])
+
+    rows = _cached('email', email, load)
+    return rows[0] if rows else None
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_directory(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    UserDirectoryEntry = apps.get_model('auth_app', 'UserDirectoryEntry')
+    entries = [
+        UserDirectoryEntry(user_id=pk, email_key=email.strip().casefold(),
+                           fullname_key=first_name.strip().casefold())
+        for pk, email, first_name in User.objects.values_list('pk', 'email', 'first_name').iterator()
+    ]
+    UserDirectoryEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDirectoryEntry',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='directory_entry', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('email_key', models.CharField(db_index=True, max_length=254)),
+                ('fullname_key', models.CharField(db_index=True, max_length=150)),
+            ],
+        ),
+        migrations.RunPython(fill_directory, migrations.RunPython.noop),
+    ]
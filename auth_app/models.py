@@ -1,3 +1,17 @@
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+
+class UserDirectoryEntry(models.Model):
+    """
+    Normalized lookup row for a user, kept in sync with User saves.
+
+    - Stores case-folded email and full name for indexed prefix search.
+    - Maintained by auth_app.signals and auth_app.directory.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='directory_entry')
+    email_key = models.CharField(max_length=254, db_index=True)
+    fullname_key = models.CharField(max_length=150, db_index=True)
+
+    def __str__(self):
+        return self.email_key
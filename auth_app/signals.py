@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from auth_app.authentication import token_cache
+from auth_app.directory import bump_generation, normalize
+from auth_app.models import UserDirectoryEntry
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_token_on_delete(sender, instance, **kwargs):
+    token_cache.invalidate(instance.key)
+    # Reaches the entries of other processes as well
+    token_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_tokens_on_user_save(sender, instance, **kwargs):
+    # Covers deactivation as well as profile changes of the cached user
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def sync_directory_on_user_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    keys = {'email_key': normalize(instance.email), 'fullname_key': normalize(instance.first_name)}
+    # One query per save instead of update_or_create's lookup plus write
+    if created or not UserDirectoryEntry.objects.filter(user=instance).update(**keys):
+        UserDirectoryEntry.objects.create(user=instance, **keys)
+    bump_generation()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_directory_on_user_delete(sender, instance, **kwargs):
+    bump_generation()
@@ -1,3 +1,210 @@
-from django.test import TestCase
+import tempfile
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from auth_app.authentication import TokenCache, token_cache
+from core.testing import LARGE_SEED, QueryBudgetTestCase
+
+
+class AuthQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets for every endpoint in auth_app/api/urls.py.
+    """
+
+    def test_registration(self):
+        self.client.credentials()
+        data = {'fullname': 'New User', 'email': 'new.user@example.com',
+                'password': 'secret-pass', 'repeated_password': 'secret-pass'}
+        with self.assertMaxQueries(7):
+            response = self.client.post(reverse('registration'), data)
+        self.assertEqual(response.status_code, 201)
+
+    def test_login(self):
+        self.client.credentials()
+        data = {'email': self.user.email, 'password': 'kanmind-seed'}
+        with self.assertMaxQueries(2):
+            response = self.client.post(reverse('login'), data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_email_check(self):
+        with self.assertMaxQueries(2):
+            response = self.client.get('/api/email-check/', {'email': self.user.email})
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_search(self):
+        with self.assertMaxQueries(3):
+            response = self.client.get(reverse('user_search'), {'q': self.user.first_name[:3]})
+        self.assertEqual(response.status_code, 200)
+
+
+class LargeAuthQueryBudgetTests(AuthQueryBudgetTests):
+    seed = LARGE_SEED
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Tests for the token cache used by CachedTokenAuthentication.
+    """
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = User.objects.create_user(username='user@example.com', email='user@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_repeated_requests_skip_the_token_query(self):
+        url = reverse('boards')
+        with self.assertNumQueries(2):
+            self.client.get(url)
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(reverse('boards'))
+        self.token.delete()
+
+        self.assertEqual(self.client.get(reverse('boards')).status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(reverse('boards'))
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(reverse('boards')).status_code, 401)
+
+    @override_settings(TOKEN_CACHE={'POLL_INTERVAL': 0})
+    def test_invalidation_reaches_other_processes(self):
+        # The LRU of another worker process, sharing the Django cache with this one
+        other_worker = TokenCache()
+        other_worker.set(self.token.key, self.token)
+        self.assertIsNotNone(other_worker.get(self.token.key))
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(other_worker.get(self.token.key))
+
+        other_worker.set(self.token.key, self.token)
+        self.assertIsNotNone(other_worker.get(self.token.key))
+        self.token.delete()
+        self.assertIsNone(other_worker.get(self.token.key))
+
+    @override_settings(TOKEN_CACHE={'USE_DJANGO_CACHE': True, 'POLL_INTERVAL': 0})
+    def test_invalidation_reaches_the_shared_cache(self):
+        self.client.get(reverse('boards'))
+        other_worker = TokenCache()
+        self.assertIsNotNone(other_worker.get(self.token.key))
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(TokenCache().get(self.token.key))
+        self.assertIsNone(other_worker.get(self.token.key))
+
+    @override_settings(TOKEN_CACHE={'POLL_INTERVAL': 60})
+    def test_invalidation_reaches_processes_sharing_a_file_cache(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        file_cache = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                  'LOCATION': directory.name}}
+        with override_settings(CACHES=file_cache):
+            other_worker = TokenCache()
+            other_worker.set(self.token.key, self.token)
+            # Local hits between polls do not read the cache files
+            with mock.patch.object(cache, 'get', side_effect=AssertionError('cache read on a local hit')):
+                self.assertIsNotNone(other_worker.get(self.token.key))
+
+            self.user.is_active = False
+            self.user.save()
+
+            # Accepted until the other process polls again
+            self.assertIsNotNone(other_worker.get(self.token.key))
+            with mock.patch('auth_app.authentication.time.monotonic', return_value=time.monotonic() + 60):
+                self.assertIsNone(other_worker.get(self.token.key))
+
+    @override_settings(TOKEN_CACHE={'MAX_SIZE': 2, 'TTL': 300})
+    def test_cache_is_bounded(self):
+        for number in range(3):
+            user = User.objects.create_user(username=f'user{number}@example.com')
+            token = Token.objects.create(user=user)
+            self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+            self.client.get(reverse('boards'))
+
+        self.assertEqual(token_cache.stats()['size'], 2)
+        self.assertEqual(token_cache.stats()['evictions'], 1)
+
+    @override_settings(TOKEN_CACHE={'TTL': 0})
+    def test_expired_entries_are_reloaded(self):
+        self.client.get(reverse('boards'))
+        with self.assertNumQueries(2):
+            self.client.get(reverse('boards'))
+
+
+class UserDirectoryTests(APITestCase):
+    """
+    Tests for the user search endpoint and the email check built on it.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='anna.becker@example.com', email='Anna.Becker@example.com',
+                                             first_name='Anna Becker')
+        User.objects.create_user(username='ben@example.com', email='ben@example.com', first_name='Annika Wolf')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def search(self, query, **params):
+        response = self.client.get(reverse('user_search'), {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [user['email'] for user in response.data]
+
+    def test_prefix_search_on_email_and_name(self):
+        self.assertEqual(self.search('anna.b'), ['Anna.Becker@example.com'])
+        self.assertEqual(sorted(self.search('ANN')), ['Anna.Becker@example.com', 'ben@example.com'])
+        self.assertEqual(self.search('becker'), [])
+
+    def test_results_are_capped(self):
+        self.assertEqual(len(self.search('ann', limit=1)), 1)
+
+    def test_short_queries_are_rejected(self):
+        for query in ('a', 'an', ' a '):
+            with self.subTest(query=query):
+                response = self.client.get(reverse('user_search'), {'q': query})
+                self.assertEqual(response.status_code, 400)
+
+    def test_cached_miss_is_dropped_when_user_registers(self):
+        self.assertEqual(self.search('carla'), [])
+        # Token and directory lookups are both cached now
+        with self.assertNumQueries(0):
+            self.search('carla')
+
+        User.objects.create_user(username='carla@example.com', email='carla@example.com')
+
+        self.assertEqual(self.search('carla'), ['carla@example.com'])
+
+    def test_missing_query(self):
+        response = self.client.get(reverse('user_search'))
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_email_check_wrapper(self):
+        response = self.client.get('/api/email-check/', {'email': 'Anna.Becker@example.com'})
+        self.assertEqual(response.data, {'id': self.user.pk, 'email': 'Anna.Becker@example.com',
+                                         'fullname': 'Anna Becker'})
+
+        # Exact match, like the User email lookup it replaces
+        response = self.client.get('/api/email-check/', {'email': 'anna.becker@example.com'})
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get('/api/email-check/', {'email': 'nobody@example.com'})
+        self.assertEqual(response.status_code, 404)
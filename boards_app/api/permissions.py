@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from boards_app.membership import is_board_member
+
 
 class IsOwnerOrMember(BasePermission):
     """
@@ -9,11 +11,9 @@ class IsOwnerOrMember(BasePermission):
     - GET, PUT, PATCH: owner or member can access.
     """
     def has_object_permission(self, request, view, obj):
-        is_owner = (request.user == obj.owner)
-        user_id = request.user.id
-        is_member = obj.members.filter(id=user_id).exists()
+        is_owner = (request.user.id == obj.owner_id)
 
         if request.method == 'DELETE':
             return is_owner
         else:
-            return is_owner or is_member
+            return is_owner or is_board_member(request, obj.pk)
@@ -0,0 +1,44 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON.
+
+    Exports stream their own body; this renders error responses
+    (e.g. 403) as a single JSON line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, ensure_ascii=False).encode() + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Comma-separated values.
+
+    Exports stream their own body; this renders error responses
+    as a one-column 'detail' table.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        detail = data.get('detail', data) if isinstance(data, dict) else data
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['detail'])
+        writer.writerow([str(detail)])
+        return buffer.getvalue().encode()
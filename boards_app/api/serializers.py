@@ -10,11 +10,10 @@ class BoardSerializer(serializers.ModelSerializer):
     Serializer for listing or creating boards.
 
     Adds counts for members and tasks, including filtered task counts.
+    Task counts are read from the board's denormalized counter columns.
     """
     member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
+    ticket_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Board
@@ -30,25 +29,21 @@ class BoardSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         # Assign members after board creation and always include owner.
-        members_data = validated_data.pop('members', [])
+        # A new board has no members yet, so one add() writes all rows at once.
+        members_data = list(validated_data.pop('members', []))
         board_instance = Board.objects.create(**validated_data)
-        board_instance.members.set(members_data)
         if board_instance.owner_id:
-            board_instance.members.add(board_instance.owner)
+            members_data.append(board_instance.owner_id)
+        board_instance.members.add(*members_data)
         return board_instance
 
     def get_member_count(self, obj):
+        # Annotated by BoardListCreateView.get_queryset. The query is only a
+        # fallback for unannotated instances, e.g. the board returned after a create.
+        if hasattr(obj, 'member_count'):
+            return obj.member_count
         return obj.members.count()
 
-    def get_ticket_count(self, obj):
-        return obj.tasks.count()
-
-    def get_tasks_to_do_count(self, obj):
-        return obj.tasks.filter(status='to-do').count()
-
-    def get_tasks_high_prio_count(self, obj):
-        return obj.tasks.filter(status='high').count()
-
 
 class BoardMemberSerializer(serializers.ModelSerializer):
     """
@@ -72,7 +67,7 @@ class TaskInBoardSerializer(serializers.ModelSerializer):
     """
     assignee = BoardMemberSerializer(read_only=True)
     reviewer = BoardMemberSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(source='comment_count', read_only=True)
 
     class Meta:
         model = Task
@@ -86,9 +81,6 @@ class TaskInBoardSerializer(serializers.ModelSerializer):
                   'due_date',
                   'comments_count']
 
-    def get_comments_count(self, obj):
-        return Comment.objects.filter(task=obj).count()
-
 
 class BoardDetailReadSerializer(serializers.ModelSerializer):
     """
@@ -118,3 +110,69 @@ class BoardDetailWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Board
         fields = ['id', 'title', 'members', 'owner_data', 'members_data']
+
+
+class BoardMembersDeltaSerializer(serializers.Serializer):
+    """
+    Serializer for adding or removing board members by user id.
+    Only the changed members are sent, not the full member list.
+    """
+    user_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=5000)
+
+
+class BoardCommentSerializer(serializers.ModelSerializer):
+    """
+    Serializer for comments in a board change set.
+    Same fields as the comment list, plus the task id.
+    """
+    author = serializers.ReadOnlyField(source='author.first_name')
+    created_at = serializers.DateTimeField(format="%Y-%m-%dT%H:%M:%SZ", read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ['id', 'task', 'created_at', 'author', 'content']
+
+
+class ImportBoardSerializer(serializers.ModelSerializer):
+    """
+    Validates one board record of an import file.
+    Ids are the ids of the source system; users are referenced by email.
+    """
+    id = serializers.IntegerField()
+    owner = serializers.EmailField()
+    members = serializers.ListField(child=serializers.EmailField(), required=False, default=list)
+
+    class Meta:
+        model = Board
+        fields = ['id', 'title', 'owner', 'members']
+
+
+class ImportTaskSerializer(serializers.ModelSerializer):
+    """
+    Validates one task record of an import file.
+    board is the source id of a board record earlier in the file.
+    """
+    id = serializers.IntegerField()
+    board = serializers.IntegerField()
+    assignee = serializers.EmailField(required=False, allow_null=True, default=None)
+    reviewer = serializers.EmailField(required=False, allow_null=True, default=None)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'board', 'title', 'description', 'status', 'priority', 'assignee', 'reviewer', 'due_date']
+        extra_kwargs = {'description': {'allow_blank': True}}
+
+
+class ImportCommentSerializer(serializers.ModelSerializer):
+    """
+    Validates one comment record of an import file.
+    task is the source id of a task record earlier in the file.
+    """
+    id = serializers.IntegerField()
+    task = serializers.IntegerField()
+    author = serializers.EmailField()
+    created_at = serializers.DateTimeField(required=False)
+
+    class Meta:
+        model = Comment
+        fields = ['id', 'task', 'author', 'content', 'created_at']
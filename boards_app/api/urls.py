@@ -1,8 +1,17 @@
 from django.urls import path
 
-from .views import BoardListCreateView, BoardDetailView
+from .views import (BoardListCreateView, BoardDetailView, BoardMembersDeltaView, BoardChangesView,
+                    BoardExportView, BoardImportView, board_events_view)
 
 urlpatterns = [
     path('', BoardListCreateView.as_view(), name='boards'),
-    path('<int:pk>/', BoardDetailView.as_view(), name='boards_detail') 
+    path('import/', BoardImportView.as_view(), name='boards_import'),
+    path('<int:pk>/', BoardDetailView.as_view(), name='boards_detail'),
+    path('<int:pk>/members/add/', BoardMembersDeltaView.as_view(membership_change='add'),
+         name='boards_members_add'),
+    path('<int:pk>/members/remove/', BoardMembersDeltaView.as_view(membership_change='remove'),
+         name='boards_members_remove'),
+    path('<int:pk>/changes/', BoardChangesView.as_view(), name='boards_changes'),
+    path('<int:pk>/events/', board_events_view, name='boards_events'),
+    path('<int:pk>/export/', BoardExportView.as_view(), name='boards_export')
 ]
\ No newline at end of file
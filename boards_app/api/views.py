@@ -1,11 +1,52 @@
-from django.db.models import Q
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Count, Exists, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
 from rest_framework import generics
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
+from auth_app.authentication import CachedTokenAuthentication
+from boards_app.events import BoardFull, get_hub, stream_events
+from boards_app.export import async_chunks, csv_chunks, ndjson_chunks
+from boards_app.importer import BoardImporter
+from boards_app.membership import load_member_board_ids
 from boards_app.models import Board
+from boards_app.snapshots import get_board_snapshot
+from boards_app.sync import board_changes, decode_token, encode_token
+from boards_app.versioning import board_etag, not_modified
+from tasks_app.api.readers import member_values, render_members, render_tasks, task_values
 from .permissions import IsOwnerOrMember
-from .serializers import BoardSerializer, BoardDetailReadSerializer, BoardDetailWriteSerializer
+from .renderers import CSVRenderer, NDJSONRenderer
+from .serializers import (BoardSerializer, BoardDetailReadSerializer, BoardDetailWriteSerializer,
+                          BoardMembersDeltaSerializer, BoardMemberSerializer, BoardCommentSerializer)
+
+
+def annotate_member_count(queryset):
+    """
+    Annotate the member count rendered by BoardSerializer.
+
+    Task counters are stored on the board itself, so the member count
+    is the only aggregate left; a correlated subquery on the through
+    table keeps the list a single query.
+    """
+    member_count = (
+        Board.members.through.objects
+        .filter(board_id=OuterRef('pk'))
+        .order_by()
+        .values('board_id')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return queryset.annotate(member_count=Coalesce(Subquery(member_count, output_field=IntegerField()), 0))
 
 
 class BoardListCreateView(generics.ListCreateAPIView):
@@ -15,18 +56,21 @@ class BoardListCreateView(generics.ListCreateAPIView):
     - Superusers see all boards.
     - Regular users see boards where they are owner or member.
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsOwnerOrMember]
     serializer_class = BoardSerializer
 
     def get_queryset(self):
         user = self.request.user
+        boards = Board.objects.all()
 
-        if user.is_superuser:
-            return Board.objects.all()
+        if not user.is_superuser:
+            # Return boards where the user is owner or member.
+            # Filtering via a subquery avoids a DISTINCT over the members join.
+            accessible = Board.objects.filter(Q(owner=user) | Q(members=user)).values('pk')
+            boards = boards.filter(pk__in=accessible)
 
-        # Return boards where the user is owner or member
-        return Board.objects.filter(Q(owner=user) | Q(members=user)).distinct()
+        return annotate_member_count(boards)
 
     def perform_create(self, serializer):
         # Assign the requesting user as the owner of the new board
@@ -39,8 +83,11 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     - PATCH/PUT requests use BoardDetailWriteSerializer for editing members.
     - GET requests use BoardDetailReadSerializer for nested read-only details.
+    - GET responses carry an ETag from the board version; a matching
+      If-None-Match is answered with 304 before any task is loaded.
+    - The rendered GET payload is cached per board version (see boards_app.snapshots).
     """
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsOwnerOrMember]
     queryset = Board.objects.all()
 
@@ -49,3 +96,242 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
             return BoardDetailWriteSerializer
 
         return BoardDetailReadSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        # The board row alone decides the ETag; it is read before the
+        # tasks, so a concurrent change can only make the tag older
+        # than the body, never newer.
+        board = self.get_object()
+        etag = board_etag(board)
+
+        response = not_modified(request, etag)
+        if response is None:
+            response = Response(get_board_snapshot(board, self.render_detail))
+        response['ETag'] = etag
+        return response
+
+    def render_detail(self, board):
+        # Same output as BoardDetailReadSerializer, rendered through the
+        # compiled read path: one query for members, one for tasks.
+        return {
+            'id': board.pk,
+            'title': board.title,
+            'owner_id': board.owner_id,
+            'members': render_members(member_values(board.members.all())),
+            'tasks': render_tasks(task_values(board.tasks.all()), include_board=False),
+        }
+
+
+class BoardMembersDeltaView(generics.GenericAPIView):
+    """
+    Add users to or remove users from a board, as set by `membership_change`.
+
+    - Body: {"user_ids": [...]} with only the users to change.
+    - 'add' skips users who are already members; 'remove' never
+      removes the owner.
+    - User ids and current memberships are checked in one query.
+    - Returns a compact acknowledgement instead of the member list.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsOwnerOrMember]
+    queryset = Board.objects.only('id', 'owner_id')
+    serializer_class = BoardMembersDeltaSerializer
+    MEMBERSHIP_CHANGES = ('add', 'remove')
+    # One of MEMBERSHIP_CHANGES, passed to as_view() in urls.py
+    membership_change = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        change = initkwargs.get('membership_change', cls.membership_change)
+        if change not in cls.MEMBERSHIP_CHANGES:
+            raise ImproperlyConfigured(f'{cls.__name__} needs membership_change set to one of '
+                                       f'{", ".join(cls.MEMBERSHIP_CHANGES)}, got {change!r}.')
+        return super().as_view(**initkwargs)
+
+    def post(self, request, *args, **kwargs):
+        board = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids = set(serializer.validated_data['user_ids'])
+
+        memberships = Board.members.through.objects.filter(board_id=board.pk, user_id=OuterRef('pk'))
+        known = dict(
+            User.objects.filter(pk__in=user_ids)
+            .annotate(is_member=Exists(memberships))
+            .values_list('pk', 'is_member')
+        )
+
+        with transaction.atomic():
+            if self.membership_change == 'add':
+                result = self.add_members(board, known)
+            else:
+                result = self.remove_members(board, known)
+
+        result.update({
+            'board': board.pk,
+            'unknown': sorted(user_ids - known.keys()),
+            'member_count': board.members.count(),
+        })
+        return Response(result)
+
+    def add_members(self, board, known):
+        added = sorted(user_id for user_id, is_member in known.items() if not is_member)
+        if added:
+            # add() writes all through rows with one bulk insert
+            board.members.add(*added)
+        return {'added': added}
+
+    def remove_members(self, board, known):
+        removed = sorted(user_id for user_id, is_member in known.items()
+                         if is_member and user_id != board.owner_id)
+        if removed:
+            board.members.remove(*removed)
+        return {'removed': removed}
+
+
+class BoardChangesView(generics.GenericAPIView):
+    """
+    Return the changes of a board since a sync token.
+
+    - GET ?since=<token> returns tasks, comments and members that were
+      created, updated, deleted or removed after the token, plus a new token.
+    - Without a token, the full board is returned as one change set.
+    - Clients apply the deletions before the updates; a change can be
+      sent twice, since tokens overlap by a few seconds.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsOwnerOrMember]
+    queryset = Board.objects.only('id', 'owner_id')
+
+    def get(self, request, *args, **kwargs):
+        board = self.get_object()
+        since = request.query_params.get('since')
+        # Taken before reading, so nothing written meanwhile is missed next time
+        now = timezone.now()
+        changes = board_changes(board, decode_token(since) if since else None)
+        users = list(changes['users'])
+
+        return Response({
+            'since': since or None,
+            'next': encode_token(now),
+            'tasks': render_tasks(task_values(changes['tasks']), include_board=False),
+            'deleted_tasks': changes['deleted_tasks'],
+            'comments': BoardCommentSerializer(changes['comments'], many=True).data,
+            'deleted_comments': changes['deleted_comments'],
+            'members': BoardMemberSerializer([user for user in users if user.is_member], many=True).data,
+            'removed_members': [user.pk for user in users if not user.is_member],
+        })
+
+
+def check_stream_access(request, board_id):
+    """
+    Authenticate a stream request and check that the user may read the board.
+
+    EventSource cannot send headers, so the token is also accepted as ?token=.
+    """
+    authorization = request.headers.get('Authorization', '')
+    key = authorization[len('Token '):] if authorization.startswith('Token ') else request.GET.get('token')
+    if not key:
+        raise NotAuthenticated()
+    user, token = CachedTokenAuthentication().authenticate_credentials(key)
+
+    owner_id = Board.objects.filter(pk=board_id).values_list('owner_id', flat=True).first()
+    if owner_id is None:
+        raise NotFound()
+    if user.pk != owner_id and board_id not in load_member_board_ids(user.pk):
+        raise PermissionDenied()
+
+
+class EventStreamResponse(StreamingHttpResponse):
+    """
+    Server-sent event stream of one hub subscription.
+
+    - close() frees the subscription, also when the stream is closed
+      before its generator started.
+    """
+
+    def __init__(self, subscription, streaming_content, **kwargs):
+        super().__init__(streaming_content, content_type='text/event-stream', **kwargs)
+        self.subscription = subscription
+        self['Cache-Control'] = 'no-cache'
+        self['X-Accel-Buffering'] = 'no'
+
+    def close(self):
+        try:
+            get_hub().unsubscribe(self.subscription)
+        finally:
+            super().close()
+
+
+@require_GET
+async def board_events_view(request, pk):
+    """
+    Stream the changes of a board as server-sent events.
+
+    - Served by the ASGI application (core/asgi.py); the events only carry ids,
+      clients fetch the rows from the delta sync endpoint.
+    - The first event carries a sync token for that endpoint.
+    - Answers 503 when the board has too many open streams.
+    - The metrics, N+1 and pinning middlewares are sync-only, so Django
+      runs this view through async_to_sync once per opened stream; the
+      events themselves are sent from the event loop.
+    """
+    try:
+        await sync_to_async(check_stream_access)(request, pk)
+    except APIException as exc:
+        return JsonResponse({'detail': str(exc.detail)}, status=exc.status_code)
+
+    try:
+        subscription = get_hub().subscribe(pk)
+    except BoardFull:
+        return JsonResponse({'detail': 'Too many open streams on this board.'}, status=503)
+
+    ready = {'type': 'ready', 'board': pk, 'since': encode_token(timezone.now())}
+    return EventStreamResponse(subscription, stream_events(subscription, ready))
+
+
+class BoardExportView(generics.GenericAPIView):
+    """
+    Export a board with its tasks and comments.
+
+    - GET ?format=ndjson (default) or ?format=csv.
+    - Rows are read with iterator() and streamed as they are produced,
+      so memory stays flat regardless of the board size.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsOwnerOrMember]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    queryset = Board.objects.select_related('owner')
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        board = self.get_object()
+        renderer = request.accepted_renderer
+        chunks = (csv_chunks if renderer.format == 'csv' else ndjson_chunks)(board, self.chunk_size)
+        if isinstance(request._request, ASGIRequest):
+            chunks = async_chunks(chunks)
+
+        response = StreamingHttpResponse(chunks, content_type=f'{renderer.media_type}; charset=utf-8')
+        filename = f'board-{board.pk}.{renderer.format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class BoardImportView(generics.GenericAPIView):
+    """
+    Import boards, members, tasks and comments from an uploaded JSONL file.
+
+    - Admin only; POST multipart with the file in the `file` field.
+    - Same format and rules as the import_boards command; use the command
+      for very large files, which would outlast a request timeout.
+    - Returns the created counts and the rejected lines.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': ['No file was submitted.']})
+        return Response(BoardImporter().run(upload))
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BoardsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'boards_app'
+
+    def ready(self):
+        # Register the signal handlers invalidating the membership cache
+        from boards_app import signals  # noqa: F401
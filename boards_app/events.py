@@ -0,0 +1,181 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+DEFAULT_BOARD_EVENTS = {
+    # Dotted path of the hub class; swap for a multi-process backend
+    'HUB': 'boards_app.events.InProcessHub',
+    # Open streams allowed per board and process
+    'MAX_CONNECTIONS_PER_BOARD': 100,
+    # Events buffered per stream before it is told to resync
+    'QUEUE_SIZE': 100,
+    # Seconds between keep-alive comments on an idle stream
+    'HEARTBEAT': 15,
+}
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+class BoardFull(Exception):
+    """
+    Raised when a board already has the maximum number of open streams.
+    """
+
+
+def events_config():
+    return {**DEFAULT_BOARD_EVENTS, **getattr(settings, 'BOARD_EVENTS', {})}
+
+
+class Subscription:
+    """
+    One open event stream on a board.
+
+    - Buffers up to QUEUE_SIZE events in an asyncio queue on the
+      stream's own event loop.
+    - A stream that falls behind is marked as overflowed instead of
+      growing without bound; it then tells the client to resync.
+    """
+
+    def __init__(self, board_id, queue_size):
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def put(self, event):
+        # Runs on self.loop
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Drop the backlog; the client reloads through delta sync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        """
+        Return the next event, or None once the stream has overflowed.
+        """
+        event = await self.queue.get()
+        return None if self.overflowed else event
+
+
+class InProcessHub:
+    """
+    Broadcasts board events to the streams of this process.
+
+    - subscribe() and unsubscribe() are called from the stream's event loop.
+    - publish() may be called from any thread, e.g. a sync view's on_commit.
+    - A multi-process backend implements the same four methods and
+      forwards published events to every process (e.g. via Redis pub/sub).
+    """
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+        self.published = 0
+        self.rejected = 0
+
+    def subscribe(self, board_id):
+        config = events_config()
+        with self._lock:
+            streams = self._subscriptions[board_id]
+            if len(streams) >= config['MAX_CONNECTIONS_PER_BOARD']:
+                self.rejected += 1
+                raise BoardFull(board_id)
+            subscription = Subscription(board_id, config['QUEUE_SIZE'])
+            streams.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            streams = self._subscriptions.get(subscription.board_id)
+            if streams is not None:
+                streams.discard(subscription)
+                if not streams:
+                    del self._subscriptions[subscription.board_id]
+
+    def publish(self, board_id, event):
+        with self._lock:
+            streams = list(self._subscriptions.get(board_id, ()))
+            self.published += 1
+        for subscription in streams:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # The stream's loop is closed; it will not read again
+                self.unsubscribe(subscription)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'boards': len(self._subscriptions),
+                'connections': sum(len(streams) for streams in self._subscriptions.values()),
+                'published': self.published,
+                'rejected': self.rejected,
+            }
+
+
+def get_hub():
+    """
+    Return the process-wide hub configured in BOARD_EVENTS['HUB'].
+    """
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = import_string(events_config()['HUB'])()
+    return _hub
+
+
+def publish(board_id, event_type, **data):
+    """
+    Send an event to the streams of a board once the current transaction commits.
+
+    Events only carry ids; clients fetch the changed rows through the
+    delta sync endpoint.
+    """
+    event = {'type': event_type, 'board': board_id, **data}
+    transaction.on_commit(lambda: get_hub().publish(board_id, event))
+
+
+def format_event(event):
+    """
+    Encode an event as a server-sent events message.
+    """
+    return f'event: {event["type"]}\ndata: {json.dumps(event)}\n\n'
+
+
+async def stream_events(subscription, ready_event):
+    """
+    Yield server-sent events for one subscription until the client leaves.
+
+    - Starts with ready_event, so the client knows where to sync from.
+    - Sends a keep-alive comment every HEARTBEAT idle seconds.
+    - Ends with a resync event when the stream fell behind.
+    """
+    heartbeat = events_config()['HEARTBEAT']
+    try:
+        yield 'retry: 5000\n\n'
+        yield format_event(ready_event)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            if event is None:
+                yield format_event({'type': 'resync', 'board': subscription.board_id})
+                return
+            yield format_event(event)
+    finally:
+        get_hub().unsubscribe(subscription)
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+
+from tasks_app.models import Comment
+
+# Columns of the CSV export; task rows leave the comment columns empty and vice versa
+CSV_COLUMNS = ['type', 'id', 'board', 'task', 'title', 'description', 'status', 'priority',
+               'assignee', 'reviewer', 'due_date', 'comments_count', 'author', 'content', 'created_at']
+
+
+def board_record(board):
+    members = list(board.members.order_by('pk').values_list('email', flat=True))
+    return {'type': 'board', 'id': board.pk, 'title': board.title,
+            'owner': board.owner.email, 'members': members}
+
+
+def task_records(board, chunk_size):
+    """
+    Yield one dict per task of the board, reading the rows in chunks.
+    """
+    rows = (
+        board.tasks.order_by('pk')
+        .values_list('pk', 'title', 'description', 'status', 'priority', 'assignee__email',
+                     'reviewer__email', 'due_date', 'comment_count')
+        .iterator(chunk_size=chunk_size)
+    )
+    for pk, title, description, status, priority, assignee, reviewer, due_date, comment_count in rows:
+        yield {'type': 'task', 'id': pk, 'board': board.pk, 'title': title, 'description': description,
+               'status': status, 'priority': priority, 'assignee': assignee, 'reviewer': reviewer,
+               'due_date': due_date.isoformat(), 'comments_count': comment_count}
+
+
+def comment_records(board, chunk_size):
+    """
+    Yield one dict per comment on the board's tasks, reading the rows in chunks.
+    """
+    rows = (
+        Comment.objects.filter(task__board=board).order_by('task_id', 'created_at', 'pk')
+        .values_list('pk', 'task_id', 'author__email', 'content', 'created_at')
+        .iterator(chunk_size=chunk_size)
+    )
+    for pk, task_id, author, content, created_at in rows:
+        yield {'type': 'comment', 'id': pk, 'task': task_id, 'author': author,
+               'content': content, 'created_at': created_at.isoformat()}
+
+
+def board_records(board, chunk_size):
+    """
+    Yield the board, then its tasks, then their comments.
+
+    Users are referenced by email, so an export can be re-imported
+    elsewhere with import_boards.
+    """
+    yield board_record(board)
+    yield from task_records(board, chunk_size)
+    yield from comment_records(board, chunk_size)
+
+
+def ndjson_chunks(board, chunk_size):
+    """
+    Yield the export as newline-delimited JSON, one chunk per chunk_size records.
+    """
+    lines = []
+    for record in board_records(board, chunk_size):
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= chunk_size:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def csv_chunks(board, chunk_size):
+    """
+    Yield the export as CSV with a header row, one chunk per chunk_size records.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    count = 0
+    for record in board_records(board, chunk_size):
+        writer.writerow(record)
+        count += 1
+        if count >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def async_chunks(chunks):
+    """
+    Serve a sync chunk iterator under ASGI without collecting it first.
+
+    Django would otherwise consume a sync iterator completely before
+    streaming it asynchronously.
+    """
+    pull = sync_to_async(lambda: next(chunks, None), thread_sensitive=True)
+    while (chunk := await pull()) is not None:
+        yield chunk
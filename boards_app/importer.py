@@ -0,0 +1,246 @@
+import json
+from collections import Counter
+
+from django.db import transaction
+
+from auth_app.directory import normalize
+from auth_app.models import UserDirectoryEntry
+from boards_app.api.serializers import ImportBoardSerializer, ImportCommentSerializer, ImportTaskSerializer
+from boards_app.membership import invalidate_member_board_ids
+from boards_app.models import Board
+from tasks_app import counters
+from tasks_app.models import Comment, Task
+
+DEFAULT_CHUNK_SIZE = 1000
+
+RECORD_SERIALIZERS = {
+    'board': ImportBoardSerializer,
+    'task': ImportTaskSerializer,
+    'comment': ImportCommentSerializer,
+}
+
+USER_ERROR = 'User not found.'
+BOARD_ERROR = 'Board not found in the import.'
+TASK_ERROR = 'Task not found in the import.'
+DUPLICATE_ERROR = 'Duplicate id.'
+
+
+class BoardImporter:
+    """
+    Imports boards, members, tasks and comments from JSONL records,
+    in the format written by the board export.
+
+    - Records are read in chunks of chunk_size. Per chunk, user emails
+      are resolved with one query and the rows are written with
+      bulk_create inside one transaction.
+    - Tasks and comments reference the source ids of boards and tasks
+      earlier in the file.
+    - A bad record is reported with its line number and skipped; the
+      rest of the import goes on.
+    - bulk_create skips the signals, so board counters, versions and
+      comment counts are updated here, and member caches invalidated.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        self.chunk_size = chunk_size
+        self.progress = progress
+        # Source ids mapped to the created rows
+        self.board_ids = {}
+        self.task_ids = {}
+        self.comment_ids = set()
+        # Normalized email -> user id, or None for unknown emails
+        self.users = {}
+        self.lines = 0
+        self.created = {'boards': 0, 'tasks': 0, 'comments': 0}
+        self.errors = []
+
+    def run(self, lines):
+        """
+        Import every line and return the summary.
+        lines may be str or bytes, e.g. an open file or an upload.
+        """
+        chunk = []
+        for number, line in enumerate(lines, start=1):
+            self.lines = number
+            record = self.parse(number, line)
+            if record is not None:
+                chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return self.summary()
+
+    def summary(self):
+        return {'lines': self.lines, 'created': dict(self.created), 'errors': self.errors}
+
+    def add_error(self, number, errors):
+        self.errors.append({'line': number, 'errors': errors})
+
+    def parse(self, number, line):
+        """
+        Return (line number, type, validated data), or None for blank and bad lines.
+        """
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                return None
+            data = json.loads(line)
+        except (UnicodeDecodeError, ValueError):
+            self.add_error(number, {'record': ['Invalid JSON.']})
+            return None
+
+        serializer_class = RECORD_SERIALIZERS.get(data.get('type')) if isinstance(data, dict) else None
+        if serializer_class is None:
+            self.add_error(number, {'type': [f'Expected one of: {", ".join(RECORD_SERIALIZERS)}.']})
+            return None
+        serializer = serializer_class(data=data)
+        if not serializer.is_valid():
+            self.add_error(number, serializer.errors)
+            return None
+        return number, data['type'], serializer.validated_data
+
+    def import_chunk(self, chunk):
+        self.resolve_users(chunk)
+        records = {'board': [], 'task': [], 'comment': []}
+        for number, kind, data in chunk:
+            records[kind].append((number, data))
+
+        with transaction.atomic(), counters.deferred():
+            self.write_boards(records['board'])
+            self.write_tasks(records['task'])
+            self.write_comments(records['comment'])
+
+        if self.progress is not None:
+            self.progress(self.summary())
+
+    def resolve_users(self, chunk):
+        # One query per chunk for the emails not seen before
+        emails = set()
+        for number, kind, data in chunk:
+            for field in ('owner', 'assignee', 'reviewer', 'author'):
+                if data.get(field):
+                    emails.add(normalize(data[field]))
+            emails.update(normalize(email) for email in data.get('members', ()))
+        emails.difference_update(self.users)
+        if not emails:
+            return
+        self.users.update(dict.fromkeys(emails))
+        self.users.update(
+            UserDirectoryEntry.objects.filter(email_key__in=emails).values_list('email_key', 'user_id')
+        )
+
+    def user_id(self, email):
+        return self.users.get(normalize(email))
+
+    def check_id(self, source_id, known, seen):
+        if source_id in known or source_id in seen:
+            return [DUPLICATE_ERROR]
+        seen.add(source_id)
+        return None
+
+    def write_boards(self, records):
+        prepared = []
+        seen = set()
+        for number, data in records:
+            errors = {}
+            duplicate = self.check_id(data['id'], self.board_ids, seen)
+            if duplicate:
+                errors['id'] = duplicate
+            owner_id = self.user_id(data['owner'])
+            if owner_id is None:
+                errors['owner'] = [USER_ERROR]
+            member_ids = [self.user_id(email) for email in data['members']]
+            if None in member_ids:
+                errors['members'] = [USER_ERROR]
+            if errors:
+                self.add_error(number, errors)
+                continue
+            # The owner is always a member, as in BoardSerializer
+            member_ids = set(member_ids) | {owner_id}
+            prepared.append((data['id'], Board(title=data['title'], owner_id=owner_id), member_ids))
+        if not prepared:
+            return
+
+        Board.objects.bulk_create([board for source_id, board, member_ids in prepared])
+        memberships = []
+        user_ids = set()
+        for source_id, board, member_ids in prepared:
+            self.board_ids[source_id] = board.pk
+            memberships.extend(Board.members.through(board_id=board.pk, user_id=user_id) for user_id in member_ids)
+            user_ids.update(member_ids)
+        Board.members.through.objects.bulk_create(memberships)
+        invalidate_member_board_ids(user_ids)
+        self.created['boards'] += len(prepared)
+
+    def write_tasks(self, records):
+        prepared = []
+        seen = set()
+        for number, data in records:
+            errors = {}
+            duplicate = self.check_id(data['id'], self.task_ids, seen)
+            if duplicate:
+                errors['id'] = duplicate
+            board_id = self.board_ids.get(data['board'])
+            if board_id is None:
+                errors['board'] = [BOARD_ERROR]
+            users = {}
+            for field in ('assignee', 'reviewer'):
+                users[field] = self.user_id(data[field]) if data[field] else None
+                if data[field] and users[field] is None:
+                    errors[field] = [USER_ERROR]
+            if errors:
+                self.add_error(number, errors)
+                continue
+            task = Task(board_id=board_id, title=data['title'], description=data['description'],
+                        status=data['status'], priority=data['priority'], assignee_id=users['assignee'],
+                        reviewer_id=users['reviewer'], due_date=data['due_date'])
+            prepared.append((data['id'], task))
+        if not prepared:
+            return
+
+        Task.objects.bulk_create([task for source_id, task in prepared])
+        for source_id, task in prepared:
+            self.task_ids[source_id] = (task.pk, task.board_id)
+            counters.apply_board_deltas(task.board_id, counters.task_counter_deltas(task.status, task.priority, 1))
+        self.created['tasks'] += len(prepared)
+
+    def write_comments(self, records):
+        prepared = []
+        seen = set()
+        for number, data in records:
+            errors = {}
+            duplicate = self.check_id(data['id'], self.comment_ids, seen)
+            if duplicate:
+                errors['id'] = duplicate
+            task = self.task_ids.get(data['task'])
+            if task is None:
+                errors['task'] = [TASK_ERROR]
+            author_id = self.user_id(data['author'])
+            if author_id is None:
+                errors['author'] = [USER_ERROR]
+            if errors:
+                self.add_error(number, errors)
+                continue
+            comment = Comment(task_id=task[0], author_id=author_id, content=data['content'])
+            prepared.append((data['id'], comment, task[1], data.get('created_at')))
+        if not prepared:
+            return
+
+        comments = Comment.objects.bulk_create([comment for source_id, comment, board_id, created_at in prepared])
+        # created_at is auto_now_add, so the source timestamps are written afterwards
+        dated = []
+        for source_id, comment, board_id, created_at in prepared:
+            self.comment_ids.add(source_id)
+            if created_at is not None:
+                comment.created_at = created_at
+                dated.append(comment)
+        if dated:
+            Comment.objects.bulk_update(dated, ['created_at'])
+
+        counters.apply_comment_deltas(Counter(comment.task_id for comment in comments))
+        for board_id in {board_id for source_id, comment, board_id, created_at in prepared}:
+            counters.apply_board_deltas(board_id, {})
+        self.created['comments'] += len(prepared)
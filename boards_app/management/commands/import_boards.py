@@ -0,0 +1,55 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from boards_app.importer import DEFAULT_CHUNK_SIZE, BoardImporter
+
+
+class Command(BaseCommand):
+    """
+    Import boards, members, tasks and comments from a JSONL file.
+
+    - Reads the format written by the board export (?format=ndjson).
+    - Users must already exist; they are matched by email.
+    - Rows are written with bulk_create, one transaction per chunk.
+    - Bad records are reported with their line number and skipped.
+    """
+    help = 'Import boards, members, tasks and comments from a JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL file to import, or - for stdin.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Records validated and inserted per transaction.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1.')
+        started = time.perf_counter()
+        importer = BoardImporter(chunk_size=options['chunk_size'], progress=self.report)
+
+        if options['path'] == '-':
+            result = importer.run(sys.stdin)
+        else:
+            try:
+                with open(options['path'], encoding='utf-8') as lines:
+                    result = importer.run(lines)
+            except OSError as error:
+                raise CommandError(f'Cannot read {options["path"]}: {error}')
+
+        for error in result['errors']:
+            self.stderr.write(f'Line {error["line"]}: {json.dumps(error["errors"])}')
+        elapsed = time.perf_counter() - started
+        created = result['created']
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {created["boards"]} boards, {created["tasks"]} tasks and {created["comments"]} '
+            f'comments in {elapsed:.1f}s; {len(result["errors"])} records rejected.'
+        ))
+
+    def report(self, summary):
+        created = summary['created']
+        self.stdout.write(
+            f'Read {summary["lines"]} lines: {created["boards"]} boards, {created["tasks"]} tasks, '
+            f'{created["comments"]} comments, {len(summary["errors"])} errors.'
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from boards_app.sync import prune_sync_log
+
+
+class Command(BaseCommand):
+    """
+    Delete tombstones and membership changes older than the delta sync
+    retention window (DELTA_SYNC['RETENTION_DAYS']).
+
+    Tokens older than the window are answered with 410, so clients
+    reload the board instead of missing deletions.
+    """
+    help = 'Delete delta sync log entries older than the retention window.'
+
+    def handle(self, *args, **options):
+        tombstones, changes = prune_sync_log()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {tombstones} tombstones and {changes} membership changes.'
+        ))
@@ -0,0 +1,126 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from auth_app.directory import sync_directory
+from boards_app.models import Board
+from tasks_app.counters import reconcile_counters
+from tasks_app.models import PRIORITY_CHOICES, STATUS_CHOICES, Comment, Task
+
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta', 'Hannah',
+               'Jonas', 'Lena', 'Max', 'Mia', 'Noah', 'Paul', 'Sophie', 'Tom']
+LAST_NAMES = ['Becker', 'Fischer', 'Hoffmann', 'Klein', 'Koch', 'Meyer', 'Müller',
+              'Richter', 'Schmidt', 'Schneider', 'Schulz', 'Wagner', 'Weber', 'Wolf']
+TASK_VERBS = ['Implement', 'Fix', 'Review', 'Refactor', 'Document', 'Test', 'Design', 'Deploy']
+TASK_NOUNS = ['login form', 'board view', 'task card', 'comment list', 'API client',
+              'summary page', 'drag and drop', 'email check', 'settings page', 'search']
+
+STATUSES = [value for value, label in STATUS_CHOICES]
+PRIORITIES = [value for value, label in PRIORITY_CHOICES]
+
+
+class Command(BaseCommand):
+    """
+    Generate synthetic users, boards, tasks and comments.
+
+    - All rows are written with bulk_create in batches.
+    - Every board gets a random subset of users as members, including the owner.
+    - Assignees, reviewers and comment authors are picked from the board members.
+    - Denormalized counters are reconciled per board after its rows are written.
+    - Use --seed for reproducible data sets.
+    """
+    help = 'Generate synthetic KanMind data for load and query-budget testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--members-per-board', type=int, default=10)
+        parser.add_argument('--tasks-per-board', type=int, default=50)
+        parser.add_argument('--comments-per-task', type=int, default=3)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default='kanmind-seed')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible data.')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            users = self.create_users(options['users'], options['password'])
+            self.stdout.write(f'Created {len(users)} users.')
+
+        board_count = options['boards']
+        for index in range(board_count):
+            # One transaction per board keeps memory and lock time bounded.
+            with transaction.atomic():
+                self.create_board(users, options['members_per_board'],
+                                  options['tasks_per_board'], options['comments_per_task'])
+            if (index + 1) % 10 == 0 or index + 1 == board_count:
+                self.stdout.write(f'Created {index + 1}/{board_count} boards.')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Seeding finished in {elapsed:.1f}s.'))
+
+    def create_users(self, count, password):
+        # Hashing is slow, so every seeded user shares one password hash.
+        password_hash = make_password(password)
+        offset = (User.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+        users = []
+        for number in range(offset, offset + count):
+            first_name = self.random.choice(FIRST_NAMES)
+            last_name = self.random.choice(LAST_NAMES)
+            email = f'{first_name}.{last_name}.{number}@example.com'.lower()
+            users.append(User(username=email, email=email, password=password_hash,
+                              first_name=f'{first_name} {last_name}'))
+        users = User.objects.bulk_create(users, batch_size=self.batch_size)
+        # bulk_create skips the User signals that fill the search directory
+        sync_directory(users)
+        return users
+
+    def create_board(self, users, members_per_board, tasks_per_board, comments_per_task):
+        members = self.random.sample(users, min(members_per_board, len(users)))
+        owner = members[0]
+        board = Board.objects.create(title=f'Project {self.random.randint(1, 9999)}', owner=owner)
+        Board.members.through.objects.bulk_create(
+            [Board.members.through(board_id=board.pk, user_id=member.pk) for member in members],
+            batch_size=self.batch_size,
+        )
+
+        today = date.today()
+        for start in range(0, tasks_per_board, self.batch_size):
+            tasks = [
+                Task(
+                    board=board,
+                    title=f'{self.random.choice(TASK_VERBS)} {self.random.choice(TASK_NOUNS)}',
+                    description='Generated task.',
+                    status=self.random.choice(STATUSES),
+                    priority=self.random.choice(PRIORITIES),
+                    assignee=self.random.choice(members),
+                    reviewer=self.random.choice(members),
+                    due_date=today + timedelta(days=self.random.randint(-30, 90)),
+                )
+                for _ in range(min(self.batch_size, tasks_per_board - start))
+            ]
+            Task.objects.bulk_create(tasks, batch_size=self.batch_size)
+            self.create_comments(tasks, members, comments_per_task)
+
+        # bulk_create skips the counter signals, so count the board in one pass
+        reconcile_counters(board_ids=[board.pk])
+
+    def create_comments(self, tasks, members, comments_per_task):
+        comments = []
+        for task in tasks:
+            for number in range(comments_per_task):
+                comments.append(Comment(task_id=task.pk, author=self.random.choice(members),
+                                        content=f'Comment {number + 1} on "{task.title}".'))
+            if len(comments) >= self.batch_size:
+                Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+                comments = []
+        Comment.objects.bulk_create(comments, batch_size=self.batch_size)
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from boards_app.models import Board
+from tasks_app.models import Task
+
+CACHE_KEY = 'kanmind:member-board-ids:{user_id}'
+
+
+def membership_cache_timeout():
+    """
+    Lifetime of the cross-request board-id cache in seconds, or None when disabled.
+    """
+    return getattr(settings, 'MEMBERSHIP_CACHE_TIMEOUT', None)
+
+
+def load_member_board_ids(user_id):
+    """
+    Return the ids of all boards the user owns or is a member of.
+
+    Owners can leave the member list of their boards but keep access.
+    Reads the cross-request cache when it is enabled; otherwise this is
+    one query over the board owners and the members through table.
+    """
+    timeout = membership_cache_timeout()
+    key = CACHE_KEY.format(user_id=user_id)
+    if timeout:
+        board_ids = cache.get(key)
+        if board_ids is not None:
+            return board_ids
+
+    owned = Board.objects.filter(owner_id=user_id).values_list('pk', flat=True)
+    memberships = Board.members.through.objects.filter(user_id=user_id).values_list('board_id', flat=True)
+    board_ids = frozenset(owned.union(memberships, all=True))
+    if timeout:
+        cache.set(key, board_ids, timeout)
+    return board_ids
+
+
+def invalidate_member_board_ids(user_ids):
+    if membership_cache_timeout():
+        cache.delete_many([CACHE_KEY.format(user_id=user_id) for user_id in user_ids])
+
+
+def _memo(request):
+    # Memoize on the Django request, so DRF requests and middleware share it
+    http_request = getattr(request, '_request', request)
+    memo = getattr(http_request, '_kanmind_membership', None)
+    if memo is None:
+        memo = http_request._kanmind_membership = {'board_ids': None, 'task_boards': {}}
+    return memo
+
+
+def get_member_board_ids(request):
+    """
+    Return the ids of the boards the requesting user owns or is a member of,
+    loaded at most once per request.
+    """
+    memo = _memo(request)
+    if memo['board_ids'] is None:
+        memo['board_ids'] = load_member_board_ids(request.user.pk)
+    return memo['board_ids']
+
+
+def is_board_member(request, board_id):
+    return board_id in get_member_board_ids(request)
+
+
+def get_task_board_id(request, task_id):
+    """
+    Return the board id of a task, or None if the task does not exist.
+    Memoized per request.
+    """
+    task_boards = _memo(request)['task_boards']
+    if task_id not in task_boards:
+        task_boards[task_id] = Task.objects.filter(pk=task_id).values_list('board_id', flat=True).first()
+    return task_boards[task_id]
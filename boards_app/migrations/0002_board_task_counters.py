@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='tasks_done_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_high_prio_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_in_progress_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_review_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='board',
+            name='tasks_to_do_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
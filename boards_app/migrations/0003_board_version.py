@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0002_board_task_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='version',
+            field=models.BigIntegerField(default=1, editable=False),
+        ),
+    ]
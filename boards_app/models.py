@@ -1,7 +1,17 @@
-from django.db import models
+from django.apps import apps
+from django.db import connections, models, router, transaction
 from django.contrib.auth.models import User
 
 
+def savable_fields(instance, maintained_fields):
+    """
+    Return the loaded, non-maintained fields of an instance, for use as update_fields.
+    """
+    deferred = instance.get_deferred_fields()
+    return [field.name for field in instance._meta.concrete_fields
+            if not field.primary_key and field.name not in maintained_fields and field.attname not in deferred]
+
+
 class Board(models.Model):
     """
     Represents a project board.
@@ -9,10 +19,80 @@ class Board(models.Model):
     - Each board has a title.
     - An owner who manages the board.
     - Members who can view or contribute to the board.
+    - Denormalized task counters, maintained by tasks_app.counters.
+    - A version marker, bumped on any change to the board, its members,
+      its tasks or their comments (see boards_app.versioning).
     """
+    # Columns maintained with F() updates; regular saves must not write
+    # back the stale values loaded with the instance.
+    MAINTAINED_FIELDS = ('tasks_to_do_count', 'tasks_in_progress_count', 'tasks_review_count',
+                         'tasks_done_count', 'tasks_high_prio_count', 'version')
+
     title = models.CharField(max_length=255)
     members = models.ManyToManyField(User, related_name='member_boards')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owner_boards')
+    tasks_to_do_count = models.IntegerField(default=0, editable=False)
+    tasks_in_progress_count = models.IntegerField(default=0, editable=False)
+    tasks_review_count = models.IntegerField(default=0, editable=False)
+    tasks_done_count = models.IntegerField(default=0, editable=False)
+    tasks_high_prio_count = models.IntegerField(default=0, editable=False)
+    version = models.BigIntegerField(default=1, editable=False)
 
     def __str__(self):
         return self.title
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = savable_fields(self, self.MAINTAINED_FIELDS)
+        super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        """
+        Delete the board with its tasks and comments.
+
+        - Tasks and comments are deleted with one DELETE statement each
+          first; the collector would load every row for their signals.
+        - Their delete signals are skipped on purpose: counters and
+          tombstones belong to the board, and streams get board.deleted.
+        - Deletes of board querysets and cascades from a deleted owner
+          still go through the collector.
+        """
+        using = using or router.db_for_write(type(self), instance=self)
+        Task = apps.get_model('tasks_app', 'Task')
+        Comment = apps.get_model('tasks_app', 'Comment')
+        quote = connections[using].ops.quote_name
+        tasks = quote(Task._meta.db_table)
+        comments = quote(Comment._meta.db_table)
+        board_column = quote(Task._meta.get_field('board').column)
+        task_column = quote(Comment._meta.get_field('task').column)
+        # Comment is the only model referencing Task, and nothing references Comment;
+        # boards_app.tests.BoardDetailTests guards this.
+        with transaction.atomic(using=using, savepoint=False), connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {comments} WHERE {task_column} IN '
+                           f'(SELECT {quote(Task._meta.pk.column)} FROM {tasks} WHERE {board_column} = %s)',
+                           [self.pk])
+            cursor.execute(f'DELETE FROM {tasks} WHERE {board_column} = %s', [self.pk])
+            return super().delete(using=using, keep_parents=keep_parents)
+
+    @property
+    def ticket_count(self):
+        return (self.tasks_to_do_count + self.tasks_in_progress_count
+                + self.tasks_review_count + self.tasks_done_count)
+
+
+class MembershipChange(models.Model):
+    """
+    Log entry for a user added to or removed from a board.
+
+    - Read by the delta sync endpoint; the current member list tells
+      whether the change was an addition or a removal.
+    - Pruned by the prune_sync_log command.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='membership_changes', db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='membership_changes')
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'changed_at'], name='membership_board_changed_idx'),
+        ]
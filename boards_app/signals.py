@@ -0,0 +1,82 @@
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from boards_app import events, sync
+from boards_app.membership import invalidate_member_board_ids, membership_cache_timeout
+from boards_app.models import Board
+from boards_app.snapshots import invalidate_board_snapshot
+from boards_app.versioning import bump_versions
+from tasks_app.models import Task
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def update_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    React to users added to or removed from boards, in either direction.
+
+    - Drops cached board ids of the affected users.
+    - Bumps the version of the affected boards.
+    - Logs the changes for delta sync and publishes them to open streams.
+    """
+    if action == 'pre_clear':
+        # The through rows are gone by post_clear, so remember them now
+        related = instance.member_boards if reverse else instance.members
+        instance._cleared_pks = list(related.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    related_pks = getattr(instance, '_cleared_pks', []) if action == 'post_clear' else pk_set or ()
+    # (board_id, user_id) for every changed membership
+    pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in related_pks]
+    if not pairs:
+        return
+    invalidate_member_board_ids({user_id for board_id, user_id in pairs})
+    bump_versions(Board.objects.filter(pk__in={board_id for board_id, user_id in pairs}))
+    sync.record_membership_changes(pairs)
+    event_type = 'member.added' if action == 'post_add' else 'member.removed'
+    for board_id, user_id in pairs:
+        events.publish(board_id, event_type, user=user_id)
+
+
+@receiver(pre_delete, sender=Board)
+def remember_members_on_board_delete(sender, instance, **kwargs):
+    # The through rows are gone by post_delete, so collect the members now
+    if membership_cache_timeout():
+        instance._deleted_member_ids = [instance.owner_id, *instance.members.values_list('pk', flat=True)]
+
+
+@receiver(post_save, sender=Board)
+def invalidate_membership_on_board_create(sender, instance, created, raw=False, **kwargs):
+    # Owned boards count as member boards; the owner is not writable through the API
+    if created and not raw:
+        invalidate_member_board_ids([instance.owner_id])
+
+
+@receiver(post_delete, sender=Board)
+def invalidate_membership_on_board_delete(sender, instance, **kwargs):
+    invalidate_member_board_ids(getattr(instance, '_deleted_member_ids', []))
+
+
+@receiver(post_save, sender=Board)
+def bump_version_on_board_save(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        bump_versions(Board.objects.filter(pk=instance.pk))
+        events.publish(instance.pk, 'board.updated')
+
+
+@receiver(post_save, sender=User)
+def bump_version_on_user_save(sender, instance, created, raw=False, **kwargs):
+    # Member, assignee and reviewer names are part of the board detail
+    if not created and not raw:
+        tasks = Task.objects.filter(Q(assignee=instance) | Q(reviewer=instance)).values('board_id')
+        memberships = Board.members.through.objects.filter(user=instance).values('board_id')
+        bump_versions(Board.objects.filter(Q(pk__in=memberships) | Q(pk__in=tasks)))
+
+
+@receiver(post_delete, sender=Board)
+def drop_snapshot_on_board_delete(sender, instance, **kwargs):
+    invalidate_board_snapshot(instance.pk)
+    events.publish(instance.pk, 'board.deleted')
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+SNAPSHOT_KEY = 'kanmind:board-snapshot:{board_id}'
+
+
+class SnapshotStats:
+    """
+    Process-local hit, miss and rebuild-time counters of the snapshot cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.rebuild_seconds = 0.0
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_rebuild(self, seconds):
+        with self._lock:
+            self.misses += 1
+            self.rebuild_seconds += seconds
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'rebuild_seconds': self.rebuild_seconds,
+                'avg_rebuild_seconds': self.rebuild_seconds / self.misses if self.misses else 0.0,
+            }
+
+
+snapshot_stats = SnapshotStats()
+
+
+def snapshot_timeout():
+    """
+    Lifetime of a cached board snapshot in seconds; 0 disables the cache.
+    """
+    return getattr(settings, 'BOARD_SNAPSHOT_TIMEOUT', 0)
+
+
+def get_board_snapshot(board, build):
+    """
+    Return the rendered detail payload of a board, built at most once per version.
+
+    - One cache entry per board holds (version, payload); an entry for
+      another version is a miss and is replaced by the rebuilt payload.
+    - Every write to the board, its members, tasks or comments bumps the
+      version (see boards_app.versioning), which invalidates the entry.
+    - build(board) renders the payload on a miss.
+    """
+    timeout = snapshot_timeout()
+    if not timeout:
+        return build(board)
+
+    key = SNAPSHOT_KEY.format(board_id=board.pk)
+    entry = cache.get(key)
+    if entry is not None and entry[0] == board.version:
+        snapshot_stats.record_hit()
+        return entry[1]
+
+    started = time.perf_counter()
+    payload = build(board)
+    snapshot_stats.record_rebuild(time.perf_counter() - started)
+    cache.set(key, (board.version, payload), timeout)
+    return payload
+
+
+def invalidate_board_snapshot(board_id):
+    if snapshot_timeout():
+        cache.delete(SNAPSHOT_KEY.format(board_id=board_id))
@@ -0,0 +1,158 @@
+import base64
+import binascii
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from boards_app.models import Board, MembershipChange
+from tasks_app.models import Comment, Tombstone
+
+DEFAULT_DELTA_SYNC = {
+    # Seconds subtracted from every token, so rows written by transactions
+    # that committed after the token was issued are still picked up
+    'OVERLAP': 5,
+    # Days tombstones and membership changes are kept; older tokens expire
+    'RETENTION_DAYS': 30,
+}
+
+_local = threading.local()
+
+
+class SyncTokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Sync token expired, reload the board.'
+    default_code = 'sync_token_expired'
+
+
+def sync_config():
+    return {**DEFAULT_DELTA_SYNC, **getattr(settings, 'DELTA_SYNC', {})}
+
+
+def retention_horizon():
+    """
+    Oldest moment still covered by the tombstone and membership logs.
+    """
+    return timezone.now() - timedelta(days=sync_config()['RETENTION_DAYS'])
+
+
+def encode_token(moment):
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip('=')
+
+
+def decode_token(token):
+    """
+    Return the moment changes are read from for a token.
+
+    - Raises ValidationError for malformed tokens.
+    - Raises SyncTokenExpired when the logs no longer cover the token.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        moment = datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError({'since': ['Invalid sync token.']})
+    if timezone.is_naive(moment):
+        raise ValidationError({'since': ['Invalid sync token.']})
+    if moment < retention_horizon():
+        raise SyncTokenExpired()
+    return moment - timedelta(seconds=sync_config()['OVERLAP'])
+
+
+def record_tombstone(board_id, kind, object_id):
+    """
+    Record a task or comment leaving a board, or collect it while inside deferred().
+    """
+    tombstone = Tombstone(board_id=board_id, kind=kind, object_id=object_id)
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending.append(tombstone)
+        return
+    tombstone.save()
+
+
+@contextmanager
+def deferred():
+    """
+    Collect tombstones and write them on exit with one bulk insert.
+
+    Meant for bulk operations inside a transaction; on error nothing is written.
+    """
+    if getattr(_local, 'pending', None) is not None:
+        # Nested: the outermost block writes everything
+        yield
+        return
+
+    _local.pending = []
+    try:
+        yield
+        pending = _local.pending
+    finally:
+        _local.pending = None
+    if pending:
+        Tombstone.objects.bulk_create(pending)
+
+
+def record_membership_changes(pairs):
+    """
+    Log (board_id, user_id) membership changes with one bulk insert.
+    """
+    MembershipChange.objects.bulk_create(
+        [MembershipChange(board_id=board_id, user_id=user_id) for board_id, user_id in pairs]
+    )
+
+
+def board_changes(board, since=None):
+    """
+    Collect the changes of a board after a moment, or its full state without one.
+
+    - Every query runs on a (board, timestamp) or (task, timestamp) index,
+      so the cost follows the number of changes, not the board size.
+    - Comment changes touch their task, so changed comments are only
+      looked up on changed tasks.
+    - Returns querysets for tasks, comments and member changes plus
+      the deleted task and comment ids.
+    """
+    tasks = board.tasks.all()
+    tombstones = board.tombstones.none()
+    changed_users = board.members.through.objects.filter(board_id=board.pk).values('user_id')
+    if since is not None:
+        tasks = tasks.filter(updated_at__gt=since)
+        tombstones = board.tombstones.filter(deleted_at__gt=since)
+        changed_users = board.membership_changes.filter(changed_at__gt=since).values('user_id')
+
+    comments = Comment.objects.filter(task__in=tasks.values('pk'))
+    if since is not None:
+        comments = comments.filter(updated_at__gt=since)
+
+    memberships = Board.members.through.objects.filter(board_id=board.pk, user_id=OuterRef('pk'))
+    users = User.objects.filter(pk__in=changed_users).annotate(is_member=Exists(memberships)).order_by('pk')
+
+    deleted = {'task': [], 'comment': []}
+    for kind, object_id in tombstones.order_by('deleted_at', 'pk').values_list('kind', 'object_id'):
+        deleted[kind].append(object_id)
+
+    return {
+        'tasks': tasks.select_related('assignee', 'reviewer').order_by('updated_at', 'pk'),
+        'comments': comments.select_related('author').order_by('updated_at', 'pk'),
+        'users': users,
+        'deleted_tasks': deleted['task'],
+        'deleted_comments': deleted['comment'],
+    }
+
+
+def prune_sync_log(before=None):
+    """
+    Delete tombstones and membership changes older than the retention window.
+    Returns the number of deleted rows of each.
+    """
+    before = before or retention_horizon()
+    tombstones, _ = Tombstone.objects.filter(deleted_at__lt=before).delete()
+    changes, _ = MembershipChange.objects.filter(changed_at__lt=before).delete()
+    return tombstones, changes
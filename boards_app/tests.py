@@ -1,3 +1,967 @@
-from django.test import TestCase
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from auth_app.authentication import token_cache
+from boards_app import events
+from boards_app.api.views import BoardExportView, BoardMembersDeltaView
+from boards_app.events import BoardFull, InProcessHub
+from boards_app.export import ndjson_chunks
+from boards_app.importer import BoardImporter
+from boards_app.membership import get_member_board_ids, is_board_member, load_member_board_ids
+from boards_app.models import Board, MembershipChange
+from boards_app.snapshots import SNAPSHOT_KEY, snapshot_stats
+from boards_app.sync import encode_token
+from core.testing import LARGE_SEED, QueryBudgetTestCase
+from tasks_app.counters import reconcile_counters
+from tasks_app.models import Comment, Task, Tombstone
+
+
+class BoardListTests(APITestCase):
+    """
+    Tests for the board list endpoint and its annotated counters.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.other = User.objects.create_user(username='other@example.com', email='other@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def create_board(self, title='Board', tasks=()):
+        board = Board.objects.create(title=title, owner=self.user)
+        board.members.add(self.user, self.other)
+        for status, priority in tasks:
+            Task.objects.create(board=board, title='Task', description='', status=status,
+                                priority=priority, due_date=date(2026, 1, 1))
+        return board
+
+    def test_counters_are_annotated(self):
+        self.create_board(tasks=[('to-do', 'high'), ('to-do', 'low'), ('done', 'high')])
+
+        response = self.client.get(reverse('boards'))
+
+        self.assertEqual(response.status_code, 200)
+        board = response.data[0]
+        self.assertEqual(board['member_count'], 2)
+        self.assertEqual(board['ticket_count'], 3)
+        self.assertEqual(board['tasks_to_do_count'], 2)
+        self.assertEqual(board['tasks_high_prio_count'], 2)
+
+    def test_query_count_does_not_grow_with_boards(self):
+        self.create_board(tasks=[('to-do', 'high')])
+        token_cache.clear()
+        with self.assertNumQueries(2):
+            self.client.get(reverse('boards'))
+
+        for index in range(5):
+            self.create_board(title=f'Board {index}', tasks=[('review', 'medium'), ('to-do', 'high')])
+        token_cache.clear()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('boards'))
+        self.assertEqual(len(response.data), 6)
+
+    def test_boards_of_other_users_are_hidden(self):
+        stranger = User.objects.create_user(username='stranger@example.com')
+        Board.objects.create(title='Hidden', owner=stranger)
+        self.create_board()
+
+        response = self.client.get(reverse('boards'))
+
+        self.assertEqual([board['title'] for board in response.data], ['Board'])
+
+    def test_create_falls_back_to_counter_queries(self):
+        response = self.client.post(reverse('boards'), {'title': 'New', 'members': [self.other.pk]})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['member_count'], 2)
+        self.assertEqual(response.data['ticket_count'], 0)
+
+
+class BoardDetailTests(APITestCase):
+    """
+    Tests for the board detail endpoint and its prefetch plan.
+    """
+
+    # Token + user, board, members, tasks with assignee/reviewer,
+    # the owner passes IsOwnerOrMember without a query.
+    DETAIL_QUERY_COUNT = 4
+
+    def setUp(self):
+        # Board ids are reused between tests, so start without snapshots
+        cache.clear()
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+
+    def add_tasks(self, count):
+        for index in range(count):
+            member = User.objects.create_user(username=f'member{User.objects.count()}@example.com')
+            self.board.members.add(member)
+            task = Task.objects.create(board=self.board, title=f'Task {index}', description='',
+                                       status='to-do', priority='low', due_date=date(2026, 1, 1),
+                                       assignee=member, reviewer=self.user)
+            task.task_comments.create(author=member, content='First')
+            task.task_comments.create(author=self.user, content='Second')
+
+    def test_query_count_is_independent_of_board_size(self):
+        url = reverse('boards_detail', kwargs={'pk': self.board.pk})
+
+        self.add_tasks(2)
+        token_cache.clear()
+        with self.assertNumQueries(self.DETAIL_QUERY_COUNT):
+            self.client.get(url)
+
+        self.add_tasks(20)
+        token_cache.clear()
+        with self.assertNumQueries(self.DETAIL_QUERY_COUNT):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.data['tasks']), 22)
+        self.assertEqual(len(response.data['members']), 23)
+        task = response.data['tasks'][0]
+        self.assertEqual(task['comments_count'], 2)
+        self.assertEqual(task['reviewer']['email'], 'owner@example.com')
+
+    def test_delete_removes_tasks_and_comments_in_bulk(self):
+        self.add_tasks(3)
+        other = Board.objects.create(title='Other', owner=self.user)
+        kept = Task.objects.create(board=other, title='Kept', description='', status='to-do',
+                                   priority='low', due_date=date(2026, 1, 1))
+        kept.task_comments.create(author=self.user, content='Kept')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.board.delete()
+
+        # No task or comment rows are loaded for the cascade
+        self.assertFalse([query for query in queries.captured_queries
+                          if query['sql'].startswith('SELECT') and 'tasks_app_comment' in query['sql']])
+        self.assertEqual(list(Task.objects.values_list('pk', flat=True)), [kept.pk])
+        self.assertEqual(list(Comment.objects.values_list('content', flat=True)), ['Kept'])
+
+    def test_delete_covers_every_model_below_the_board_tasks(self):
+        # Board.delete removes tasks and comments with plain DELETE statements,
+        # so a new model referencing either must be added there.
+        self.assertEqual([relation.related_model for relation in Task._meta.related_objects], [Comment])
+        self.assertEqual(Comment._meta.related_objects, ())
+
+
+class BoardETagTests(APITestCase):
+    """
+    Tests for the board version and conditional GETs of the board detail.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.other = User.objects.create_user(username='other@example.com', email='other@example.com')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.task = Task.objects.create(board=self.board, title='Task', description='', status='to-do',
+                                        priority='low', assignee=self.user, due_date=date(2026, 1, 1))
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = reverse('boards_detail', kwargs={'pk': self.board.pk})
+
+    def assertChanged(self, change):
+        etag = self.client.get(self.url)['ETag']
+        change()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_unchanged_board_is_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_board_changes_change_the_etag(self):
+        def rename():
+            self.board.title = 'Renamed'
+            self.board.save()
+        self.assertChanged(rename)
+        self.assertChanged(lambda: self.board.members.add(self.other))
+        self.assertChanged(lambda: self.other.member_boards.remove(self.board))
+
+    def test_task_and_comment_changes_change_the_etag(self):
+        def move():
+            self.task.status = 'done'
+            self.task.save()
+        self.assertChanged(move)
+        self.assertChanged(lambda: self.task.task_comments.create(author=self.user, content='Hi'))
+        self.assertChanged(lambda: self.task.task_comments.all().delete())
+        self.assertChanged(lambda: self.task.delete())
+
+    def test_member_profile_change_changes_the_etag(self):
+        def rename():
+            self.user.first_name = 'Renamed'
+            self.user.save()
+        self.assertChanged(rename)
+
+    def test_stale_instance_save_keeps_counters_and_version(self):
+        stale = Board.objects.get(pk=self.board.pk)
+        Task.objects.create(board=self.board, title='Task', description='', status='to-do',
+                            priority='high', due_date=date(2026, 1, 1))
+        stale.title = 'Renamed'
+        stale.save()
+
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual(board.tasks_to_do_count, 2)
+        self.assertEqual(board.tasks_high_prio_count, 1)
+        self.assertGreater(board.version, stale.version)
+
+    def test_non_member_gets_no_etag(self):
+        stranger = User.objects.create_user(username='stranger@example.com')
+        token = Token.objects.create(user=stranger)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='*')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('ETag', response)
+
+
+class BoardSnapshotTests(APITestCase):
+    """
+    Tests for the cached board detail payload and its invalidation.
+    """
+
+    def setUp(self):
+        cache.clear()
+        snapshot_stats.reset()
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.task = Task.objects.create(board=self.board, title='Task', description='', status='to-do',
+                                        priority='low', assignee=self.user, due_date=date(2026, 1, 1))
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = reverse('boards_detail', kwargs={'pk': self.board.pk})
+
+    def test_second_read_is_a_hit(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+
+        self.assertEqual(first.data, second.data)
+        stats = snapshot_stats.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+        self.assertGreater(stats['rebuild_seconds'], 0)
+
+    def test_writes_rebuild_the_snapshot(self):
+        self.client.get(self.url)
+
+        self.task.title = 'Renamed'
+        self.task.save()
+        self.assertEqual(self.client.get(self.url).data['tasks'][0]['title'], 'Renamed')
+
+        self.task.task_comments.create(author=self.user, content='Hi')
+        self.assertEqual(self.client.get(self.url).data['tasks'][0]['comments_count'], 1)
+
+        self.user.first_name = 'Owner'
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).data['members'][0]['fullname'], 'Owner')
+
+        other = User.objects.create_user(username='other@example.com', email='other@example.com')
+        self.board.members.add(other)
+        self.assertEqual(len(self.client.get(self.url).data['members']), 2)
+
+        self.assertEqual(snapshot_stats.stats()['hits'], 0)
+
+    def test_board_delete_drops_the_snapshot(self):
+        self.client.get(self.url)
+        key = SNAPSHOT_KEY.format(board_id=self.board.pk)
+        self.assertIsNotNone(cache.get(key))
+
+        self.board.delete()
+
+        self.assertIsNone(cache.get(key))
+
+    @override_settings(BOARD_SNAPSHOT_TIMEOUT=0)
+    def test_disabled_cache_renders_every_request(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        self.assertEqual(snapshot_stats.stats()['misses'], 0)
+        self.assertIsNone(cache.get(SNAPSHOT_KEY.format(board_id=self.board.pk)))
+
+
+class BoardChangesTests(APITestCase):
+    """
+    Tests for the delta sync endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.other = User.objects.create_user(username='other@example.com', email='other@example.com')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.task = self.create_task()
+        self.comment = self.task.task_comments.create(author=self.user, content='First')
+        # Move the fixture out of the window of past_token()
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Task.objects.update(updated_at=an_hour_ago)
+        Comment.objects.update(updated_at=an_hour_ago)
+        MembershipChange.objects.update(changed_at=an_hour_ago)
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.url = reverse('boards_changes', kwargs={'pk': self.board.pk})
+
+    def create_task(self, board=None, title='Task'):
+        return Task.objects.create(board=board or self.board, title=title, description='', status='to-do',
+                                   priority='low', assignee=self.user, due_date=date(2026, 1, 1))
+
+    def sync(self, since=None):
+        response = self.client.get(self.url, {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def past_token(self, seconds=60):
+        return encode_token(timezone.now() - timedelta(seconds=seconds))
+
+    def test_full_sync_without_token(self):
+        data = self.sync()
+
+        self.assertIsNone(data['since'])
+        self.assertEqual([task['id'] for task in data['tasks']], [self.task.pk])
+        self.assertEqual([comment['task'] for comment in data['comments']], [self.task.pk])
+        self.assertEqual([member['email'] for member in data['members']], ['owner@example.com'])
+        self.assertEqual((data['deleted_tasks'], data['deleted_comments'], data['removed_members']), ([], [], []))
+
+    def test_only_changes_after_the_token_are_returned(self):
+        unchanged = self.create_task(title='Unchanged')
+        Task.objects.filter(pk=unchanged.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        since = self.past_token()
+
+        self.task.title = 'Renamed'
+        self.task.save()
+        self.create_task(title='New')
+        data = self.sync(since)
+
+        self.assertEqual([task['title'] for task in data['tasks']], ['Renamed', 'New'])
+        self.assertEqual(data['comments'], [])
+        self.assertEqual(data['members'], [])
+
+    def test_comment_changes_include_their_task(self):
+        since = self.past_token()
+
+        comment = self.task.task_comments.create(author=self.other, content='Second')
+        data = self.sync(since)
+
+        self.assertEqual([task['comments_count'] for task in data['tasks']], [2])
+        self.assertEqual([item['id'] for item in data['comments']], [comment.pk])
+
+    def test_deleting_the_owner_deletes_boards_without_tombstones(self):
+        other_board = Board.objects.create(title='Other', owner=self.other)
+        # Assigned to the deleted user, so it goes too, from a board that stays
+        assigned = self.create_task(board=other_board)
+        assigned.task_comments.create(author=self.other, content='Gone with the task')
+        kept = Task.objects.create(board=other_board, title='Kept', description='', status='to-do',
+                                   priority='low', due_date=date(2026, 1, 1))
+        kept.task_comments.create(author=self.user, content='Gone with the author')
+
+        self.user.delete()
+        connection.check_constraints()
+
+        self.assertFalse(Board.objects.filter(pk=self.board.pk).exists())
+        self.assertEqual(sorted(Tombstone.objects.values_list('board_id', 'kind')),
+                         [(other_board.pk, 'comment'), (other_board.pk, 'task')])
+        other_board.refresh_from_db()
+        self.assertEqual(other_board.tasks_to_do_count, 1)
+        kept.refresh_from_db()
+        self.assertEqual(kept.comment_count, 0)
+
+    def test_deletes_and_moves_leave_tombstones(self):
+        since = self.past_token()
+        comment_id = self.comment.pk
+        self.comment.delete()
+        doomed = self.create_task()
+        doomed_id = doomed.pk
+        doomed.delete()
+        other_board = Board.objects.create(title='Other', owner=self.user)
+        self.task.board = other_board
+        self.task.save()
+
+        data = self.sync(since)
+
+        self.assertEqual(data['deleted_comments'], [comment_id])
+        self.assertEqual(data['deleted_tasks'], [doomed_id, self.task.pk])
+        self.assertEqual(data['tasks'], [])
+
+    def test_membership_changes(self):
+        since = self.past_token()
+        self.board.members.add(self.other)
+        stranger = User.objects.create_user(username='stranger@example.com')
+        self.board.members.add(stranger)
+        stranger.member_boards.remove(self.board)
+
+        data = self.sync(since)
+
+        self.assertEqual([member['email'] for member in data['members']], ['other@example.com'])
+        self.assertEqual(data['removed_members'], [stranger.pk])
+
+    def test_next_token_picks_up_later_changes(self):
+        token = self.sync()['next']
+        renamed = self.create_task(title='Later')
+
+        data = self.sync(token)
+
+        self.assertIn(renamed.pk, [task['id'] for task in data['tasks']])
+
+    def test_invalid_and_expired_tokens(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'not-a-token'}).status_code, 400)
+        expired = self.past_token(seconds=31 * 24 * 3600)
+        self.assertEqual(self.client.get(self.url, {'since': expired}).status_code, 410)
+
+    def test_prune_sync_log(self):
+        self.comment.delete()
+        self.board.members.add(self.other)
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=31))
+
+        call_command('prune_sync_log', stdout=StringIO())
+
+        self.assertFalse(Tombstone.objects.exists())
+        self.assertEqual(MembershipChange.objects.count(), 2)
+
+    def test_non_member_is_forbidden(self):
+        stranger = User.objects.create_user(username='stranger@example.com')
+        token = Token.objects.create(user=stranger)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class RecordingHub(InProcessHub):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def publish(self, board_id, event):
+        self.events.append(event)
+        super().publish(board_id, event)
+
+
+class BoardEventsTests(TestCase):
+    """
+    Tests for the event hub, the published events and the SSE stream.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        self.token = Token.objects.create(user=self.user)
+        self.hub = RecordingHub()
+        patcher = mock.patch.object(events, '_hub', self.hub)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def published(self, change):
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        events_, self.hub.events = self.hub.events, []
+        return [(event['type'], event['board']) for event in events_]
+
+    def test_changes_are_published_after_commit(self):
+        other = User.objects.create_user(username='other@example.com')
+        with self.captureOnCommitCallbacks() as callbacks:
+            task = Task.objects.create(board=self.board, title='Task', description='', status='to-do',
+                                       priority='low', due_date=date(2026, 1, 1))
+        self.assertEqual(self.hub.events, [])
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertEqual(self.hub.events[0], {'type': 'task.created', 'board': self.board.pk, 'task': task.pk})
+        self.hub.events = []
+
+        board_id = self.board.pk
+        self.assertEqual(self.published(lambda: task.task_comments.create(author=self.user, content='Hi')),
+                         [('comment.created', board_id)])
+        self.assertEqual(self.published(lambda: self.board.members.add(other)), [('member.added', board_id)])
+        self.assertEqual(self.published(lambda: self.board.members.remove(other)), [('member.removed', board_id)])
+        self.assertEqual(self.published(task.delete), [('task.deleted', board_id)])
+        self.assertEqual(self.published(self.board.delete), [('board.deleted', board_id)])
+
+    def test_rolled_back_changes_are_not_published(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Task.objects.create(board=self.board, title='Task', description='', status='to-do',
+                                        priority='low', due_date=date(2026, 1, 1))
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(self.hub.events, [])
+
+    @override_settings(BOARD_EVENTS={'MAX_CONNECTIONS_PER_BOARD': 2, 'QUEUE_SIZE': 2})
+    def test_hub_limits(self):
+        async def scenario():
+            first = self.hub.subscribe(1)
+            self.hub.subscribe(1)
+            with self.assertRaises(BoardFull):
+                self.hub.subscribe(1)
+            self.hub.subscribe(2)
+
+            for index in range(3):
+                self.hub.publish(1, {'type': 'task.updated', 'board': 1, 'task': index})
+            await asyncio.sleep(0)
+            # The third event overflows the queue, so the stream must resync
+            self.assertIsNone(await first.get())
+
+            self.hub.unsubscribe(first)
+            self.hub.subscribe(1)
+            self.assertEqual(self.hub.stats()['rejected'], 1)
+
+        async_to_sync(scenario)()
+
+    async def test_stream(self):
+        response = await self.async_client.get(reverse('boards_events', kwargs={'pk': self.board.pk}),
+                                               {'token': self.token.key})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = aiter(response.streaming_content)
+
+        self.assertEqual(await anext(content), b'retry: 5000\n\n')
+        self.assertTrue((await anext(content)).startswith(b'event: ready\n'))
+        self.hub.publish(self.board.pk, {'type': 'task.updated', 'board': self.board.pk, 'task': 7})
+        self.assertEqual(await anext(content),
+                         b'event: task.updated\ndata: {"type": "task.updated", "board": %d, "task": 7}\n\n'
+                         % self.board.pk)
+
+        # As the ASGI handler does when the client goes away
+        await content.aclose()
+        response.close()
+        self.assertEqual(self.hub.stats()['connections'], 0)
+
+    async def test_unstarted_stream_frees_its_slot(self):
+        response = await self.async_client.get(reverse('boards_events', kwargs={'pk': self.board.pk}),
+                                               {'token': self.token.key})
+        self.assertEqual(self.hub.stats()['connections'], 1)
+
+        # Closed before the first event was sent
+        response.close()
+        self.assertEqual(self.hub.stats()['connections'], 0)
+
+    async def test_stream_access(self):
+        url = reverse('boards_events', kwargs={'pk': self.board.pk})
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+
+        stranger = await sync_to_async(User.objects.create_user)(username='stranger@example.com')
+        token = await sync_to_async(Token.objects.create)(user=stranger)
+        response = await self.async_client.get(url, headers={'Authorization': 'Token ' + token.key})
+        self.assertEqual(response.status_code, 403)
+
+        missing = reverse('boards_events', kwargs={'pk': 999999})
+        self.assertEqual((await self.async_client.get(missing, {'token': self.token.key})).status_code, 404)
+
+
+class BoardExportTests(APITestCase):
+    """
+    Tests for the streaming board export.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_kanmind', seed=1, stdout=StringIO(), users=10, boards=1, members_per_board=5,
+                     tasks_per_board=3000, comments_per_task=2)
+        cls.board = Board.objects.get()
+        cls.token = Token.objects.create(user=cls.board.owner)
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('boards_export', kwargs={'pk': self.board.pk})
+
+    def test_ndjson(self):
+        response = self.client.get(self.url, {'format': 'ndjson'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(records[0]['type'], 'board')
+        self.assertEqual(records[0]['owner'], self.board.owner.email)
+        self.assertEqual(sum(record['type'] == 'task' for record in records), 3000)
+        self.assertEqual(sum(record['type'] == 'comment' for record in records), 6000)
+
+    def test_csv(self):
+        response = self.client.get(self.url, {'format': 'csv'})
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 1 + 3000 + 6000)
+        task = next(row for row in rows if row['type'] == 'task')
+        self.assertEqual(task['board'], str(self.board.pk))
+        self.assertEqual(task['comments_count'], '2')
+
+    def test_non_member_is_forbidden(self):
+        stranger = User.objects.create_user(username='stranger@example.com')
+        token = Token.objects.create(user=stranger)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+        response = self.client.get(self.url, {'format': 'csv'})
+
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(response.content.startswith(b'detail'))
+
+    @mock.patch.object(BoardExportView, 'chunk_size', 250)
+    def test_peak_memory_is_bounded(self):
+        response = self.client.get(self.url)
+        tracemalloc.start()
+        try:
+            size = 0
+            for chunk in response.streaming_content:
+                size += len(chunk)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # The peak follows the chunk size; holding the whole export
+        # would need several times its size.
+        self.assertGreater(size, 1_500_000)
+        self.assertLess(peak, size / 4)
+
+    async def test_streams_under_asgi(self):
+        response = await self.async_client.get(self.url, headers={'Authorization': 'Token ' + self.token.key})
+
+        self.assertTrue(response.is_async)
+        lines = 0
+        async for chunk in response.streaming_content:
+            lines += chunk.count(b'\n')
+        self.assertEqual(lines, 1 + 3000 + 6000)
+
+
+class BoardImportTests(APITestCase):
+    """
+    Tests for the JSONL import command and endpoint.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_kanmind', seed=2, stdout=StringIO(), users=6, boards=1, members_per_board=4,
+                     tasks_per_board=40, comments_per_task=2)
+        cls.source = Board.objects.get()
+        cls.export = ''.join(ndjson_chunks(cls.source, 100))
+
+    def import_file(self, content, **options):
+        path = self.enterContext(tempfile.TemporaryDirectory()) + '/import.jsonl'
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_boards', path, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_round_trip_of_an_export(self):
+        stdout, stderr = self.import_file(self.export, chunk_size=7)
+
+        self.assertEqual(stderr, '')
+        self.assertIn('Imported 1 boards, 40 tasks and 80 comments', stdout)
+        self.assertIn('Read 7 lines', stdout)
+        board = Board.objects.exclude(pk=self.source.pk).get()
+        self.assertEqual(board.title, self.source.title)
+        self.assertEqual(board.owner_id, self.source.owner_id)
+        self.assertEqual(set(board.members.all()), set(self.source.members.all()))
+        self.assertEqual(board.ticket_count, self.source.ticket_count)
+        self.assertEqual(board.tasks_to_do_count, self.source.tasks_to_do_count)
+        self.assertEqual(board.tasks_high_prio_count, self.source.tasks_high_prio_count)
+        self.assertGreater(board.version, 1)
+        self.assertEqual(reconcile_counters(board_ids=[board.pk], dry_run=True), (0, 0))
+        self.assertEqual(
+            sorted(Comment.objects.filter(task__board=board).values_list('created_at', flat=True)),
+            sorted(Comment.objects.filter(task__board=self.source).values_list('created_at', flat=True)),
+        )
+
+    def test_bad_records_are_reported_and_skipped(self):
+        owner = self.source.owner.email
+        lines = [
+            json.dumps({'type': 'board', 'id': 1, 'title': 'Imported', 'owner': owner.upper(), 'members': []}),
+            '{not json',
+            json.dumps({'type': 'column', 'id': 1}),
+            json.dumps({'type': 'board', 'id': 2, 'title': 'Ghost', 'owner': 'ghost@example.com'}),
+            json.dumps({'type': 'task', 'id': 1, 'board': 2, 'title': 'Lost', 'description': '',
+                        'status': 'to-do', 'priority': 'low', 'due_date': '2026-01-01'}),
+            json.dumps({'type': 'task', 'id': 2, 'board': 1, 'title': 'Kept', 'description': '',
+                        'status': 'to-do', 'priority': 'high', 'assignee': owner, 'due_date': '2026-01-01'}),
+            json.dumps({'type': 'task', 'id': 3, 'board': 1, 'title': 'Bad', 'description': '',
+                        'status': 'unknown', 'priority': 'low', 'due_date': '2026-01-01'}),
+            '',
+            json.dumps({'type': 'comment', 'id': 1, 'task': 2, 'author': owner, 'content': 'Hi'}),
+            json.dumps({'type': 'comment', 'id': 1, 'task': 2, 'author': owner, 'content': 'Again'}),
+        ]
+
+        stdout, stderr = self.import_file('\n'.join(lines), chunk_size=2)
+
+        self.assertIn('Imported 1 boards, 1 tasks and 1 comments', stdout)
+        self.assertIn('6 records rejected', stdout)
+        for line in (2, 3, 4, 5, 7, 10):
+            self.assertIn(f'Line {line}:', stderr)
+        self.assertIn('Line 10: {"id": ["Duplicate id."]}', stderr)
+        board = Board.objects.get(title='Imported')
+        task = board.tasks.get()
+        self.assertEqual(task.comment_count, 1)
+        self.assertEqual((board.tasks_to_do_count, board.tasks_high_prio_count), (1, 1))
+        self.assertIn(board.pk, load_member_board_ids(board.owner_id))
+
+    def test_endpoint_is_admin_only(self):
+        user = User.objects.create_user(username='user@example.com')
+        self.client.force_authenticate(user)
+        upload = SimpleUploadedFile('import.jsonl', self.export.encode())
+
+        response = self.client.post(reverse('boards_import'), {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_endpoint_imports_upload(self):
+        admin = User.objects.create_user(username='admin@example.com', is_staff=True)
+        self.client.force_authenticate(admin)
+        upload = SimpleUploadedFile('import.jsonl', self.export.encode())
+
+        response = self.client.post(reverse('boards_import'), {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], {'boards': 1, 'tasks': 40, 'comments': 80})
+        self.assertEqual(response.data['errors'], [])
+
+    def test_endpoint_requires_file(self):
+        admin = User.objects.create_user(username='admin@example.com', is_staff=True)
+        self.client.force_authenticate(admin)
+
+        response = self.client.post(reverse('boards_import'), {}, format='multipart')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_queries_do_not_grow_with_the_chunk(self):
+        importer = BoardImporter(chunk_size=1000)
+
+        with CaptureQueriesContext(connection) as queries:
+            importer.run(self.export.splitlines())
+
+        self.assertEqual(importer.created, {'boards': 1, 'tasks': 40, 'comments': 80})
+        # users, board, members, tasks, comments, created_at, comment counts,
+        # board counters, plus the savepoint
+        self.assertLessEqual(len(queries), 10)
+
+
+
+
+
+
+
+
+class BoardQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets for every endpoint in boards_app/api/urls.py.
+    """
+
+    def test_list(self):
+        with self.assertMaxQueries(2):
+            response = self.client.get(reverse('boards'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_create(self):
+        members = list(self.board.members.values_list('pk', flat=True)[:3])
+        with self.assertMaxQueries(12):
+            response = self.client.post(reverse('boards'), {'title': 'New', 'members': members})
+        self.assertEqual(response.status_code, 201)
+
+    def test_detail(self):
+        with self.assertMaxQueries(5):
+            response = self.client.get(reverse('boards_detail', kwargs={'pk': self.board.pk}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_from_snapshot(self):
+        url = reverse('boards_detail', kwargs={'pk': self.board.pk})
+        self.client.get(url)
+        token_cache.clear()
+        # Token, board row and membership; the payload comes from the cache
+        with self.assertMaxQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_changes(self):
+        since = encode_token(timezone.now() - timedelta(seconds=60))
+        # Token, board, membership, then tasks, comments, members and tombstones
+        with self.assertMaxQueries(7):
+            response = self.client.get(reverse('boards_changes', kwargs={'pk': self.board.pk}), {'since': since})
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_not_modified(self):
+        url = reverse('boards_detail', kwargs={'pk': self.board.pk})
+        etag = self.client.get(url)['ETag']
+        token_cache.clear()
+        # Token, board row and membership; no member or task is loaded
+        with self.assertMaxQueries(3):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_update(self):
+        # Saving the board and each members.set() step bump its version
+        members = list(self.board.members.values_list('pk', flat=True)[:3])
+        with self.assertMaxQueries(14):
+            response = self.client.patch(reverse('boards_detail', kwargs={'pk': self.board.pk}),
+                                         {'title': 'Renamed', 'members': members})
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete(self):
+        # Only the owner may delete a board
+        token, created = Token.objects.get_or_create(user=self.board.owner)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        # Board.delete removes tasks and comments with one query each
+        with self.assertMaxQueries(10):
+            response = self.client.delete(reverse('boards_detail', kwargs={'pk': self.board.pk}))
+        self.assertEqual(response.status_code, 204)
+
+    def test_members_add(self):
+        members = set(self.board.members.values_list('pk', flat=True))
+        outsiders = list(User.objects.exclude(pk__in=members).values_list('pk', flat=True)[:3])
+        with self.assertMaxQueries(11):
+            response = self.client.post(reverse('boards_members_add', kwargs={'pk': self.board.pk}),
+                                        {'user_ids': outsiders}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_members_remove(self):
+        members = list(self.board.members.exclude(pk__in=[self.user.pk, self.board.owner_id])
+                       .values_list('pk', flat=True)[:3])
+        with self.assertMaxQueries(10):
+            response = self.client.post(reverse('boards_members_remove', kwargs={'pk': self.board.pk}),
+                                        {'user_ids': members}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class LargeBoardQueryBudgetTests(BoardQueryBudgetTests):
+    seed = LARGE_SEED
+
+
+@override_settings(MEMBERSHIP_CACHE_TIMEOUT=60)
+class MembershipResolverTests(TestCase):
+    """
+    Tests for the shared board-membership resolver and its caches.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='member@example.com')
+        self.owner = User.objects.create_user(username='owner@example.com')
+        self.board = Board.objects.create(title='Board', owner=self.owner)
+        self.board.members.add(self.owner, self.user)
+
+    def make_request(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        return request
+
+    def test_memoized_per_request(self):
+        request = self.make_request()
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertTrue(is_board_member(request, self.board.pk))
+            self.assertTrue(is_board_member(request, self.board.pk))
+
+    def test_cached_across_requests(self):
+        get_member_board_ids(self.make_request())
+        with self.assertNumQueries(0):
+            self.assertTrue(is_board_member(self.make_request(), self.board.pk))
+
+    def test_invalidated_by_member_changes(self):
+        get_member_board_ids(self.make_request())
+
+        self.board.members.remove(self.user)
+        self.assertFalse(is_board_member(self.make_request(), self.board.pk))
+
+        self.user.member_boards.add(self.board)
+        self.assertTrue(is_board_member(self.make_request(), self.board.pk))
+
+        self.board.members.clear()
+        self.assertFalse(is_board_member(self.make_request(), self.board.pk))
+
+    def test_owned_boards_count_without_membership(self):
+        get_member_board_ids(self.make_request())
+
+        board = Board.objects.create(title='Owned', owner=self.user)
+
+        board_id = board.pk
+        self.assertTrue(is_board_member(self.make_request(), board_id))
+        board.delete()
+        self.assertFalse(is_board_member(self.make_request(), board_id))
+
+    def test_invalidated_by_board_delete(self):
+        board_id = self.board.pk
+        get_member_board_ids(self.make_request())
+
+        self.board.delete()
+
+        self.assertFalse(is_board_member(self.make_request(), board_id))
+
+
+class BoardMembersDeltaTests(APITestCase):
+    """
+    Tests for the incremental membership endpoints.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner@example.com')
+        self.member = User.objects.create_user(username='member@example.com')
+        self.outsider = User.objects.create_user(username='outsider@example.com')
+        token = Token.objects.create(user=self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.board = Board.objects.create(title='Board', owner=self.owner)
+        self.board.members.add(self.owner, self.member)
+
+    def post(self, name, user_ids):
+        return self.client.post(reverse(name, kwargs={'pk': self.board.pk}), {'user_ids': user_ids}, format='json')
+
+    def test_add_only_new_members(self):
+        response = self.post('boards_members_add', [self.member.pk, self.outsider.pk, 999999])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'added': [self.outsider.pk], 'board': self.board.pk,
+                                         'unknown': [999999], 'member_count': 3})
+
+    def test_remove_keeps_owner(self):
+        response = self.post('boards_members_remove', [self.owner.pk, self.member.pk, self.outsider.pk])
+
+        self.assertEqual(response.data['removed'], [self.member.pk])
+        self.assertEqual(list(self.board.members.values_list('pk', flat=True)), [self.owner.pk])
+
+    def test_unknown_membership_change_is_rejected(self):
+        for change in (None, 'ad'):
+            with self.subTest(change=change), self.assertRaises(ImproperlyConfigured):
+                BoardMembersDeltaView.as_view(membership_change=change)
+
+    def test_non_members_are_rejected(self):
+        token = Token.objects.create(user=self.outsider)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+        response = self.post('boards_members_add', [self.outsider.pk])
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_empty_list_is_rejected(self):
+        response = self.post('boards_members_add', [])
+
+        self.assertEqual(response.status_code, 400)
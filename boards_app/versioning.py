@@ -0,0 +1,41 @@
+import hashlib
+
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+
+
+def bump_versions(boards):
+    """
+    Bump the version of every board in a queryset with a single F() update.
+    """
+    boards.update(version=F('version') + 1)
+
+
+def board_etag(board):
+    """
+    Strong ETag of a board's detail representation, derived from its version.
+    """
+    return f'"board-{board.pk}-v{board.version}"'
+
+
+def boards_etag(boards, *parts):
+    """
+    Strong ETag over the versions of a set of boards plus extra key parts.
+
+    - One query on the boards table; no task or comment rows are loaded.
+    - Any change to one of the boards, or to the set itself, changes the tag.
+    """
+    versions = sorted(boards.order_by().values_list('pk', 'version').distinct())
+    digest = hashlib.sha1(repr((versions, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def not_modified(request, etag):
+    """
+    Return a 304 response if the request's If-None-Match matches the ETag, else None.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
+
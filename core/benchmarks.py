@@ -0,0 +1,33 @@
+import time
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def best_of(repeat, run):
+    """
+    Call run() `repeat` times and return the fastest run in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@contextmanager
+def database_alias(alias, database):
+    """
+    Register `database`, a DATABASES entry, as connection alias `alias` for the block.
+
+    - Missing keys get Django's defaults, as in settings.DATABASES.
+    - Yields the connection; it is closed and unregistered on exit.
+    """
+    connections.settings[alias] = connections.configure_settings({DEFAULT_DB_ALIAS: dict(database)})[DEFAULT_DB_ALIAS]
+    try:
+        yield connections[alias]
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
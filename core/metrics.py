@@ -0,0 +1,267 @@
+import bisect
+import hmac
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth_app.authentication import CachedTokenAuthentication, token_cache
+from boards_app.events import get_hub
+from boards_app.snapshots import snapshot_stats
+
+DEFAULT_METRICS = {
+    # Record request metrics at all
+    'ENABLED': True,
+    # Add a Server-Timing header with db, render and total time to every response
+    'SERVER_TIMING': False,
+    # Bearer token for scrapers; admins can always read the metrics
+    'TOKEN': None,
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def metrics_config():
+    return {**DEFAULT_METRICS, **getattr(settings, 'METRICS', {})}
+
+
+class Histogram:
+    """
+    Cumulative Prometheus histogram with one series per label set.
+    """
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = defaultdict(lambda: {'counts': [0] * (len(buckets) + 1), 'sum': 0.0})
+
+    def observe(self, labels, value):
+        series = self.series[labels]
+        series['counts'][bisect.bisect_left(self.buckets, value)] += 1
+        series['sum'] += value
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series['counts']):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{format_labels(labels, le=bound)}}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{format_labels(labels)}}} {series["sum"]}')
+            lines.append(f'{self.name}_count{{{format_labels(labels)}}} {cumulative}')
+        return lines
+
+
+def format_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    return ','.join(f'{name}="{value}"' for name, value in pairs)
+
+
+def format_metric(name, kind, help_text, value):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}', f'{name} {value}']
+
+
+class RequestMetrics:
+    """
+    Request metrics of this process, per resolved URL name and method.
+
+    - Latency, DB query count, DB time, render (serialization) time and
+      response size, each as a histogram.
+    - Every worker process keeps its own registry; Prometheus scrapes
+      and sums them per instance.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with getattr(self, '_lock', threading.Lock()):
+            self.histograms = {
+                'duration': Histogram('kanmind_request_duration_seconds',
+                                      'Time from request to response.', LATENCY_BUCKETS),
+                'queries': Histogram('kanmind_request_db_queries', 'Database queries per request.', QUERY_BUCKETS),
+                'db': Histogram('kanmind_request_db_seconds', 'Database time per request.', LATENCY_BUCKETS),
+                'render': Histogram('kanmind_request_render_seconds',
+                                    'Response rendering (serialization) time per request.', LATENCY_BUCKETS),
+                'size': Histogram('kanmind_response_size_bytes',
+                                  'Response body size; streamed bodies are not counted.', SIZE_BUCKETS),
+            }
+            self.statuses = defaultdict(int)
+
+    def record(self, route, method, status, timings, size):
+        labels = (('route', route), ('method', method))
+        with self._lock:
+            self.statuses[labels + (('status', str(status)),)] += 1
+            self.histograms['duration'].observe(labels, timings['total'])
+            self.histograms['queries'].observe(labels, timings['queries'])
+            self.histograms['db'].observe(labels, timings['db'])
+            self.histograms['render'].observe(labels, timings['render'])
+            if size is not None:
+                self.histograms['size'].observe(labels, size)
+
+    def expose(self):
+        with self._lock:
+            lines = ['# HELP kanmind_requests_total Requests by route, method and status.',
+                     '# TYPE kanmind_requests_total counter']
+            lines += [f'kanmind_requests_total{{{format_labels(labels)}}} {count}'
+                      for labels, count in sorted(self.statuses.items())]
+            for histogram in self.histograms.values():
+                lines += histogram.expose()
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+
+def cache_metrics():
+    """
+    Counters of the token cache, the board snapshot cache and the event hub.
+    """
+    tokens = token_cache.stats()
+    snapshots = snapshot_stats.stats()
+    hub = get_hub().stats()
+    lines = []
+    lines += format_metric('kanmind_token_cache_hits_total', 'counter', 'Token cache hits.', tokens['hits'])
+    lines += format_metric('kanmind_token_cache_misses_total', 'counter', 'Token cache misses.', tokens['misses'])
+    lines += format_metric('kanmind_token_cache_evictions_total', 'counter', 'Token cache evictions.',
+                           tokens['evictions'])
+    lines += format_metric('kanmind_token_cache_size', 'gauge', 'Tokens in the cache.', tokens['size'])
+    lines += format_metric('kanmind_board_snapshot_hits_total', 'counter', 'Board snapshot cache hits.',
+                           snapshots['hits'])
+    lines += format_metric('kanmind_board_snapshot_misses_total', 'counter', 'Board snapshot cache misses.',
+                           snapshots['misses'])
+    lines += format_metric('kanmind_board_snapshot_rebuild_seconds_total', 'counter',
+                           'Time spent rebuilding board snapshots.', snapshots['rebuild_seconds'])
+    lines += format_metric('kanmind_event_streams', 'gauge', 'Open board event streams.', hub['connections'])
+    lines += format_metric('kanmind_event_boards', 'gauge', 'Boards with open event streams.', hub['boards'])
+    lines += format_metric('kanmind_events_published_total', 'counter', 'Board events published.',
+                           hub['published'])
+    lines += format_metric('kanmind_event_streams_rejected_total', 'counter',
+                           'Event streams rejected because a board was full.', hub['rejected'])
+    return lines
+
+
+class QueryTimer:
+    """
+    connection.execute_wrapper() hook that counts queries and their time.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+class MetricsMiddleware:
+    """
+    Records per-request metrics into request_metrics.
+
+    - Routes are labelled with the resolved URL name, so ids in paths
+      do not create new series; unresolved paths are labelled 'unmatched'.
+    - Queries are counted on every database alias with execute_wrapper.
+    - Render time is measured around DRF's response.render().
+    - With METRICS['SERVER_TIMING'], the timings are also sent as a
+      Server-Timing header.
+    - Sync only: execute_wrapper is per thread, so the middleware must run
+      in the thread that runs the queries. Under ASGI, Django calls it through
+      async_to_sync, also for the async event stream view.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = metrics_config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        request._metrics_render = 0.0
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        match = request.resolver_match
+        route = match.url_name if match and match.url_name else 'unmatched'
+        timings = {'total': total, 'queries': timer.queries, 'db': timer.seconds, 'render': request._metrics_render}
+        size = None if response.streaming else len(response.content)
+        request_metrics.record(route, request.method, response.status_code, timings, size)
+
+        if config['SERVER_TIMING']:
+            response['Server-Timing'] = (
+                f'db;dur={timer.seconds * 1000:.1f};desc="{timer.queries} queries", '
+                f'render;dur={request._metrics_render * 1000:.1f}, total;dur={total * 1000:.1f}'
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before the response is rendered
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_render = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
+
+
+class PrometheusRenderer(BaseRenderer):
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            # Error responses
+            return '\n'.join(f'# {key}: {value}' for key, value in data.items()) + '\n'
+        return data
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Grants access to scrapers sending 'Authorization: Bearer <METRICS['TOKEN']>'.
+    """
+
+    def has_permission(self, request, view):
+        token = metrics_config()['TOKEN']
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        return bool(token) and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
+
+
+class MetricsView(APIView):
+    """
+    Expose request, cache and event metrics in Prometheus text format.
+
+    - Admin users (token authentication) or scrapers with the METRICS['TOKEN'] bearer token.
+    """
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser | HasMetricsToken]
+    renderer_classes = [PrometheusRenderer]
+
+    def get(self, request):
+        lines = request_metrics.expose() + cache_metrics()
+        return Response('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,172 @@
+import logging
+import re
+import traceback
+import warnings
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NPLUSONE = {
+    # Check every request with NPlusOneMiddleware
+    'ENABLED': False,
+    # Report query shapes executed more often than this within one request
+    'THRESHOLD': 5,
+    # 'log', 'warn' (NPlusOneWarning) or 'raise' (NPlusOneError)
+    'ACTION': 'log',
+    # Project frames shown per reported shape
+    'STACK_DEPTH': 8,
+}
+
+ACTIONS = ('log', 'warn', 'raise')
+
+STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+NUMBER_PATTERN = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_PATTERN = re.compile(r'%s|\?')
+# Placeholder lists, e.g. IN (?, ?, ?) or multi-row VALUES, whose length depends on the data
+LIST_PATTERN = re.compile(r'\(\?(?:, \?)*\)(?:, \(\?(?:, \?)*\))*')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# Transaction bookkeeping, repeated by design
+IGNORED_PREFIXES = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT', 'ROLLBACK')
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+class NPlusOneWarning(UserWarning):
+    pass
+
+
+def nplusone_config():
+    return {**DEFAULT_NPLUSONE, **getattr(settings, 'NPLUSONE', {})}
+
+
+def query_shape(sql):
+    """
+    Return the shape of an SQL statement: the statement with its values
+    replaced, so queries that differ only in their parameters are equal.
+
+    - Literals and placeholders become ?, placeholder lists become (...).
+    - Returns None for transaction statements, which are not counted.
+    """
+    shape = WHITESPACE_PATTERN.sub(' ', sql).strip()
+    if shape.upper().startswith(IGNORED_PREFIXES):
+        return None
+    shape = STRING_PATTERN.sub('?', shape)
+    shape = NUMBER_PATTERN.sub('?', shape)
+    shape = PLACEHOLDER_PATTERN.sub('?', shape)
+    return LIST_PATTERN.sub('(...)', shape)
+
+
+def project_stack(depth):
+    """
+    Return the innermost `depth` frames of the current stack that belong
+    to the project, without Django, DRF and this module.
+    """
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir) and 'site-packages' not in frame.filename
+        and Path(frame.filename).resolve() != Path(__file__).resolve()
+    ]
+    return frames[-depth:]
+
+
+class QueryShapeDetector:
+    """
+    connection.execute_wrapper() hook that counts executions per query shape.
+
+    - The stack is captured when a shape first exceeds the threshold,
+      so reports point at the loop that repeats the query.
+    """
+
+    def __init__(self, threshold, stack_depth=DEFAULT_NPLUSONE['STACK_DEPTH']):
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self.counts = Counter()
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = query_shape(sql)
+        if shape is not None:
+            self.counts[shape] += 1
+            if self.counts[shape] == self.threshold + 1:
+                self.stacks[shape] = project_stack(self.stack_depth)
+        return execute(sql, params, many, context)
+
+    def repeated(self):
+        """
+        Return (shape, count, stack) for every shape over the threshold, most repeated first.
+        """
+        return [(shape, count, self.stacks[shape]) for shape, count in self.counts.most_common()
+                if count > self.threshold]
+
+
+def format_report(label, repeated):
+    lines = [f'Possible N+1 queries in {label}:']
+    for shape, count, stack in repeated:
+        lines.append(f'{count} x {shape}')
+        lines += ['  ' + line.rstrip('\n').replace('\n', '\n  ') for line in traceback.format_list(stack)]
+    return '\n'.join(lines)
+
+
+def report(label, repeated, action):
+    if not repeated:
+        return
+    message = format_report(label, repeated)
+    if action == 'raise':
+        raise NPlusOneError(message)
+    if action == 'warn':
+        warnings.warn(message, NPlusOneWarning)
+    else:
+        logger.warning(message)
+
+
+@contextmanager
+def detect_nplusone(label='block', threshold=None, action=None):
+    """
+    Count query shapes on every database alias inside the block and
+    report those repeated more than `threshold` times when it exits.
+
+    - `threshold` and `action` default to the NPLUSONE setting.
+    - Yields the QueryShapeDetector, for tests that inspect the counts.
+    """
+    config = nplusone_config()
+    action = action or config['ACTION']
+    if action not in ACTIONS:
+        raise ValueError(f'Unknown N+1 action {action!r}, expected one of {", ".join(ACTIONS)}.')
+    detector = QueryShapeDetector(config['THRESHOLD'] if threshold is None else threshold, config['STACK_DEPTH'])
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(detector))
+        yield detector
+    report(label, detector.repeated(), action)
+
+
+class NPlusOneMiddleware:
+    """
+    Reports repeated query shapes per request, if NPLUSONE['ENABLED'].
+
+    - Meant for development; leave it disabled in production.
+    - Queries of streamed response bodies run after the middleware
+      returns and are not counted.
+    - Sync only, like MetricsMiddleware: the query wrapper is per thread.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not nplusone_config()['ENABLED']:
+            return self.get_response(request)
+
+        with detect_nplusone(label=f'{request.method} {request.path}'):
+            return self.get_response(request)
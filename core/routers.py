@@ -0,0 +1,99 @@
+import hashlib
+import random
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_KEY = 'kanmind:pin-primary:{client}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Always read from the primary: tokens are used right after they are created
+PRIMARY_MODELS = {'authtoken.token'}
+
+# Routing state of the current request (or thread, outside of requests)
+_state = Local()
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def reset_state(pinned=False):
+    _state.pinned = pinned
+    _state.wrote = False
+    _state.replica = None
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a replica and writes to the primary (the default database).
+
+    - Reads go to one replica per request, chosen at random from
+      DATABASE_REPLICAS; without replicas everything uses the primary.
+    - Reads stay on the primary once the request has written, while a
+      transaction is open on the primary, and while the request is pinned
+      by PrimaryPinningMiddleware.
+    - Only the primary is migrated; replicas are copies of it.
+    """
+
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if (not aliases or getattr(_state, 'pinned', False) or model._meta.label_lower in PRIMARY_MODELS
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        if getattr(_state, 'replica', None) not in aliases:
+            _state.replica = random.choice(aliases)
+        return _state.replica
+
+    def db_for_write(self, model, **hints):
+        # Later reads of this request must see the write
+        _state.pinned = True
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def client_key(request):
+    # The token identifies API clients; anonymous clients fall back to their address
+    client = request.META.get('HTTP_AUTHORIZATION') or request.META.get('REMOTE_ADDR', '')
+    return PIN_KEY.format(client=hashlib.sha1(client.encode()).hexdigest())
+
+
+class PrimaryPinningMiddleware:
+    """
+    Pins clients to the primary database, so they read their own writes.
+
+    - Requests with unsafe methods use the primary only.
+    - After a request that wrote, the same client reads from the primary
+      for PRIMARY_PIN_SECONDS, which covers the replica lag.
+    - The pin is kept in the default cache; set CACHE_DIR so every
+      worker process sees it.
+    - Sync only; __call__ is a plain function, Django adapts it under ASGI.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replicas():
+            return self.get_response(request)
+
+        key = client_key(request)
+        reset_state(pinned=request.method not in SAFE_METHODS or cache.get(key) is not None)
+        try:
+            response = self.get_response(request)
+            wrote = _state.wrote
+        finally:
+            reset_state()
+        if wrote:
+            cache.set(key, True, settings.PRIMARY_PIN_SECONDS)
+        return response
@@ -52,7 +52,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.nplusone.NPlusOneMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.routers.PrimaryPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,6 +101,67 @@ DATABASES = {
     }
 }
 
+# SQLite tuned for several worker processes; set DATABASE_PROFILE=production.
+# - WAL lets readers run while a writer commits; synchronous=NORMAL is safe with it.
+# - busy_timeout waits for the write lock instead of raising "database is locked".
+# - IMMEDIATE transactions take the write lock at BEGIN, so a transaction that
+#   reads before it writes cannot fail on the lock upgrade.
+# - Connections are kept for DATABASE_CONN_MAX_AGE seconds and checked before reuse.
+
+SQLITE_READ_PRAGMAS = [
+    'PRAGMA busy_timeout = 5000',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA cache_size = -65536',
+    'PRAGMA temp_store = MEMORY',
+]
+# Only for the primary: journal_mode writes the database file, synchronous only affects writes
+SQLITE_WRITE_PRAGMAS = [
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+]
+SQLITE_PRODUCTION_PRAGMAS = SQLITE_WRITE_PRAGMAS + SQLITE_READ_PRAGMAS
+
+# Settings merged into DATABASES['default'] per profile
+DATABASE_PROFILES = {
+    # Django's defaults: rollback journal, deferred transactions, a new connection per request
+    'development': {},
+    'production': {
+        'CONN_MAX_AGE': int(os.getenv('DATABASE_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': '; '.join(SQLITE_PRODUCTION_PRAGMAS),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+# Replicas are read-only copies: no write pragmas, and deferred transactions,
+# which never take the write lock.
+DATABASE_REPLICA_PROFILES = {
+    'development': {},
+    'production': {
+        **DATABASE_PROFILES['production'],
+        'OPTIONS': {'init_command': '; '.join(SQLITE_READ_PRAGMAS)},
+    },
+}
+
+DATABASE_PROFILE = 'production' if os.getenv('DATABASE_PROFILE') == 'production' else 'development'
+DATABASES['default'].update(DATABASE_PROFILES[DATABASE_PROFILE])
+
+# Read replicas: comma-separated SQLite files kept in sync with the primary,
+# e.g. by LiteFS or Litestream. Safe requests read from a replica, writes go
+# to the primary; a client that wrote reads the primary for PRIMARY_PIN_SECONDS.
+
+DATABASE_REPLICAS = []
+for number, path in enumerate(filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), start=1):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {**DATABASES['default'], **DATABASE_REPLICA_PROFILES[DATABASE_PROFILE],
+                        'NAME': path.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+PRIMARY_PIN_SECONDS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -135,6 +199,25 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Shared cache for token, membership and board snapshot caches.
+# Set CACHE_DIR to share entries between processes via the file system.
+
+if os.getenv('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -143,9 +226,75 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
+
+
+# Cache the board ids a user is a member of across requests (seconds).
+# None keeps the lookup per request only.
+
+MEMBERSHIP_CACHE_TIMEOUT = None
+
+
+# Cache of token key -> user used by CachedTokenAuthentication.
+# Deleted tokens and deactivated users are rejected by every process
+# sharing the cache (CACHE_DIR) within POLL_INTERVAL seconds; without it,
+# other processes notice only when their entries expire, so keep TTL short.
+
+TOKEN_CACHE = {
+    'MAX_SIZE': 10000,
+    'TTL': 300 if os.getenv('CACHE_DIR') else 30,
+    'USE_DJANGO_CACHE': False,
+    'POLL_INTERVAL': 1,
+}
+
+
+# Cache the rendered board detail per board version (seconds).
+# 0 renders every request.
+
+BOARD_SNAPSHOT_TIMEOUT = 600
+
+
+# Delta sync: seconds of overlap between consecutive tokens and days
+# tombstones are kept (see boards_app.sync and prune_sync_log).
+
+DELTA_SYNC = {
+    'OVERLAP': 5,
+    'RETENTION_DAYS': 30,
+}
+
+
+# Server-sent board events (see boards_app.events). HUB can point to a
+# multi-process implementation; the limits apply per process.
+
+BOARD_EVENTS = {
+    'HUB': 'boards_app.events.InProcessHub',
+    'MAX_CONNECTIONS_PER_BOARD': 100,
+    'QUEUE_SIZE': 100,
+    'HEARTBEAT': 15,
+}
+
+
+# Request metrics at /api/_metrics (see core.metrics). TOKEN lets a
+# Prometheus scraper read them with "Authorization: Bearer <token>".
+
+METRICS = {
+    'ENABLED': True,
+    'SERVER_TIMING': os.getenv('METRICS_SERVER_TIMING', 'False') == 'True',
+    'TOKEN': os.getenv('METRICS_TOKEN') or None,
+}
+
+
+# N+1 query detection per request (see core.nplusone). Set NPLUSONE=True
+# in .env during development; NPLUSONE_ACTION is log, warn or raise.
+
+NPLUSONE = {
+    'ENABLED': os.getenv('NPLUSONE', 'False') == 'True',
+    'THRESHOLD': 5,
+    'ACTION': os.getenv('NPLUSONE_ACTION', 'log'),
+    'STACK_DEPTH': 8,
+}
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from auth_app.authentication import token_cache
+from boards_app.models import Board
+from core.nplusone import detect_nplusone
+from tasks_app.models import Comment, Task
+
+# Seed sizes for the query-budget suites. Budgets must hold for both,
+# so any query that scales with the data set fails the large run.
+SMALL_SEED = {'users': 8, 'boards': 2, 'members_per_board': 4,
+              'tasks_per_board': 4, 'comments_per_task': 2}
+LARGE_SEED = {'users': 60, 'boards': 4, 'members_per_board': 30,
+              'tasks_per_board': 120, 'comments_per_task': 6}
+
+
+class FixtureMixin:
+    """
+    Shared fixtures for API test cases.
+
+    - setUp creates self.user, authenticates the client as the user
+      and creates self.board, owned by the user, with the user as member.
+    - create_task fills in defaults for every field not given.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='user@example.com', email='user@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+
+    def create_task(self, **fields):
+        defaults = {'board': self.board, 'title': 'Task', 'description': '', 'status': 'to-do',
+                    'priority': 'low', 'due_date': date(2026, 1, 1)}
+        defaults.update(fields)
+        return Task.objects.create(**defaults)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTestCase(APITestCase):
+    """
+    Base class for query-budget tests against seeded data.
+
+    - Seeds the database once per class with seed_kanmind.
+    - Authenticates as the assignee of the first seeded task.
+    - Provides assertMaxQueries to enforce an upper bound per request;
+      it also fails on repeated query shapes (N+1), which the small
+      seed may keep under the budget.
+    """
+    seed = SMALL_SEED
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_kanmind', seed=1, stdout=StringIO(), **cls.seed)
+        cls.task = Task.objects.select_related('board').order_by('id').first()
+        cls.board = cls.task.board
+        cls.user = cls.task.assignee
+        cls.token = Token.objects.create(user=cls.user)
+        cls.comment = Comment.objects.create(task=cls.task, author=cls.user, content='Own comment')
+
+    def setUp(self):
+        # Every budget starts from cold caches
+        cache.clear()
+        token_cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    @contextmanager
+    def assertMaxQueries(self, budget):
+        with detect_nplusone(label=self.id(), action='raise'), CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        queries = '\n'.join(query['sql'] for query in context.captured_queries)
+        self.assertLessEqual(executed, budget,
+                             f'{executed} queries executed, budget is {budget}:\n{queries}')
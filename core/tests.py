@@ -0,0 +1,295 @@
+import os
+import tempfile
+import unittest
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from auth_app.authentication import token_cache
+from boards_app.models import Board
+from core.benchmarks import database_alias
+from core.metrics import QUERY_BUCKETS, request_metrics
+from core.nplusone import NPlusOneError, NPlusOneWarning, detect_nplusone, query_shape
+from core.routers import ReplicaRouter, reset_state
+
+
+class SQLiteProfileTests(unittest.TestCase):
+    """
+    Tests that the production SQLite profile takes effect on Django connections.
+
+    - A plain TestCase: Django's test cases refuse connections to aliases
+      registered after the class is set up.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'primary.sqlite3')
+
+    def database(self, profile, **overrides):
+        return {'ENGINE': 'django.db.backends.sqlite3', 'NAME': self.path, **profile, **overrides}
+
+    def pragma(self, connection, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_primary(self):
+        with database_alias('profile_primary', self.database(settings.DATABASE_PROFILES['production'])) as connection:
+            self.assertEqual(self.pragma(connection, 'journal_mode'), 'wal')
+            self.assertEqual(self.pragma(connection, 'synchronous'), 1)
+            self.assertEqual(self.pragma(connection, 'busy_timeout'), 5000)
+            self.assertEqual(self.pragma(connection, 'temp_store'), 2)
+
+            with CaptureQueriesContext(connection) as queries, transaction.atomic(using='profile_primary'):
+                self.pragma(connection, 'user_version')
+            self.assertEqual(queries.captured_queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+    def test_read_only_replica(self):
+        with database_alias('profile_primary', self.database(settings.DATABASE_PROFILES['development'])) as primary:
+            with primary.cursor() as cursor:
+                cursor.execute('CREATE TABLE task (id INTEGER PRIMARY KEY)')
+
+        # The primary's journal_mode and IMMEDIATE transactions would fail on this file
+        replica = self.database(settings.DATABASE_REPLICA_PROFILES['production'], NAME=f'file:{self.path}?mode=ro')
+        with database_alias('profile_replica', replica) as connection:
+            self.assertEqual(self.pragma(connection, 'busy_timeout'), 5000)
+            with transaction.atomic(using='profile_replica'), connection.cursor() as cursor:
+                cursor.execute('SELECT COUNT(*) FROM task')
+                self.assertEqual(cursor.fetchone()[0], 0)
+
+
+class RequestMetricsTests(APITestCase):
+    """
+    Tests for the metrics middleware and the Prometheus endpoint.
+    """
+
+    def setUp(self):
+        request_metrics.reset()
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        board = Board.objects.create(title='Board', owner=self.user)
+        board.members.add(self.user)
+
+    def scrape(self):
+        admin = User.objects.create_user(username='admin@example.com', is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=admin).key)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_requests_are_recorded_per_url_name(self):
+        self.client.get(reverse('boards'))
+        self.client.get(reverse('boards'))
+        self.client.get('/api/unknown/')
+
+        body = self.scrape().content.decode()
+
+        self.assertIn('kanmind_requests_total{route="boards",method="GET",status="200"} 2', body)
+        self.assertIn('kanmind_requests_total{route="unmatched",method="GET",status="404"} 1', body)
+        self.assertIn('kanmind_request_duration_seconds_count{route="boards",method="GET"} 2', body)
+        self.assertIn('kanmind_request_db_queries_bucket{route="boards",method="GET",le="+Inf"} 2', body)
+        self.assertIn('kanmind_response_size_bytes_count{route="boards",method="GET"} 2', body)
+        self.assertIn('kanmind_token_cache_hits_total', body)
+
+    def test_query_count_is_recorded(self):
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('boards'))
+
+        histogram = request_metrics.histograms['queries'].series[(('route', 'boards'), ('method', 'GET'))]
+        # One request, in the first bucket that holds its query count
+        bucket = next(index for index, bound in enumerate(QUERY_BUCKETS) if len(queries) <= bound)
+        self.assertEqual(histogram['counts'][bucket], 1)
+        self.assertEqual(histogram['sum'], len(queries))
+
+    def test_render_time_is_recorded(self):
+        self.client.get(reverse('boards'))
+
+        series = request_metrics.histograms['render'].series[(('route', 'boards'), ('method', 'GET'))]
+        self.assertGreater(series['sum'], 0)
+
+    def test_prometheus_content_type(self):
+        response = self.scrape()
+
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+
+    def test_endpoint_requires_admin_or_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+
+        with override_settings(METRICS={'TOKEN': 'scrape-secret'}):
+            self.client.credentials(HTTP_AUTHORIZATION='Bearer wrong')
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+            self.client.credentials(HTTP_AUTHORIZATION='Bearer scrape-secret')
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+    def test_server_timing_header(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('boards')))
+
+        with override_settings(METRICS={'SERVER_TIMING': True}):
+            response = self.client.get(reverse('boards'))
+
+        self.assertRegex(response['Server-Timing'],
+                         r'^db;dur=[\d.]+;desc="\d+ queries", render;dur=[\d.]+, total;dur=')
+
+    def test_disabled(self):
+        with override_settings(METRICS={'ENABLED': False}):
+            self.client.get(reverse('boards'))
+
+        self.assertEqual(request_metrics.statuses, {})
+
+
+class NPlusOneDetectorTests(APITestCase):
+    """
+    Tests for the N+1 query detector.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.boards = [Board.objects.create(title=f'Board {index}', owner=self.user) for index in range(4)]
+
+    def load_boards_one_by_one(self):
+        return [Board.objects.get(pk=board.pk).title for board in self.boards]
+
+    def test_query_shape(self):
+        self.assertEqual(query_shape('SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = %s'),
+                         query_shape("SELECT *\n FROM t WHERE id IN (%s) AND name = 'x'"))
+        self.assertEqual(query_shape('SELECT * FROM t WHERE id = 17 LIMIT 21'), 'SELECT * FROM t WHERE id = ? LIMIT ?')
+        self.assertEqual(query_shape('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)'),
+                         'INSERT INTO t (a, b) VALUES (...)')
+        self.assertIsNone(query_shape('SAVEPOINT "s1_x1"'))
+
+    def test_raise_reports_shape_count_and_stack(self):
+        with self.assertRaises(NPlusOneError) as raised:
+            with detect_nplusone(label='loop', threshold=3, action='raise'):
+                self.load_boards_one_by_one()
+
+        message = str(raised.exception)
+        self.assertIn('Possible N+1 queries in loop:', message)
+        self.assertIn('4 x SELECT "boards_app_board"."id"', message)
+        self.assertIn('in load_boards_one_by_one', message)
+
+    def test_under_threshold(self):
+        with detect_nplusone(threshold=4, action='raise') as detector:
+            self.load_boards_one_by_one()
+
+        self.assertEqual(detector.repeated(), [])
+
+    def test_warn_and_log(self):
+        with self.assertWarns(NPlusOneWarning):
+            with detect_nplusone(threshold=3, action='warn'):
+                self.load_boards_one_by_one()
+
+        with self.assertLogs('core.nplusone', 'WARNING'):
+            with detect_nplusone(threshold=3, action='log'):
+                self.load_boards_one_by_one()
+
+    def test_unknown_action(self):
+        with self.assertRaises(ValueError):
+            with detect_nplusone(action='ignore'):
+                pass
+
+    def test_middleware(self):
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.client.get(reverse('boards'))
+
+        with override_settings(NPLUSONE={'ENABLED': True, 'THRESHOLD': 0, 'ACTION': 'raise'}):
+            with self.assertRaisesMessage(NPlusOneError, 'GET /api/boards/'):
+                self.client.get(reverse('boards'))
+
+
+class ReplicaRoutingTests(APITransactionTestCase):
+    """
+    Tests for the read replica router, with a second SQLite file as the replica.
+
+    The replica is filled once per test with a copy of the primary; later
+    writes only reach the primary, like a replica that lags behind.
+    """
+    # Resolved when the class is set up, after the replica alias exists
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        directory = cls.enterClassContext(tempfile.TemporaryDirectory())
+        connections.settings['replica'] = {**connections['default'].settings_dict,
+                                           'NAME': directory + '/replica.sqlite3'}
+        cls.addClassCleanup(cls.remove_replica)
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        reset_state()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.token = Token.objects.create(user=self.user)
+        self.board = Board.objects.create(title='Replicated', owner=self.user)
+        self.board.members.add(self.user)
+
+        primary, replica = connections['default'], connections['replica']
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+
+        self.enterContext(override_settings(DATABASE_REPLICAS=['replica']))
+        cache.clear()
+        token_cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('boards_detail', kwargs={'pk': self.board.pk})
+
+    def test_safe_requests_read_the_replica(self):
+        Board.objects.filter(pk=self.board.pk).update(title='Primary only')
+
+        response = self.client.get(reverse('boards'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['title'], 'Replicated')
+
+    def test_writer_reads_own_writes_until_the_pin_expires(self):
+        response = self.client.patch(self.url, {'title': 'Renamed'})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client.get(self.url).data['title'], 'Renamed')
+
+        cache.clear()
+        self.assertEqual(self.client.get(self.url).data['title'], 'Replicated')
+
+    def test_other_clients_are_not_pinned(self):
+        self.client.patch(self.url, {'title': 'Renamed'})
+        # A token created after the copy: tokens are always read from the primary
+        other = Token.objects.create(user=User.objects.create_user(username='other@example.com'))
+        Board.objects.get(pk=self.board.pk).members.add(other.user)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + other.key)
+        response = self.client.get(reverse('boards'))
+
+        self.assertEqual(response.status_code, 200)
+        # The membership only exists on the primary
+        self.assertEqual(response.data, [])
+
+    def test_router_rules(self):
+        router = ReplicaRouter()
+        reset_state()
+        self.assertEqual(router.db_for_read(Board), 'replica')
+        self.assertEqual(router.db_for_read(Token), 'default')
+        with transaction.atomic():
+            self.assertEqual(router.db_for_read(Board), 'default')
+
+        self.assertEqual(router.db_for_write(Board), 'default')
+        self.assertEqual(router.db_for_read(Board), 'default')
+        self.assertTrue(router.allow_migrate('default', 'boards_app'))
+        self.assertFalse(router.allow_migrate('replica', 'boards_app'))
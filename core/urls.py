@@ -17,9 +17,14 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from core.metrics import MetricsView
+from tasks_app.api.views import SummaryView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('auth_app.api.urls')),
     path('api/boards/', include('boards_app.api.urls')),
-    path('api/tasks/', include('tasks_app.api.urls'))
+    path('api/tasks/', include('tasks_app.api.urls')),
+    path('api/summary/', SummaryView.as_view(), name='summary'),
+    path('api/_metrics', MetricsView.as_view(), name='metrics'),
 ]
@@ -0,0 +1,183 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from boards_app import events, sync
+from boards_app.membership import get_member_board_ids
+from tasks_app import counters
+from tasks_app.models import Task
+from .serializers import BulkTaskCreateSerializer, BulkTaskUpdateSerializer, TaskReadSerializer
+
+BOARD_ERROR = 'Board not found or you are not a member.'
+TASK_NOT_FOUND_ERROR = 'Task not found.'
+TASK_PERMISSION_ERROR = "You are not a member of this task's board."
+USER_ERROR = 'User not found.'
+
+
+class BulkTaskOperation:
+    """
+    Applies a batch of task creates, updates and deletes for one user.
+
+    - Items are validated one by one; boards, users and tasks of the whole
+      batch are then checked with one query each.
+    - Valid items are written with bulk_create, bulk_update and a single
+      delete inside one transaction; board counters get one UPDATE per board.
+    - Invalid items are reported per item and do not block the others.
+    """
+    update_fields = ['status', 'priority', 'assignee_id', 'reviewer_id', 'due_date', 'updated_at']
+
+    def __init__(self, request, data):
+        self.request = request
+        self.data = data
+        self.results = {'create': [], 'update': [], 'delete': []}
+
+    def run(self):
+        creates = self.validate_items(self.data['create'], BulkTaskCreateSerializer, 'create')
+        updates = self.validate_items(self.data['update'], BulkTaskUpdateSerializer, 'update')
+        delete_ids = list(dict.fromkeys(self.data['delete']))
+
+        board_ids = get_member_board_ids(self.request)
+        users = self.load_users(creates + updates)
+        tasks = (
+            Task.objects.select_related('assignee', 'reviewer')
+            .in_bulk([item['id'] for index, item in updates] + delete_ids)
+        )
+
+        new_tasks = self.prepare_creates(creates, board_ids, users)
+        changed_tasks = self.prepare_updates(updates, board_ids, users, tasks)
+        deletable_ids = self.prepare_deletes(delete_ids, board_ids, tasks)
+
+        with transaction.atomic(), counters.deferred(), sync.deferred():
+            self.write(new_tasks, changed_tasks, deletable_ids)
+
+        for index, task in new_tasks:
+            self.add_result('create', index=index, status='created', task=TaskReadSerializer(task).data)
+        for index, task in changed_tasks:
+            self.add_result('update', index=index, id=task.pk, status='updated',
+                            task=TaskReadSerializer(task).data)
+        for index, task_id in deletable_ids:
+            self.add_result('delete', index=index, id=task_id, status='deleted')
+
+        for results in self.results.values():
+            results.sort(key=lambda result: result['index'])
+        return self.results
+
+    def add_result(self, operation, **result):
+        self.results[operation].append(result)
+
+    def validate_items(self, items, serializer_class, operation):
+        valid = []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                self.add_result(operation, index=index, status='error', errors=serializer.errors)
+        return valid
+
+    def load_users(self, items):
+        user_ids = set()
+        for index, item in items:
+            user_ids.update(item[field] for field in ('assignee_id', 'reviewer_id') if field in item)
+        return User.objects.only('id', 'email', 'first_name').in_bulk(user_ids)
+
+    def check_users(self, item, users):
+        return {field: [USER_ERROR] for field in ('assignee_id', 'reviewer_id')
+                if field in item and item[field] not in users}
+
+    def prepare_creates(self, creates, board_ids, users):
+        new_tasks = []
+        for index, item in creates:
+            errors = self.check_users(item, users)
+            if item['board'] not in board_ids:
+                errors['board'] = [BOARD_ERROR]
+            if errors:
+                self.add_result('create', index=index, status='error', errors=errors)
+                continue
+            task = Task(
+                board_id=item['board'],
+                title=item['title'],
+                description=item['description'],
+                status=item['status'],
+                priority=item['priority'],
+                assignee=users[item['assignee_id']],
+                reviewer=users[item['reviewer_id']],
+                due_date=item['due_date'],
+            )
+            new_tasks.append((index, task))
+        return new_tasks
+
+    def prepare_updates(self, updates, board_ids, users, tasks):
+        changed_tasks = []
+        for index, item in updates:
+            task = tasks.get(item['id'])
+            error = self.check_task(task, board_ids)
+            errors = {'id': [error]} if error else self.check_users(item, users)
+            if errors:
+                self.add_result('update', index=index, id=item['id'], status='error', errors=errors)
+                continue
+            for field in ('status', 'priority', 'due_date'):
+                if field in item:
+                    setattr(task, field, item[field])
+            if 'assignee_id' in item:
+                task.assignee = users[item['assignee_id']]
+            if 'reviewer_id' in item:
+                task.reviewer = users[item['reviewer_id']]
+            changed_tasks.append((index, task))
+        return changed_tasks
+
+    def prepare_deletes(self, delete_ids, board_ids, tasks):
+        deletable_ids = []
+        for index, task_id in enumerate(delete_ids):
+            error = self.check_task(tasks.get(task_id), board_ids)
+            if error:
+                self.add_result('delete', index=index, id=task_id, status='error', errors={'id': [error]})
+            else:
+                deletable_ids.append((index, task_id))
+        return deletable_ids
+
+    def check_task(self, task, board_ids):
+        if task is None:
+            return TASK_NOT_FOUND_ERROR
+        if task.board_id not in board_ids:
+            return TASK_PERMISSION_ERROR
+        return None
+
+    def write(self, new_tasks, changed_tasks, deletable_ids):
+        # bulk_create and bulk_update skip the counter signals, so the
+        # deltas are recorded here; the delete below still sends them,
+        # and its tombstones are written with one insert by sync.deferred().
+        created = Task.objects.bulk_create([task for index, task in new_tasks])
+        for task in created:
+            counters.apply_board_deltas(task.board_id, counters.task_counter_deltas(task.status, task.priority, 1))
+            events.publish(task.board_id, 'task.created', task=task.pk)
+            task.counted_state = task.get_counted_state()
+
+        changed = [task for index, task in changed_tasks]
+        previous_states = {}
+        if changed:
+            # Diff against the stored rows, not the copies loaded before the transaction
+            stored = (
+                Task.objects.select_for_update().filter(pk__in=[task.pk for task in changed])
+                .values_list('pk', 'board_id', 'status', 'priority')
+            )
+            previous_states = {pk: state for pk, *state in stored}
+            # bulk_update does not apply auto_now
+            now = timezone.now()
+            for task in changed:
+                task.updated_at = now
+            Task.objects.bulk_update(changed, self.update_fields)
+        for task in changed:
+            if task.pk not in previous_states:
+                # Deleted concurrently; bulk_update left nothing to count
+                continue
+            # The board is not written, so the stored one stays
+            task.board_id, previous_status, previous_priority = previous_states[task.pk]
+            deltas = counters.task_counter_deltas(task.status, task.priority, 1)
+            deltas.update(counters.task_counter_deltas(previous_status, previous_priority, -1))
+            counters.apply_board_deltas(task.board_id, deltas)
+            events.publish(task.board_id, 'task.updated', task=task.pk)
+            task.counted_state = task.get_counted_state()
+
+        if deletable_ids:
+            Task.objects.filter(pk__in=[task_id for index, task_id in deletable_ids]).delete()
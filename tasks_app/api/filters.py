@@ -0,0 +1,53 @@
+from rest_framework.filters import BaseFilterBackend
+
+from .serializers import TaskListFilterSerializer
+
+# Query parameter -> queryset lookup
+FILTER_LOOKUPS = {
+    'board': 'board_id',
+    'status': 'status',
+    'priority': 'priority',
+    'due_date_after': 'due_date__gte',
+    'due_date_before': 'due_date__lte',
+}
+
+
+class TaskListFilter(BaseFilterBackend):
+    """
+    Filter and order the task lists by validated query parameters.
+
+    - ?board=, ?status=, ?priority=, ?due_date_after=, ?due_date_before=
+      (dates inclusive) and ?ordering=due_date or -due_date.
+    - Invalid values are answered with 400 instead of being ignored.
+    - The lists are scoped to one assignee or reviewer, so they read the
+      (user, due_date) index: the date range and the ordering are seeks
+      on it, the other filters are checked on the rows it returns.
+      Orderings the index cannot serve are rejected.
+    """
+
+    def get_params(self, request):
+        # Validated once per request; filter_queryset and the pagination both read them
+        params = getattr(request, '_task_list_params', None)
+        if params is None:
+            serializer = TaskListFilterSerializer(data=request.query_params)
+            serializer.is_valid(raise_exception=True)
+            params = request._task_list_params = serializer.validated_data
+        return params
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the requested ordering field, or None for the default order.
+        Also read by KeysetPagination, which pages in the same direction.
+        """
+        return self.get_params(request).get('ordering')
+
+    def filter_queryset(self, request, queryset, view):
+        params = self.get_params(request)
+        lookups = {lookup: params[param] for param, lookup in FILTER_LOOKUPS.items() if param in params}
+        queryset = queryset.filter(**lookups)
+
+        ordering = params.get('ordering')
+        if ordering:
+            descending = ordering.startswith('-')
+            queryset = queryset.order_by(ordering, '-id' if descending else 'id')
+        return queryset
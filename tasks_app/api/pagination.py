@@ -0,0 +1,142 @@
+import base64
+import json
+from datetime import date
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination over a stable (field, id) ordering.
+
+    - Only active when the client sends a cursor or a page size;
+      otherwise the view returns its usual unpaginated list.
+    - The cursor encodes the (field, id) pair of the last row of a page,
+      so each page is a range seek on an index instead of an OFFSET scan.
+    - Pages are forward-only and returned as {'next': url, 'results': [...]}.
+    - Pages run in descending order when a filter backend of the view
+      orders by -field (see get_ordering()).
+    """
+    ordering_field = None
+    # Parses the cursor value of ordering_field; raises or returns None if invalid
+    parse_value = None
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        descending = self.get_ordering(request, queryset, view) == f'-{self.ordering_field}'
+        if descending:
+            queryset = queryset.order_by(f'-{self.ordering_field}', '-id')
+        else:
+            queryset = queryset.order_by(self.ordering_field, 'id')
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            # The leading >= (<=) lets the database seek the index to the cursor.
+            seek, beyond = ('lte', 'lt') if descending else ('gte', 'gt')
+            queryset = queryset.filter(
+                Q(**{f'{self.ordering_field}__{seek}': value}),
+                Q(**{f'{self.ordering_field}__{beyond}': value}) | Q(**{f'id__{beyond}': pk}),
+            )
+
+        rows = list(queryset[:page_size + 1])
+        self.next_position = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            # Rows are model instances or values() dicts
+            if isinstance(last, dict):
+                self.next_position = (last[self.ordering_field], last['id'])
+            else:
+                self.next_position = (getattr(last, self.ordering_field), last.pk)
+        return rows
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering requested through the view's filter backends,
+        like DRF's CursorPagination does with OrderingFilter.
+        """
+        for backend in getattr(view, 'filter_backends', ()):
+            if hasattr(backend, 'get_ordering'):
+                return backend().get_ordering(request, queryset, view)
+        return None
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param],
+                                 strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_previous_link(self):
+        return None
+
+    def encode_cursor(self, position):
+        value, pk = position
+        raw = json.dumps([value.isoformat(), pk])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            # Well-formed cursors can still carry values the field lookup rejects
+            value, pk = self.parse_value(value), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        # Ids outside the signed 64-bit range would overflow the database parameter
+        if value is None or not 0 < pk < 2 ** 63:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+
+class TaskKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination for task lists, ordered by (due_date, id).
+    """
+    ordering_field = 'due_date'
+    parse_value = staticmethod(date.fromisoformat)
+
+
+class CommentKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination for comment lists, ordered by (created_at, id).
+    """
+    ordering_field = 'created_at'
+    parse_value = staticmethod(parse_datetime)
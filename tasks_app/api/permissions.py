@@ -1,8 +1,8 @@
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import BasePermission
 
+from boards_app.membership import get_task_board_id, is_board_member
 from boards_app.models import Board
-from tasks_app.models import Task
 
 
 class IsBoardMember(BasePermission):
@@ -18,10 +18,15 @@ class IsBoardMember(BasePermission):
                 # Validation is handled by the TaskSerializer
                 return True
             try:
-                board = Board.objects.get(pk=board_id)
-                return board.members.filter(pk=request.user.pk).exists()
-            except Board.DoesNotExist:
+                board_id = int(board_id)
+            except (TypeError, ValueError):
+                # Invalid board ids are reported by the TaskSerializer
+                return True
+            if is_board_member(request, board_id):
+                return True
+            if not Board.objects.filter(pk=board_id).exists():
                 raise NotFound(detail="Board not found.")
+            return False
         return True
 
 
@@ -33,16 +38,15 @@ class IsTaskOwnerBoardMember(BasePermission):
     def has_permission(self, request, view):
         task_pk = view.kwargs.get('task_id')
         if task_pk:
-            try:
-                task = Task.objects.get(pk=task_pk)
-                return task.board.members.filter(pk=request.user.pk).exists()
-            except Task.DoesNotExist:
+            board_id = get_task_board_id(request, task_pk)
+            if board_id is None:
                 raise NotFound(detail="Task not found.")
+            return is_board_member(request, board_id)
         return True
 
     def has_object_permission(self, request, view, obj):
         # Object-level check: user must be a member of the task's board
-        return obj.board.members.filter(pk=request.user.pk).exists()
+        return is_board_member(request, obj.board_id)
 
 
 class IsAuthor(BasePermission):
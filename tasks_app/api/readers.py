@@ -0,0 +1,60 @@
+# Columns of one task row, with the nested users joined in
+TASK_COLUMNS = (
+    'id', 'board_id', 'title', 'description', 'status', 'priority',
+    'assignee_id', 'assignee__email', 'assignee__first_name',
+    'reviewer_id', 'reviewer__email', 'reviewer__first_name',
+    'due_date', 'comment_count',
+)
+MEMBER_COLUMNS = ('id', 'email', 'first_name')
+
+
+def task_values(queryset):
+    """
+    Narrow a task queryset to the columns the read shapes need, as dict rows.
+    """
+    return queryset.values(*TASK_COLUMNS)
+
+
+def member_values(queryset):
+    return queryset.values(*MEMBER_COLUMNS)
+
+
+def _user(user_id, email, first_name):
+    if user_id is None:
+        return None
+    return {'id': user_id, 'email': email, 'fullname': first_name}
+
+
+def render_members(rows):
+    """
+    Render user rows like BoardMemberSerializer(many=True).
+    """
+    return [{'id': row['id'], 'email': row['email'], 'fullname': row['first_name']} for row in rows]
+
+
+def render_tasks(rows, include_board=True):
+    """
+    Render task rows like TaskReadSerializer(many=True), or like
+    TaskInBoardSerializer(many=True) when include_board is False.
+
+    - Builds the output dicts directly instead of running serializer
+      fields per row; the JSON must stay byte-identical to the
+      serializers (see tasks_app.tests.FastReadPathTests).
+    - rows come from task_values().
+    """
+    tasks = []
+    append = tasks.append
+    for row in rows:
+        task = {'id': row['id']}
+        if include_board:
+            task['board'] = row['board_id']
+        task['title'] = row['title']
+        task['description'] = row['description']
+        task['status'] = row['status']
+        task['priority'] = row['priority']
+        task['assignee'] = _user(row['assignee_id'], row['assignee__email'], row['assignee__first_name'])
+        task['reviewer'] = _user(row['reviewer_id'], row['reviewer__email'], row['reviewer__first_name'])
+        task['due_date'] = row['due_date'].isoformat()
+        task['comments_count'] = row['comment_count']
+        append(task)
+    return tasks
@@ -2,7 +2,7 @@ from django.contrib.auth.models import User
 from rest_framework import serializers
 
 from boards_app.api.serializers import BoardMemberSerializer
-from tasks_app.models import Task, Comment
+from tasks_app.models import PRIORITY_CHOICES, STATUS_CHOICES, Task, Comment
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -19,7 +19,7 @@ class TaskSerializer(serializers.ModelSerializer):
     reviewer_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), write_only=True, source='reviewer')
     reviewer = BoardMemberSerializer(read_only=True)
 
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(source='comment_count', read_only=True)
 
     class Meta:
         model = Task
@@ -45,9 +45,6 @@ class TaskSerializer(serializers.ModelSerializer):
             self.fields.pop('board', None)
             self.fields.pop('comments_count', None)
 
-    def get_comments_count(self, obj):
-        return Comment.objects.filter(task=obj).count()
-
 
 class TaskReadSerializer(serializers.ModelSerializer):
     """
@@ -55,7 +52,7 @@ class TaskReadSerializer(serializers.ModelSerializer):
     """
     assignee = BoardMemberSerializer(read_only=True)
     reviewer = BoardMemberSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(source='comment_count', read_only=True)
 
     class Meta:
         model = Task
@@ -70,9 +67,6 @@ class TaskReadSerializer(serializers.ModelSerializer):
                   'due_date',
                   'comments_count']
 
-    def get_comments_count(self, obj):
-        return Comment.objects.filter(task=obj).count()
-
 
 class CommentSerializer(serializers.ModelSerializer):
     """
@@ -88,3 +82,81 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ['id', 'created_at', 'author', 'content']
       
+
+
+class BulkTaskCreateSerializer(serializers.ModelSerializer):
+    """
+    Validates one create item of a bulk request.
+
+    Foreign keys are plain integers here; the bulk operation checks
+    them for the whole batch with set-based queries.
+    """
+    board = serializers.IntegerField()
+    assignee_id = serializers.IntegerField()
+    reviewer_id = serializers.IntegerField()
+
+    class Meta:
+        model = Task
+        fields = ['board', 'title', 'description', 'status', 'priority',
+                  'assignee_id', 'reviewer_id', 'due_date']
+
+
+class BulkTaskUpdateSerializer(serializers.ModelSerializer):
+    """
+    Validates one update item of a bulk request.
+    Only the fields sent are changed.
+    """
+    id = serializers.IntegerField()
+    assignee_id = serializers.IntegerField(required=False)
+    reviewer_id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Task
+        fields = ['id', 'status', 'priority', 'assignee_id', 'reviewer_id', 'due_date']
+        extra_kwargs = {
+            'status': {'required': False},
+            'priority': {'required': False},
+            'due_date': {'required': False},
+        }
+
+
+class BulkTaskSerializer(serializers.Serializer):
+    """
+    Validates the envelope of a bulk request.
+    Items are validated one by one, so a bad item does not reject the batch.
+    """
+    create = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    update = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    MAX_ITEMS = 500
+
+    def validate(self, data):
+        total = len(data['create']) + len(data['update']) + len(data['delete'])
+        if total > self.MAX_ITEMS:
+            raise serializers.ValidationError(
+                {'Error': f'A bulk request may contain at most {self.MAX_ITEMS} items.'})
+        return data
+
+
+class TaskListFilterSerializer(serializers.Serializer):
+    """
+    Validates the filter and ordering query parameters of the task lists.
+
+    Orderings are whitelisted to those served by the (user, due_date) indexes.
+    """
+    ORDERINGS = ['due_date', '-due_date']
+
+    board = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=PRIORITY_CHOICES, required=False)
+    due_date_after = serializers.DateField(required=False)
+    due_date_before = serializers.DateField(required=False)
+    ordering = serializers.ChoiceField(choices=ORDERINGS, required=False)
+
+    def validate(self, data):
+        if ('due_date_after' in data and 'due_date_before' in data
+                and data['due_date_after'] > data['due_date_before']):
+            raise serializers.ValidationError(
+                {'due_date_before': ['Must not be earlier than due_date_after.']})
+        return data
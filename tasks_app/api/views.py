@@ -1,9 +1,30 @@
 from django.db.models import Q
-from rest_framework import generics, mixins
+from django.utils import timezone
+from rest_framework import generics, mixins, status
+from rest_framework.response import Response
 
+from boards_app.membership import get_member_board_ids
+from boards_app.models import Board
+from boards_app.versioning import boards_etag, not_modified
 from tasks_app.models import Task, Comment
+from tasks_app.search import SEARCH_LIMIT, search_task_ids
+from tasks_app.summary import task_summary
+from .bulk import BulkTaskOperation
+from .filters import TaskListFilter
+from .pagination import CommentKeysetPagination, TaskKeysetPagination
 from .permissions import IsBoardMember, IsAuthor, IsTaskOwnerBoardMember
-from .serializers import TaskSerializer, TaskReadSerializer, CommentSerializer
+from .readers import render_tasks, task_values
+from .serializers import TaskSerializer, TaskReadSerializer, CommentSerializer, BulkTaskSerializer
+
+
+def task_list_queryset():
+    """
+    Base queryset for task lists rendered with TaskReadSerializer.
+
+    Joins assignee and reviewer, so a list costs one query regardless
+    of its length.
+    """
+    return Task.objects.select_related('assignee', 'reviewer')
 
 
 class TasksCreateView(generics.CreateAPIView):
@@ -17,28 +38,151 @@ class TasksCreateView(generics.CreateAPIView):
     permission_classes = [IsBoardMember]
 
 
-class AssignedTasksListView(generics.ListAPIView):
+class BulkTasksView(generics.GenericAPIView):
+    """
+    Create, update and delete many tasks in one request.
+
+    - Body: {"create": [...], "update": [...], "delete": [ids]}.
+    - Only tasks on boards the user is a member of can be touched.
+    - Returns a result per item; invalid items do not block the others.
+    """
+    serializer_class = BulkTaskSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = BulkTaskOperation(request, serializer.validated_data).run()
+        return Response(results)
+
+
+class TaskListETagMixin:
+    """
+    Answer conditional GETs of a task list from board versions.
+
+    - The ETag covers the versions of all boards holding the listed tasks,
+      the requesting user and the full path (cursor and page size included).
+    - A matching If-None-Match is answered with 304 before any task is loaded.
+    """
+
+    def list(self, request, *args, **kwargs):
+        boards = Board.objects.filter(pk__in=self.get_queryset().values('board_id'))
+        etag = boards_etag(boards, request.user.pk, request.get_full_path())
+
+        response = not_modified(request, etag) or super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+
+class TaskReadListMixin:
+    """
+    Render a task list through the compiled read path instead of
+    TaskReadSerializer; the output is identical, see tasks_app.api.readers.
+    """
+
+    def list(self, request, *args, **kwargs):
+        rows = task_values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(render_tasks(page))
+        return Response(render_tasks(rows))
+
+
+class AssignedTasksListView(TaskListETagMixin, TaskReadListMixin, generics.ListAPIView):
     """
     List all tasks assigned to the requesting user.
+
+    - Filtered by board, status, priority and due date range, and ordered
+      by due date in either direction, via query parameters (TaskListFilter).
+    - Paginated by (due_date, id) when a cursor or page_size is sent.
+    - Supports conditional GET via ETag / If-None-Match.
     """
     serializer_class = TaskReadSerializer
+    pagination_class = TaskKeysetPagination
+    filter_backends = [TaskListFilter]
 
     def get_queryset(self):
         user = self.request.user
 
-        return Task.objects.filter(assignee=user)
+        return task_list_queryset().filter(assignee=user)
 
 
-class ReviewingTasksListView(generics.ListAPIView):
+class ReviewingTasksListView(TaskListETagMixin, TaskReadListMixin, generics.ListAPIView):
     """
     List all tasks where the requesting user is assigned as reviewer.
+
+    - Filtered by board, status, priority and due date range, and ordered
+      by due date in either direction, via query parameters (TaskListFilter).
+    - Paginated by (due_date, id) when a cursor or page_size is sent.
+    - Supports conditional GET via ETag / If-None-Match.
     """
     serializer_class = TaskReadSerializer
+    pagination_class = TaskKeysetPagination
+    filter_backends = [TaskListFilter]
 
     def get_queryset(self):
         user = self.request.user
 
-        return Task.objects.filter(reviewer=user)
+        return task_list_queryset().filter(reviewer=user)
+
+
+class TaskSearchView(generics.GenericAPIView):
+    """
+    Full-text search over task titles, descriptions and comments.
+
+    - Query parameter 'q' is required; 'limit' caps the result list.
+    - Every term must match; the last one also matches as a prefix.
+    - Only tasks on boards the user is a member of are searched.
+    - Ranked by relevance, title matches first; served by the FTS5
+      index in tasks_app.search instead of LIKE scans.
+    """
+    serializer_class = TaskReadSerializer
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"Error": "Query missing"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = int(request.query_params.get('limit', SEARCH_LIMIT))
+        except ValueError:
+            return Response({"Error": "Invalid limit"}, status=status.HTTP_400_BAD_REQUEST)
+
+        task_ids = search_task_ids(query, get_member_board_ids(request), limit)
+        rows = {row['id']: row for row in task_values(Task.objects.filter(pk__in=task_ids))}
+        # Keep the ranking of the search index
+        return Response(render_tasks(rows[task_id] for task_id in task_ids if task_id in rows))
+
+
+class SummaryView(generics.GenericAPIView):
+    """
+    Dashboard summary of the requesting user.
+
+    - Task counts by status, urgent tasks and the next upcoming deadline
+      of the tasks assigned to the user, plus the number of boards the
+      user owns or is a member of, like the board list.
+    - One aggregate query for the tasks; the boards come from the
+      membership resolver.
+    - Supports conditional GET via an ETag over the versions of the
+      boards involved and the current date.
+    """
+
+    def get(self, request):
+        user = request.user
+        board_ids = get_member_board_ids(request)
+        today = timezone.localdate()
+
+        # board_ids covers owned boards too, like the board list
+        assigned_boards = Task.objects.filter(assignee=user).values('board_id')
+        boards = Board.objects.filter(Q(pk__in=board_ids) | Q(pk__in=assigned_boards))
+        etag = boards_etag(boards, user.pk, today.isoformat())
+        response = not_modified(request, etag)
+        if response is None:
+            summary = task_summary(user.pk, today)
+            summary['board_count'] = len(board_ids)
+            response = Response(summary)
+        response['ETag'] = etag
+        return response
 
 
 class TaskUpdateDeleteView(generics.UpdateAPIView, mixins.DestroyModelMixin):
@@ -62,13 +206,15 @@ class CommentsListCreateView(generics.ListCreateAPIView):
 
     - Only board members of the task can create or view comments.
     - New comments are automatically assigned to the requesting user and task.
+    - Paginated by (created_at, id) when a cursor or page_size is sent.
     """
     serializer_class = CommentSerializer
+    pagination_class = CommentKeysetPagination
     permission_classes = [IsTaskOwnerBoardMember]
 
     def get_queryset(self):
         task_id = self.kwargs.get('task_id')
-        return Comment.objects.filter(task_id=task_id).order_by('created_at')
+        return Comment.objects.filter(task_id=task_id).select_related('author').order_by('created_at')
 
     def perform_create(self, serializer):
         # Assign author and task when creating a comment
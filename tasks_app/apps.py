@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TasksAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks_app'
+
+    def ready(self):
+        # Register the signal handlers maintaining the denormalized counters
+        from tasks_app import signals  # noqa: F401
@@ -0,0 +1,164 @@
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from boards_app.models import Board
+from tasks_app.models import Comment, Task
+
+# Board counter column for each task status
+STATUS_COUNTER_FIELDS = {
+    'to-do': 'tasks_to_do_count',
+    'in-progress': 'tasks_in_progress_count',
+    'review': 'tasks_review_count',
+    'done': 'tasks_done_count',
+}
+HIGH_PRIORITY_COUNTER_FIELD = 'tasks_high_prio_count'
+
+_local = threading.local()
+
+
+def task_counter_deltas(status, priority, sign):
+    """
+    Return the board counter changes for adding (sign=1) or
+    removing (sign=-1) one task with the given status and priority.
+    """
+    deltas = Counter()
+    if status in STATUS_COUNTER_FIELDS:
+        deltas[STATUS_COUNTER_FIELDS[status]] += sign
+    if priority == 'high':
+        deltas[HIGH_PRIORITY_COUNTER_FIELD] += sign
+    return deltas
+
+
+def apply_board_deltas(board_id, deltas):
+    """
+    Apply counter changes to one board with a single F() update,
+    or collect them while inside deferred().
+
+    Every call records a change to the board's tasks, so the board
+    version is bumped in the same UPDATE, even for empty deltas.
+    """
+    deltas = Counter(deltas)
+    deltas['version'] += 1
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending[board_id].update(deltas)
+        return
+    _update_board(board_id, deltas)
+
+
+def _update_board(board_id, deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    Board.objects.filter(pk=board_id).update(**changes)
+
+
+@contextmanager
+def deferred():
+    """
+    Collect board counter changes and apply them on exit, one UPDATE per board.
+
+    Meant for bulk operations inside a transaction; on error nothing is applied.
+    """
+    if getattr(_local, 'pending', None) is not None:
+        # Nested: the outermost block applies everything
+        yield
+        return
+
+    _local.pending = defaultdict(Counter)
+    try:
+        yield
+        pending = _local.pending
+    finally:
+        _local.pending = None
+    for board_id, deltas in pending.items():
+        _update_board(board_id, deltas)
+
+
+def apply_comment_delta(task_id, delta):
+    """
+    Apply a comment count change to one task with a single F() update.
+
+    Also touches the task's updated_at, so delta sync finds changed
+    comments through their task.
+    """
+    Task.objects.filter(pk=task_id).update(comment_count=F('comment_count') + delta, updated_at=timezone.now())
+
+
+def apply_comment_deltas(deltas):
+    """
+    Apply comment count changes to many tasks with a single UPDATE.
+
+    - deltas maps task ids to the change of their comment count.
+    - Used by bulk inserts, which skip the comment signals.
+    """
+    if not deltas:
+        return
+    delta = Case(*[When(pk=task_id, then=Value(value)) for task_id, value in deltas.items()],
+                 default=Value(0), output_field=IntegerField())
+    Task.objects.filter(pk__in=list(deltas)).update(comment_count=F('comment_count') + delta,
+                                                     updated_at=timezone.now())
+
+
+def _count_subquery(queryset, group_field):
+    counts = queryset.order_by().values(group_field).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def expected_board_counters():
+    """
+    Subquery expressions recomputing every board counter from the tasks table.
+    """
+    tasks = Task.objects.filter(board_id=OuterRef('pk'))
+    expected = {
+        field: _count_subquery(tasks.filter(status=status), 'board_id')
+        for status, field in STATUS_COUNTER_FIELDS.items()
+    }
+    expected[HIGH_PRIORITY_COUNTER_FIELD] = _count_subquery(tasks.filter(priority='high'), 'board_id')
+    return expected
+
+
+def expected_comment_count():
+    return _count_subquery(Comment.objects.filter(task_id=OuterRef('pk')), 'task_id')
+
+
+def reconcile_counters(board_ids=None, dry_run=False):
+    """
+    Repair drifted counters in bulk.
+
+    - Finds boards and tasks whose stored counters differ from the live counts.
+    - Rewrites only those rows, with one UPDATE per table.
+    - Returns the number of drifted boards and tasks.
+    """
+    boards = Board.objects.all()
+    tasks = Task.objects.all()
+    if board_ids is not None:
+        boards = boards.filter(pk__in=board_ids)
+        tasks = tasks.filter(board_id__in=board_ids)
+
+    expected = expected_board_counters()
+    drift = Q()
+    for field in expected:
+        drift |= ~Q(**{field: F(f'expected_{field}')})
+    drifted_boards = list(
+        boards.annotate(**{f'expected_{field}': value for field, value in expected.items()})
+        .filter(drift)
+        .values_list('pk', flat=True)
+    )
+
+    drifted_tasks = list(
+        tasks.annotate(expected_comment_count=expected_comment_count())
+        .exclude(comment_count=F('expected_comment_count'))
+        .values_list('pk', flat=True)
+    )
+
+    if not dry_run:
+        if drifted_boards:
+            Board.objects.filter(pk__in=drifted_boards).update(**expected_board_counters())
+        if drifted_tasks:
+            Task.objects.filter(pk__in=drifted_tasks).update(comment_count=expected_comment_count())
+
+    return len(drifted_boards), len(drifted_tasks)
@@ -0,0 +1,137 @@
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, transaction
+
+from core.benchmarks import database_alias
+
+SCHEMA = [
+    'CREATE TABLE board (id INTEGER PRIMARY KEY, version INTEGER NOT NULL)',
+    'CREATE TABLE task (id INTEGER PRIMARY KEY, board_id INTEGER NOT NULL, status TEXT NOT NULL, '
+    'title TEXT NOT NULL, updated_at REAL NOT NULL)',
+    'CREATE INDEX task_board_status ON task (board_id, status)',
+]
+STATUSES = ['to-do', 'in-progress', 'review', 'done']
+BOARDS = 50
+ALIAS = 'benchmark'
+
+
+def database(path, profile):
+    """
+    The primary database of a profile in core/settings.py, on a throwaway file.
+    """
+    return {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path, **settings.DATABASE_PROFILES[profile]}
+
+
+def read(connection, rng):
+    board_id = rng.randint(1, BOARDS)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM task WHERE board_id = %s AND status = %s',
+                       [board_id, rng.choice(STATUSES)])
+        cursor.fetchone()
+        cursor.execute('SELECT id, title, status FROM task WHERE board_id = %s ORDER BY id DESC LIMIT 50',
+                       [board_id])
+        cursor.fetchall()
+
+
+def write(connection, rng):
+    # Read, then write in one transaction, like a view saving a task
+    board_id = rng.randint(1, BOARDS)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute('SELECT version FROM board WHERE id = %s', [board_id])
+        cursor.fetchone()
+        cursor.execute('INSERT INTO task (board_id, status, title, updated_at) VALUES (%s, %s, %s, %s)',
+                       [board_id, rng.choice(STATUSES), 'Benchmark task', time.time()])
+        cursor.execute('UPDATE board SET version = version + 1 WHERE id = %s', [board_id])
+
+
+def worker(path, profile, writes, seconds, seed, results):
+    """
+    Serve requests for `seconds` through a Django connection of the profile.
+    After every request the connection is closed unless CONN_MAX_AGE keeps
+    it, as Django does at the end of a request. Reports (requests, errors).
+    """
+    rng = random.Random(seed)
+    done = errors = 0
+    deadline = time.perf_counter() + seconds
+    with database_alias(ALIAS, database(path, profile)) as connection:
+        while time.perf_counter() < deadline:
+            try:
+                if writes:
+                    write(connection, rng)
+                else:
+                    read(connection, rng)
+                done += 1
+            except OperationalError:
+                errors += 1
+            finally:
+                connection.close_if_unusable_or_obsolete()
+    results.put((writes, done, errors))
+
+
+class Command(BaseCommand):
+    """
+    Compare the development and production SQLite profiles under concurrent load.
+
+    - Runs reader and writer processes against a throwaway database file
+      per profile; writers read and then write inside one transaction.
+    - Reports requests per second and "database is locked" failures.
+    """
+    help = 'Benchmark concurrent reads and writes with the development and production SQLite profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--rows', type=int, default=20000, help='Tasks in the database before the run.')
+
+    def handle(self, *args, **options):
+        for profile in settings.DATABASE_PROFILES:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'benchmark.sqlite3')
+                self.prepare(path, profile, options['rows'])
+                reads, writes = self.run(path, profile, options)
+
+            seconds = options['seconds']
+            self.stdout.write(
+                f'{profile}: {reads[0] / seconds:.0f} reads/s ({reads[1]} failed), '
+                f'{writes[0] / seconds:.0f} writes/s ({writes[1]} failed)'
+            )
+
+    def prepare(self, path, profile, rows):
+        rng = random.Random(0)
+        with database_alias(ALIAS, database(path, profile)) as connection:
+            with transaction.atomic(using=ALIAS), connection.cursor() as cursor:
+                for statement in SCHEMA:
+                    cursor.execute(statement)
+                cursor.executemany('INSERT INTO board (id, version) VALUES (%s, 1)',
+                                   [(pk,) for pk in range(1, BOARDS + 1)])
+                cursor.executemany(
+                    'INSERT INTO task (board_id, status, title, updated_at) VALUES (%s, %s, %s, %s)',
+                    [(rng.randint(1, BOARDS), rng.choice(STATUSES), 'Seed task', 0.0) for _ in range(rows)],
+                )
+
+    def run(self, path, profile, options):
+        # Workers inherit the configured Django settings, so they are forked
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        roles = [False] * options['readers'] + [True] * options['writers']
+        processes = [
+            context.Process(target=worker, args=(path, profile, writes, options['seconds'], seed, results))
+            for seed, writes in enumerate(roles)
+        ]
+        for process in processes:
+            process.start()
+        totals = {False: [0, 0], True: [0, 0]}
+        for _ in processes:
+            writes, done, errors = results.get()
+            totals[writes][0] += done
+            totals[writes][1] += errors
+        for process in processes:
+            process.join()
+        return totals[False], totals[True]
@@ -0,0 +1,50 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from boards_app.models import Board
+from core.benchmarks import best_of
+from tasks_app.api.readers import render_tasks, task_values
+from tasks_app.api.views import task_list_queryset
+from tasks_app.summary import task_summary
+
+
+class Command(BaseCommand):
+    """
+    Compare the summary aggregate with building it from the full assigned-task list.
+
+    - Seeds a throwaway board per size, with every task assigned to its
+      owner, inside a transaction that is rolled back.
+    - Times the summary query against loading and rendering the list the
+      frontend used to download, best of --repeat runs.
+    """
+    help = 'Benchmark the dashboard summary against downloading the assigned-task list.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, nargs='+', default=[100, 1000, 10000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        for count in options['tasks']:
+            with transaction.atomic():
+                call_command('seed_kanmind', users=5, boards=1, members_per_board=5, tasks_per_board=count,
+                             comments_per_task=0, seed=1, stdout=StringIO())
+                board = Board.objects.latest('pk')
+                board.tasks.update(assignee=board.owner)
+                tasks = task_list_queryset().filter(assignee=board.owner)
+
+                summary = best_of(options['repeat'], lambda: renderer.render(task_summary(board.owner_id)))
+                listing = best_of(options['repeat'], lambda: renderer.render(
+                    render_tasks(task_values(tasks.all()))))
+                summary_size = len(renderer.render(task_summary(board.owner_id)))
+                listing_size = len(renderer.render(render_tasks(task_values(tasks.all()))))
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f'{count} tasks: summary {summary * 1000:.2f} ms / {summary_size} B, '
+                f'assigned list {listing * 1000:.1f} ms / {listing_size} B'
+            )
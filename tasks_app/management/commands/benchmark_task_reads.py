@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from boards_app.models import Board
+from core.benchmarks import best_of
+from tasks_app.api.readers import render_tasks, task_values
+from tasks_app.api.serializers import TaskReadSerializer
+from tasks_app.api.views import task_list_queryset
+
+
+class Command(BaseCommand):
+    """
+    Compare TaskReadSerializer with the compiled read path for task lists.
+
+    - Seeds a throwaway board per size inside a transaction that is rolled back.
+    - Times query plus JSON rendering for both paths, best of --repeat runs.
+    """
+    help = 'Benchmark serializer vs. compiled rendering of task lists.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        for rows in options['rows']:
+            with transaction.atomic():
+                call_command('seed_kanmind', users=20, boards=1, members_per_board=20, tasks_per_board=rows,
+                             comments_per_task=0, seed=1, stdout=StringIO())
+                tasks = task_list_queryset().filter(board=Board.objects.latest('pk'))
+
+                serializer = best_of(options['repeat'], lambda: renderer.render(
+                    TaskReadSerializer(tasks.all(), many=True).data))
+                compiled = best_of(options['repeat'], lambda: renderer.render(
+                    render_tasks(task_values(tasks.all()))))
+                transaction.set_rollback(True)
+
+            self.stdout.write(
+                f'{rows} rows: serializer {serializer * 1000:.1f} ms, compiled {compiled * 1000:.1f} ms, '
+                f'speedup {serializer / compiled:.1f}x'
+            )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from tasks_app.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search table from the task and comment tables.
+
+    Triggers keep the table in sync; run this after restoring a backup
+    or writing rows with triggers disabled.
+    """
+    help = 'Rebuild the full-text search index over tasks and comments.'
+
+    def handle(self, *args, **options):
+        count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} tasks.'))
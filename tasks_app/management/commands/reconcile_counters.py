@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tasks_app.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    """
+    Repair drift in the denormalized board and task counters.
+
+    - Compares every stored counter with the live count.
+    - Rewrites only drifted rows, in bulk.
+    """
+    help = 'Recompute drifted task counters on boards and comment counters on tasks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='board_ids',
+                            help='Only reconcile this board (can be repeated).')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            boards, tasks = reconcile_counters(board_ids=options['board_ids'], dry_run=options['dry_run'])
+
+        action = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'{action} drift on {boards} boards and {tasks} tasks.'))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:26
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, group_field):
+    counts = queryset.order_by().values(group_field).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def fill_counters(apps, schema_editor):
+    Board = apps.get_model('boards_app', 'Board')
+    Task = apps.get_model('tasks_app', 'Task')
+    Comment = apps.get_model('tasks_app', 'Comment')
+
+    tasks = Task.objects.filter(board_id=OuterRef('pk'))
+    Board.objects.update(
+        tasks_to_do_count=count_subquery(tasks.filter(status='to-do'), 'board_id'),
+        tasks_in_progress_count=count_subquery(tasks.filter(status='in-progress'), 'board_id'),
+        tasks_review_count=count_subquery(tasks.filter(status='review'), 'board_id'),
+        tasks_done_count=count_subquery(tasks.filter(status='done'), 'board_id'),
+        tasks_high_prio_count=count_subquery(tasks.filter(priority='high'), 'board_id'),
+    )
+    Task.objects.update(
+        comment_count=count_subquery(Comment.objects.filter(task_id=OuterRef('pk')), 'task_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0002_board_task_counters'),
+        ('tasks_app', '0003_alter_task_board_alter_task_due_date_comment_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+from django.db import migrations
+
+CREATE_TABLE = """
+    CREATE VIRTUAL TABLE tasks_app_task_search USING fts5(
+        board, title, description, comments,
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+# Comments are indexed as one column of their task
+COMMENTS_OF_TASK = """
+    COALESCE((SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = {task_id}), '')
+"""
+
+CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER tasks_app_task_search_insert AFTER INSERT ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_search (rowid, board, title, description, comments)
+        VALUES (new.id, 'b' || new.board_id, new.title, new.description, '');
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_app_task_search_update AFTER UPDATE OF board_id, title, description ON tasks_app_task
+    BEGIN
+        UPDATE tasks_app_task_search
+        SET board = 'b' || new.board_id, title = new.title, description = new.description
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_app_task_search_delete AFTER DELETE ON tasks_app_task BEGIN
+        DELETE FROM tasks_app_task_search WHERE rowid = old.id;
+    END
+    """,
+    # New comments are appended instead of concatenating all comments again
+    """
+    CREATE TRIGGER tasks_app_comment_search_insert AFTER INSERT ON tasks_app_comment BEGIN
+        UPDATE tasks_app_task_search SET comments = comments || ' ' || new.content
+        WHERE rowid = new.task_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_app_comment_search_update AFTER UPDATE OF content ON tasks_app_comment BEGIN
+        UPDATE tasks_app_task_search SET comments = {COMMENTS_OF_TASK.format(task_id='new.task_id')}
+        WHERE rowid = new.task_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_app_comment_search_delete AFTER DELETE ON tasks_app_comment BEGIN
+        UPDATE tasks_app_task_search SET comments = {COMMENTS_OF_TASK.format(task_id='old.task_id')}
+        WHERE rowid = old.task_id;
+    END
+    """,
+]
+
+DROP_TRIGGERS = [
+    f'DROP TRIGGER IF EXISTS {name}' for name in (
+        'tasks_app_task_search_insert', 'tasks_app_task_search_update', 'tasks_app_task_search_delete',
+        'tasks_app_comment_search_insert', 'tasks_app_comment_search_update', 'tasks_app_comment_search_delete',
+    )
+]
+
+POPULATE = f"""
+    INSERT INTO tasks_app_task_search (rowid, board, title, description, comments)
+    SELECT task.id, 'b' || task.board_id, task.title, task.description,
+           {COMMENTS_OF_TASK.format(task_id='task.id')}
+    FROM tasks_app_task AS task
+"""
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text search over tasks and their comments (SQLite FTS5).
+    """
+
+    dependencies = [
+        ('tasks_app', '0006_sync_tracking'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TABLE, 'DROP TABLE tasks_app_task_search'),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(POPULATE, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 20:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0004_membership_change'),
+        ('tasks_app', '0007_task_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assignee', 'status', 'priority', 'due_date'], name='task_assignee_summary_idx'),
+        ),
+    ]
@@ -1,7 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
-from boards_app.models import Board
+from boards_app.models import Board, savable_fields
 
 
 # Task status options
@@ -27,15 +27,81 @@ class Task(models.Model):
     - Each task belongs to a board.
     - Has an assignee and optionally a reviewer.
     - Tracks status, priority, and due date.
+    - Keeps a denormalized comment count, maintained by tasks_app.counters.
+    - Tracks its last change, including changes to its comments, for delta sync.
     """
-    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tasks')
+    # The board, assignee and reviewer lookups are served by the composite
+    # indexes in Meta, so the single-column foreign key indexes are dropped.
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tasks', db_index=False)
     title = models.CharField(max_length=255)
     description = models.TextField()
     status = models.CharField(max_length=11, choices=STATUS_CHOICES)
     priority = models.CharField(max_length=6, choices=PRIORITY_CHOICES)
-    assignee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='assigned_tasks', null=True, blank=True)
-    reviewer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviewed_tasks', null=True, blank=True)
+    assignee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='assigned_tasks', null=True, blank=True,
+                                 db_index=False)
+    reviewer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviewed_tasks', null=True, blank=True,
+                                 db_index=False)
     due_date = models.DateField()
+    comment_count = models.IntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+            models.Index(fields=['board', 'updated_at'], name='task_board_updated_at_idx'),
+            models.Index(fields=['board', 'priority'], name='task_board_priority_idx'),
+            models.Index(fields=['assignee', 'due_date'], name='task_assignee_due_date_idx'),
+            # Covers every column the dashboard summary aggregates
+            models.Index(fields=['assignee', 'status', 'priority', 'due_date'], name='task_assignee_summary_idx'),
+            models.Index(fields=['reviewer', 'due_date'], name='task_reviewer_due_date_idx'),
+        ]
+
+    # (board_id, status, priority) as last read from or written to the
+    # database; the counter signals diff against it on save and delete.
+    counted_state = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Deferred fields are skipped; reading them would cost a query.
+        if {'board_id', 'status', 'priority'}.issubset(field_names):
+            instance.counted_state = instance.get_counted_state()
+        return instance
+
+    def get_counted_state(self):
+        return (self.board_id, self.status, self.priority)
+
+    def lock_counted_state(self):
+        """
+        Re-read the counted state of the stored row and lock it until the transaction ends.
+
+        - The counter signals then diff against the row being overwritten,
+          not against a copy loaded before a concurrent change.
+        - SQLite ignores FOR UPDATE; its write lock serializes the
+          transaction instead (taken up front in the production profile).
+        """
+        self.counted_state = (
+            Task._base_manager.select_for_update().filter(pk=self.pk)
+            .values_list('board_id', 'status', 'priority').first()
+        )
+
+    def save(self, *args, **kwargs):
+        # comment_count is maintained with F() updates; never write back a stale value
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = savable_fields(self, ('comment_count',))
+        # Keep the row and the board counters in one transaction
+        with transaction.atomic():
+            if self.pk is not None:
+                self.lock_counted_state()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            self.lock_counted_state()
+            if self.counted_state is None:
+                # Deleted concurrently; its counters are already gone
+                return 0, {}
+            return super().delete(*args, **kwargs)
 
 
 class Comment(models.Model):
@@ -44,9 +110,46 @@ class Comment(models.Model):
 
     - Each comment is authored by a user.
     - Linked to a specific task.
-    - Creation timestamp is auto-generated.
+    - Creation and change timestamps are auto-generated.
     """
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='author_comments')
-    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='task_comments')
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='task_comments', db_index=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='comment_task_created_at_idx'),
+            models.Index(fields=['task', 'updated_at'], name='comment_task_updated_at_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Keep the row and the task's comment count in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+# Kinds of deleted rows recorded for delta sync
+TOMBSTONE_KINDS = [
+    ('task', 'Task'),
+    ('comment', 'Comment'),
+]
+
+
+class Tombstone(models.Model):
+    """
+    Record of a task or comment that left a board.
+
+    - Written when a task or comment is deleted, or a task moves to another board.
+    - Read by the delta sync endpoint; pruned by the prune_sync_log command.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tombstones', db_index=False)
+    kind = models.CharField(max_length=7, choices=TOMBSTONE_KINDS)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'deleted_at'], name='tombstone_board_deleted_idx'),
+        ]
@@ -0,0 +1,80 @@
+import re
+
+from django.db import connection, transaction
+
+# FTS5 table over tasks and their comments, one row per task (rowid = task id).
+# Created and kept in sync by SQL triggers in migration 0007, so bulk
+# inserts and queryset updates are indexed as well.
+SEARCH_TABLE = 'tasks_app_task_search'
+
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+# Terms of a query; longer queries are cut off
+MAX_TERMS = 8
+# bm25 weights per column: board, title, description, comments
+RANK_WEIGHTS = (0.0, 10.0, 4.0, 1.0)
+
+TERM_PATTERN = re.compile(r'\w+')
+
+REBUILD_SQL = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, board, title, description, comments)
+    SELECT task.id, 'b' || task.board_id, task.title, task.description,
+           COALESCE((SELECT group_concat(content, ' ') FROM tasks_app_comment WHERE task_id = task.id), '')
+    FROM tasks_app_task AS task
+"""
+
+
+def board_token(board_id):
+    # Indexed with the task, so the board filter is part of the MATCH
+    return f'b{board_id}'
+
+
+def match_expression(query, board_ids):
+    """
+    Build an FTS5 MATCH expression from user input, or None if it has no terms.
+
+    - Every term must match; the last one also matches as a prefix,
+      so results show up while typing.
+    - Terms are quoted, so FTS5 operators in the input are plain text.
+    - Results are limited to the given boards inside the full-text
+      query, so only matching tasks of those boards are ranked.
+    """
+    terms = TERM_PATTERN.findall(query)[:MAX_TERMS]
+    if not terms or not board_ids:
+        return None
+    phrases = [f'"{term}"' for term in terms]
+    phrases[-1] += '*'
+    boards = ' OR '.join(board_token(board_id) for board_id in sorted(board_ids))
+    return f'board : ({boards}) AND {{title description comments}} : ({" AND ".join(phrases)})'
+
+
+def search_task_ids(query, board_ids, limit=SEARCH_LIMIT):
+    """
+    Return the ids of the tasks on the given boards that match the query,
+    best match first.
+    """
+    expression = match_expression(query, board_ids)
+    if expression is None:
+        return []
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    weights = ', '.join(str(weight) for weight in RANK_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s '
+            f'ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s',
+            [expression, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def rebuild_search_index():
+    """
+    Refill the search table from the task and comment tables and
+    merge its index segments. Returns the number of indexed tasks.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(REBUILD_SQL)
+        count = cursor.rowcount
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')")
+    return count
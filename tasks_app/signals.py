@@ -0,0 +1,114 @@
+from weakref import WeakKeyDictionary
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from boards_app import events, sync
+from boards_app.models import Board
+from boards_app.versioning import bump_versions
+from tasks_app import counters
+from tasks_app.models import Comment, Task
+
+
+# Board and task ids of running deletes, per delete origin (the instance
+# or queryset delete() was called on). Entries go away with the origin.
+_deleting = WeakKeyDictionary()
+
+
+def deleted_along_with(origin, model, pk):
+    """
+    Return True if the delete started from origin also removes this board or task.
+    """
+    if origin is None:
+        return False
+    return pk in _deleting.get(origin, {}).get(model, ())
+
+
+@receiver(pre_delete, sender=Board)
+@receiver(pre_delete, sender=Task)
+def remember_deleted(sender, instance, origin=None, **kwargs):
+    # Every pre_delete of a delete is sent before its first post_delete
+    if origin is not None:
+        _deleting.setdefault(origin, {}).setdefault(sender, set()).add(instance.pk)
+
+
+def board_of_task(task_id):
+    return Task.objects.filter(pk=task_id).values_list('board_id', flat=True).first()
+
+
+@receiver(post_save, sender=Task)
+def update_counters_on_task_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep the board counters in sync when a task is created, moved or reprioritized,
+    and bump the version of every board the task touched.
+    """
+    if raw:
+        return
+
+    current = instance.get_counted_state()
+    previous = None if created else instance.counted_state
+    instance.counted_state = current
+
+    if previous == current:
+        # Counters are unchanged, but the task itself is not
+        counters.apply_board_deltas(instance.board_id, {})
+        return
+
+    board_id, status, priority = current
+    deltas = counters.task_counter_deltas(status, priority, 1)
+    if previous is None:
+        counters.apply_board_deltas(board_id, deltas)
+        return
+
+    previous_board_id, previous_status, previous_priority = previous
+    previous_deltas = counters.task_counter_deltas(previous_status, previous_priority, -1)
+    if previous_board_id == board_id:
+        deltas.update(previous_deltas)
+    else:
+        counters.apply_board_deltas(previous_board_id, previous_deltas)
+        # For clients of the old board, the task is gone
+        sync.record_tombstone(previous_board_id, 'task', instance.pk)
+        events.publish(previous_board_id, 'task.deleted', task=instance.pk)
+    counters.apply_board_deltas(board_id, deltas)
+
+
+@receiver(post_save, sender=Task)
+def publish_task_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        events.publish(instance.board_id, 'task.created' if created else 'task.updated', task=instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+def update_counters_on_task_delete(sender, instance, origin=None, **kwargs):
+    board_id, status, priority = instance.counted_state or instance.get_counted_state()
+    # Nothing to count when the board is deleted as well, e.g. with its owner
+    if deleted_along_with(origin, Board, board_id):
+        return
+    counters.apply_board_deltas(board_id, counters.task_counter_deltas(status, priority, -1))
+    sync.record_tombstone(board_id, 'task', instance.pk)
+    events.publish(board_id, 'task.deleted', task=instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def update_counters_on_comment_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    counters.apply_comment_delta(instance.task_id, 1 if created else 0)
+    board_id = board_of_task(instance.task_id)
+    if board_id is not None:
+        bump_versions(Board.objects.filter(pk=board_id))
+        events.publish(board_id, 'comment.created' if created else 'comment.updated',
+                       task=instance.task_id, comment=instance.pk)
+
+
+@receiver(post_delete, sender=Comment)
+def update_counters_on_comment_delete(sender, instance, origin=None, **kwargs):
+    # Nothing to count when the task is deleted as well, by itself or with its board
+    if deleted_along_with(origin, Task, instance.task_id):
+        return
+    counters.apply_comment_delta(instance.task_id, -1)
+    board_id = board_of_task(instance.task_id)
+    if board_id is not None:
+        bump_versions(Board.objects.filter(pk=board_id))
+        sync.record_tombstone(board_id, 'comment', instance.pk)
+        events.publish(board_id, 'comment.deleted', task=instance.task_id, comment=instance.pk)
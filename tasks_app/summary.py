@@ -0,0 +1,29 @@
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from tasks_app.counters import STATUS_COUNTER_FIELDS
+from tasks_app.models import Task
+
+# Tasks that still need work; done tasks are neither urgent nor due
+OPEN = ~Q(status='done')
+
+
+def task_summary(user_id, today=None):
+    """
+    Count the tasks assigned to a user, in one conditional-aggregate query.
+
+    - Task counts per status, the total, and the urgent (high priority,
+      not done) tasks.
+    - The next due date of an open task from today on, or None.
+    - Reads only the user's entries of task_assignee_summary_idx
+      (assignee, status, priority, due_date), which covers the query;
+      no task rows are read or sent to Python.
+    """
+    today = today or timezone.localdate()
+    aggregates = {field: Count('pk', filter=Q(status=status)) for status, field in STATUS_COUNTER_FIELDS.items()}
+    return Task.objects.filter(assignee_id=user_id).aggregate(
+        task_count=Count('pk'),
+        **aggregates,
+        tasks_urgent_count=Count('pk', filter=Q(priority='high') & OPEN),
+        upcoming_deadline=Min('due_date', filter=Q(due_date__gte=today) & OPEN),
+    )
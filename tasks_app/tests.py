@@ -1,3 +1,815 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from auth_app.authentication import token_cache
+from boards_app.api.serializers import BoardDetailReadSerializer, TaskInBoardSerializer
+from boards_app.models import Board
+from core.testing import LARGE_SEED, FixtureMixin, QueryBudgetTestCase
+from tasks_app import counters
+from tasks_app.api.readers import render_tasks, task_values
+from tasks_app.api.serializers import TaskListFilterSerializer, TaskReadSerializer
+from tasks_app.api.views import task_list_queryset
+from tasks_app.models import Comment, Task
+from tasks_app.search import SEARCH_TABLE
+
+
+class CounterTests(APITestCase):
+    """
+    Tests for the denormalized board and task counters.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@example.com', email='user@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+
+    def create_task(self, status='to-do', priority='low'):
+        return Task.objects.create(board=self.board, title='Task', description='', status=status,
+                                   priority=priority, due_date=date(2026, 1, 1))
+
+    def assertBoardCounters(self, to_do=0, in_progress=0, review=0, done=0, high=0):
+        self.board.refresh_from_db()
+        self.assertEqual(
+            (self.board.tasks_to_do_count, self.board.tasks_in_progress_count,
+             self.board.tasks_review_count, self.board.tasks_done_count, self.board.tasks_high_prio_count),
+            (to_do, in_progress, review, done, high),
+        )
+
+    def test_task_create_move_and_delete(self):
+        task = self.create_task(priority='high')
+        self.create_task(status='review')
+        self.assertBoardCounters(to_do=1, review=1, high=1)
+
+        response = self.client.patch(reverse('tasks_update_delete', kwargs={'pk': task.pk}),
+                                     {'status': 'done', 'priority': 'medium'})
+        self.assertEqual(response.status_code, 200)
+        self.assertBoardCounters(review=1, done=1)
+
+        self.client.delete(reverse('tasks_update_delete', kwargs={'pk': task.pk}))
+        self.assertBoardCounters(review=1)
+        self.assertEqual(self.board.ticket_count, 1)
+
+    def test_saves_from_stale_instances(self):
+        task = self.create_task()
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+
+        first.status = 'done'
+        first.save()
+        # Loaded before the first save, so it still holds status 'to-do'
+        second.status = 'review'
+        second.priority = 'high'
+        second.save()
+        self.assertBoardCounters(review=1, high=1)
+
+        Task.objects.get(pk=task.pk).delete()
+        first.delete()
+        self.assertBoardCounters()
+        self.assertEqual(counters.reconcile_counters(dry_run=True), (0, 0))
+
+    def test_comment_add_and_delete(self):
+        task = self.create_task()
+        self.client.post(reverse('comments', kwargs={'task_id': task.pk}), {'content': 'One'})
+        response = self.client.post(reverse('comments', kwargs={'task_id': task.pk}), {'content': 'Two'})
+        task.refresh_from_db()
+        self.assertEqual(task.comment_count, 2)
+
+        self.client.delete(reverse('comments_delete', kwargs={'task_id': task.pk, 'pk': response.data['id']}))
+        task.refresh_from_db()
+        self.assertEqual(task.comment_count, 1)
+
+    def test_reconcile_repairs_drift(self):
+        task = self.create_task(priority='high')
+        Comment.objects.create(task=task, author=self.user, content='Hi')
+        Board.objects.update(tasks_to_do_count=7, tasks_high_prio_count=0)
+        Task.objects.update(comment_count=5)
+
+        output = StringIO()
+        call_command('reconcile_counters', stdout=output)
+
+        self.assertIn('1 boards and 1 tasks', output.getvalue())
+        self.assertBoardCounters(to_do=1, high=1)
+        task.refresh_from_db()
+        self.assertEqual(task.comment_count, 1)
+
+
+class TaskListETagTests(APITestCase):
+    """
+    Tests for conditional GETs of the assigned and reviewing task lists.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner@example.com', email='owner@example.com')
+        self.other = User.objects.create_user(username='other@example.com', email='other@example.com')
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user, self.other)
+        self.task = Task.objects.create(board=self.board, title='Task', description='', status='to-do',
+                                        priority='low', assignee=self.user, reviewer=self.other,
+                                        due_date=date(2026, 1, 1))
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def get(self, etag=None, name='tasks_assigned', **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse(name), params, **headers)
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.get()['ETag']
+
+        response = self.get(etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_task_and_comment_changes_change_the_etag(self):
+        etag = self.get()['ETag']
+        self.task.title = 'Renamed'
+        self.task.save()
+        self.assertEqual(self.get(etag).status_code, 200)
+
+        etag = self.get()['ETag']
+        Comment.objects.create(task=self.task, author=self.other, content='Hi')
+        response = self.get(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['comments_count'], 1)
+
+    def test_reassigned_task_changes_the_etag(self):
+        etag = self.get()['ETag']
+        self.task.assignee = self.other
+        self.task.save()
+
+        response = self.get(etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [])
+
+    def test_etag_depends_on_the_query(self):
+        etag = self.get()['ETag']
+
+        self.assertEqual(self.get(etag, page_size=1).status_code, 200)
+        self.assertEqual(self.get(etag, name='tasks_reviewing').status_code, 200)
+
+
+class BulkTaskTests(FixtureMixin, APITestCase):
+    """
+    Tests for the bulk task endpoint.
+    """
+
+    def setUp(self):
+        super().setUp()
+        other = User.objects.create_user(username='other@example.com')
+        self.foreign_board = Board.objects.create(title='Foreign', owner=other)
+
+    def create_item(self, **overrides):
+        item = {'board': self.board.pk, 'title': 'Task', 'description': 'Text', 'status': 'to-do',
+                'priority': 'high', 'assignee_id': self.user.pk, 'reviewer_id': self.user.pk,
+                'due_date': '2026-01-01'}
+        item.update(overrides)
+        return item
+
+    def test_mixed_batch(self):
+        moved = self.create_task()
+        deleted = self.create_task(status='review')
+        foreign = self.create_task(board=self.foreign_board)
+
+        response = self.client.post(reverse('tasks_bulk'), {
+            'create': [self.create_item(), self.create_item(board=self.foreign_board.pk), {'title': 'Incomplete'}],
+            'update': [{'id': moved.pk, 'status': 'done', 'priority': 'high'}, {'id': foreign.pk, 'status': 'done'}],
+            'delete': [deleted.pk, 999999],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['status'] for item in response.data['create']], ['created', 'error', 'error'])
+        self.assertEqual([item['status'] for item in response.data['update']], ['updated', 'error'])
+        self.assertEqual([item['status'] for item in response.data['delete']], ['deleted', 'error'])
+        self.assertEqual(response.data['update'][0]['task']['status'], 'done')
+        self.assertFalse(Task.objects.filter(pk=deleted.pk).exists())
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'to-do')
+
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.tasks_to_do_count, self.board.tasks_review_count,
+                          self.board.tasks_done_count, self.board.tasks_high_prio_count), (1, 0, 1, 2))
+
+    def test_owner_outside_the_member_list(self):
+        self.board.members.remove(self.user)
+        updated = self.create_task()
+        deleted = self.create_task()
+
+        response = self.client.post(reverse('tasks_bulk'), {
+            'create': [self.create_item()],
+            'update': [{'id': updated.pk, 'status': 'done'}],
+            'delete': [deleted.pk],
+        }, format='json')
+
+        self.assertEqual([item['status'] for operation in ('create', 'update', 'delete')
+                          for item in response.data[operation]], ['created', 'updated', 'deleted'])
+
+    def test_unknown_user_is_reported(self):
+        response = self.client.post(reverse('tasks_bulk'), {'create': [self.create_item(assignee_id=999999)]},
+                                    format='json')
+
+        self.assertEqual(response.data['create'][0]['errors'], {'assignee_id': ['User not found.']})
+        self.assertFalse(Task.objects.exists())
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        url = reverse('tasks_bulk')
+        for size in (2, 20):
+            tasks = [self.create_task() for _ in range(size)]
+            payload = {
+                'create': [self.create_item() for _ in range(size)],
+                'update': [{'id': task.pk, 'status': 'done'} for task in tasks],
+            }
+            token_cache.clear()
+            with self.assertNumQueries(10):
+                response = self.client.post(url, payload, format='json')
+            self.assertEqual(len(response.data['update']), size)
+
+
+class TaskSearchTests(APITestCase):
+    """
+    Tests for the full-text task search and its trigger-maintained index.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@example.com', email='user@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        other = User.objects.create_user(username='other@example.com')
+        self.foreign_board = Board.objects.create(title='Foreign', owner=other)
+
+    def create_task(self, title, description='', board=None):
+        return Task.objects.create(board=board or self.board, title=title, description=description,
+                                   status='to-do', priority='low', due_date=date(2026, 1, 1))
+
+    def search(self, query, **params):
+        response = self.client.get(reverse('tasks_search'), {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [task['id'] for task in response.data]
+
+    def test_title_matches_rank_first(self):
+        in_comment = self.create_task('Deploy')
+        Comment.objects.create(task=in_comment, author=self.user, content='The login page is broken')
+        in_description = self.create_task('Fix form', 'Login fails for new users')
+        in_title = self.create_task('Login page')
+        self.create_task('Unrelated')
+
+        self.assertEqual(self.search('login'), [in_title.pk, in_description.pk, in_comment.pk])
+
+    def test_only_member_boards_are_searched(self):
+        task = self.create_task('Release notes')
+        self.create_task('Release plan', board=self.foreign_board)
+
+        self.assertEqual(self.search('release'), [task.pk])
+
+    def test_owner_outside_the_member_list_is_searched(self):
+        task = self.create_task('Release notes')
+        self.board.members.remove(self.user)
+
+        self.assertEqual(self.search('release'), [task.pk])
+
+    def test_all_terms_must_match_and_last_is_a_prefix(self):
+        task = self.create_task('Refactor payment service')
+        self.create_task('Refactor login')
+
+        self.assertEqual(self.search('refactor paym'), [task.pk])
+        self.assertEqual(self.search('pay*ment OR "refactor" -login'), [])
+
+    def test_index_follows_changes(self):
+        task = self.create_task('Draft')
+        comment = Comment.objects.create(task=task, author=self.user, content='Needs a changelog')
+        self.assertEqual(self.search('changelog'), [task.pk])
+
+        comment.delete()
+        task.title = 'Final'
+        task.save()
+        self.assertEqual(self.search('changelog'), [])
+        self.assertEqual(self.search('draft'), [])
+        self.assertEqual(self.search('final'), [task.pk])
+
+        Task.objects.filter(pk=task.pk).update(board=self.foreign_board)
+        self.assertEqual(self.search('final'), [])
+
+        task.delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('final'), [])
+
+    def test_rebuild(self):
+        task = self.create_task('Backup restore')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        self.assertEqual(self.search('backup'), [])
+
+        stdout = StringIO()
+        call_command('rebuild_search_index', stdout=stdout)
+
+        self.assertIn('Indexed 1 tasks.', stdout.getvalue())
+        self.assertEqual(self.search('backup'), [task.pk])
+
+    def test_limit(self):
+        for number in range(5):
+            self.create_task(f'Task {number}')
+
+        self.assertEqual(len(self.search('task', limit=3)), 3)
+        response = self.client.get(reverse('tasks_search'), {'q': 'task', 'limit': 'all'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_is_required(self):
+        response = self.client.get(reverse('tasks_search'), {'q': ' '})
+        self.assertEqual(response.status_code, 400)
+
+
+class SummaryTests(APITestCase):
+    """
+    Tests for the dashboard summary endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@example.com', email='user@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.board.members.add(self.user)
+        other = User.objects.create_user(username='other@example.com')
+        self.foreign_board = Board.objects.create(title='Foreign', owner=other)
+        today = timezone.localdate()
+        rows = [('to-do', 'high', 5), ('to-do', 'low', 2), ('in-progress', 'high', -1), ('review', 'medium', 9),
+                ('done', 'high', 1)]
+        for status, priority, days in rows:
+            self.create_task(status=status, priority=priority, due_date=today + timedelta(days=days))
+        # Assigned on a board the user is not a member of, and not assigned at all
+        self.create_task(board=self.foreign_board, due_date=today + timedelta(days=3))
+        self.create_task(assignee=other, due_date=today)
+
+    def create_task(self, **fields):
+        defaults = {'board': self.board, 'title': 'Task', 'description': '', 'status': 'to-do',
+                    'priority': 'low', 'assignee': self.user}
+        defaults.update(fields)
+        return Task.objects.create(**defaults)
+
+    def test_summary(self):
+        response = self.client.get(reverse('summary'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'task_count': 6,
+            'tasks_to_do_count': 3,
+            'tasks_in_progress_count': 1,
+            'tasks_review_count': 1,
+            'tasks_done_count': 1,
+            'tasks_urgent_count': 2,
+            'upcoming_deadline': timezone.localdate() + timedelta(days=2),
+            'board_count': 1,
+        })
+
+    def test_board_count_matches_the_board_list(self):
+        # The owner left the member list, but still sees the board
+        self.board.members.remove(self.user)
+        Board.objects.create(title='Member only', owner=self.foreign_board.owner).members.add(self.user)
+
+        summary = self.client.get(reverse('summary')).data
+        boards = self.client.get(reverse('boards')).data
+
+        self.assertEqual(summary['board_count'], 2)
+        self.assertEqual(summary['board_count'], len(boards))
+
+    def test_without_tasks(self):
+        Task.objects.all().delete()
+
+        response = self.client.get(reverse('summary'))
+
+        self.assertEqual(response.data['task_count'], 0)
+        self.assertIsNone(response.data['upcoming_deadline'])
+
+    def test_etag_follows_task_changes(self):
+        etag = self.client.get(reverse('summary'))['ETag']
+        self.assertEqual(self.client.get(reverse('summary'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        task = self.board.tasks.filter(status='to-do').first()
+        task.status = 'done'
+        task.save()
+
+        response = self.client.get(reverse('summary'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tasks_done_count'], 2)
+
+    def test_query_count_does_not_grow_with_tasks(self):
+        for size in (1, 200):
+            Task.objects.bulk_create([
+                Task(board=self.board, title='Bulk', description='', status='to-do', priority='low',
+                     assignee=self.user, due_date=date(2026, 1, 1))
+                for _ in range(size)
+            ])
+            token_cache.clear()
+            with self.assertNumQueries(4):
+                self.client.get(reverse('summary'))
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class QueryPlanTests(APITestCase):
+    """
+    Asserts that the main query of each hot endpoint uses its composite index,
+    so model changes cannot silently bring back full table scans.
+
+    - The plans are taken from the SQL a real request sends, so the tests
+      follow the view, filter and pagination code.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='user@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.user)
+        cls.board.members.add(cls.user)
+        cls.task = Task.objects.create(board=cls.board, title='Task', description='', status='to-do',
+                                       priority='high', due_date=date(2026, 1, 1), assignee=cls.user,
+                                       reviewer=cls.user)
+        Comment.objects.create(task=cls.task, author=cls.user, content='Comment')
+
+    def setUp(self):
+        cache.clear()
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def query_plans(self, run):
+        """
+        Run a callable and return the EXPLAIN QUERY PLAN of every SELECT it sent, in order.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            run()
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if query['sql'].startswith('SELECT'):
+                    cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                    plans.append((query['sql'], ' '.join(str(row[-1]) for row in cursor.fetchall())))
+        return plans
+
+    def request_plans(self, url, data=None):
+        def run():
+            response = self.client.get(url, data)
+            self.assertEqual(response.status_code, 200)
+        return self.query_plans(run)
+
+    def main_plan(self, plans, table):
+        """
+        Return the plan of the last query reading `table`.
+        """
+        reading = [plan for sql, plan in plans if f'FROM {table} ' in sql.replace('"', '')]
+        self.assertTrue(reading, f'No query reads {table}')
+        return reading[-1]
+
+    def assertNoTableScans(self, plans):
+        for sql, plan in plans:
+            # The search table is a virtual table, queried through MATCH
+            self.assertNotRegex(plan, r'SCAN tasks_app_[a-z]+\b(?! VIRTUAL)', sql)
+
+    def assertUsesIndex(self, plans, table, index_name):
+        self.assertIn(f'INDEX {index_name}', self.main_plan(plans, table))
+        self.assertNoTableScans(plans)
+
+    def test_assigned_tasks(self):
+        plans = self.request_plans(reverse('tasks_assigned'), {'ordering': 'due_date'})
+        self.assertUsesIndex(plans, 'tasks_app_task', 'task_assignee_due_date_idx')
+        self.assertNotIn('TEMP B-TREE', self.main_plan(plans, 'tasks_app_task'))
+
+        # Unordered, any index on the assignee serves the list
+        plans = self.request_plans(reverse('tasks_assigned'))
+        self.assertRegex(self.main_plan(plans, 'tasks_app_task'), r'SEARCH tasks_app_task USING INDEX task_assignee_\w+ \(assignee_id=\?\)')
+
+    def test_reviewing_tasks(self):
+        plans = self.request_plans(reverse('tasks_reviewing'), {'ordering': 'due_date'})
+        self.assertUsesIndex(plans, 'tasks_app_task', 'task_reviewer_due_date_idx')
+        self.assertNotIn('TEMP B-TREE', self.main_plan(plans, 'tasks_app_task'))
+
+    def test_filtered_and_paginated_task_lists(self):
+        params = {'status': 'to-do', 'due_date_after': '2026-01-01', 'ordering': '-due_date', 'page_size': 10}
+        plans = self.request_plans(reverse('tasks_assigned'), params)
+        self.assertUsesIndex(plans, 'tasks_app_task', 'task_assignee_due_date_idx')
+        self.assertNotIn('TEMP B-TREE', self.main_plan(plans, 'tasks_app_task'))
+
+    def test_summary(self):
+        plans = self.request_plans(reverse('summary'))
+        self.assertUsesIndex(plans, 'tasks_app_task', 'task_assignee_summary_idx')
+        self.assertIn('COVERING INDEX task_assignee_summary_idx', self.main_plan(plans, 'tasks_app_task'))
+
+    def test_board_counters(self):
+        plans = self.query_plans(lambda: counters.reconcile_counters(board_ids=[self.board.pk], dry_run=True))
+        counter_plans = ' '.join(plan for sql, plan in plans)
+        self.assertIn('INDEX task_board_status_idx', counter_plans)
+        self.assertIn('INDEX task_board_priority_idx', counter_plans)
+        self.assertNoTableScans(plans)
+
+    def test_comments(self):
+        plans = self.request_plans(reverse('comments', kwargs={'task_id': self.task.pk}))
+        self.assertUsesIndex(plans, 'tasks_app_comment', 'comment_task_created_at_idx')
+
+    def test_board_changes(self):
+        since = self.client.get(reverse('boards_changes', kwargs={'pk': self.board.pk})).data['next']
+        plans = self.request_plans(reverse('boards_changes', kwargs={'pk': self.board.pk}), {'since': since})
+        self.assertUsesIndex(plans, 'tasks_app_task', 'task_board_updated_at_idx')
+        self.assertUsesIndex(plans, 'tasks_app_comment', 'comment_task_updated_at_idx')
+        self.assertUsesIndex(plans, 'tasks_app_tombstone', 'tombstone_board_deleted_idx')
+        self.assertUsesIndex(plans, 'boards_app_membershipchange', 'membership_board_changed_idx')
+
+    def test_search(self):
+        plans = self.request_plans(reverse('tasks_search'), {'q': 'Task'})
+        self.assertIn(f'SCAN {SEARCH_TABLE} VIRTUAL TABLE INDEX', self.main_plan(plans, SEARCH_TABLE))
+        self.assertNoTableScans(plans)
+
+
+class FastReadPathTests(APITestCase):
+    """
+    The compiled read path must render byte-for-byte the same JSON as the serializers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_kanmind', seed=1, stdout=StringIO(), users=12, boards=2, members_per_board=6,
+                     tasks_per_board=40, comments_per_task=1)
+        cls.board = Board.objects.order_by('pk').first()
+        cls.user = cls.board.owner
+        # Nested users may be missing, and text may be non-ASCII
+        Task.objects.create(board=cls.board, title='Überprüfen "quotes"', description='Zeile\nzwei',
+                            status='review', priority='high', due_date=date(2026, 2, 28), assignee=cls.user)
+        Task.objects.create(board=cls.board, title='Unassigned', description='', status='to-do',
+                            priority='low', due_date=date(2026, 3, 1), reviewer=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        token, created = Token.objects.get_or_create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_task_read_shape(self):
+        tasks = task_list_queryset().order_by('id')
+
+        self.assertEqual(self.render(render_tasks(task_values(tasks))),
+                         self.render(TaskReadSerializer(tasks, many=True).data))
+
+    def test_task_in_board_shape(self):
+        tasks = task_list_queryset().order_by('id')
+
+        self.assertEqual(self.render(render_tasks(task_values(tasks), include_board=False)),
+                         self.render(TaskInBoardSerializer(tasks, many=True).data))
+
+    def test_task_list_endpoints(self):
+        for name, field in (('tasks_assigned', 'assignee'), ('tasks_reviewing', 'reviewer')):
+            tasks = task_list_queryset().filter(**{field: self.user})
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.content, self.render(TaskReadSerializer(tasks, many=True).data))
+
+            page = self.client.get(reverse(name), {'page_size': 5})
+            expected = TaskReadSerializer(tasks.order_by('due_date', 'id')[:5], many=True).data
+            self.assertEqual(self.render(page.data['results']), self.render(expected))
+
+    def test_board_detail(self):
+        board = Board.objects.prefetch_related(
+            'members', Prefetch('tasks', queryset=task_list_queryset())).get(pk=self.board.pk)
+
+        response = self.client.get(reverse('boards_detail', kwargs={'pk': self.board.pk}))
+
+        self.assertEqual(response.content, self.render(BoardDetailReadSerializer(board).data))
+
+
+class KeysetPaginationTests(APITestCase):
+    """
+    Tests for the opt-in cursor pagination of task and comment lists.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@example.com', email='user@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        board = Board.objects.create(title='Board', owner=self.user)
+        board.members.add(self.user)
+        # Several tasks share a due date, so the id tie-breaker matters.
+        for day in [3, 1, 2, 1, 3, 1, 2]:
+            Task.objects.create(board=board, title=f'Day {day}', description='', status='to-do',
+                                priority='low', due_date=date(2026, 1, day), assignee=self.user)
+        self.task = Task.objects.first()
+        for number in range(5):
+            Comment.objects.create(task=self.task, author=self.user, content=f'Comment {number}')
+
+    def collect_pages(self, url, params):
+        results = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            results.extend(response.data['results'])
+            if not response.data['next']:
+                return results
+            response = self.client.get(response.data['next'])
+
+    def test_unpaginated_without_cursor_or_page_size(self):
+        response = self.client.get(reverse('tasks_assigned'))
+
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 7)
+
+    def test_task_pages_follow_due_date_and_id(self):
+        results = self.collect_pages(reverse('tasks_assigned'), {'page_size': 2})
+
+        expected = list(Task.objects.order_by('due_date', 'id').values_list('id', flat=True))
+        self.assertEqual([task['id'] for task in results], expected)
+
+    def test_comment_pages_follow_created_at_and_id(self):
+        results = self.collect_pages(reverse('comments', kwargs={'task_id': self.task.pk}), {'page_size': 2})
+
+        self.assertEqual([comment['content'] for comment in results],
+                         [f'Comment {number}' for number in range(5)])
+
+    def test_invalid_cursor(self):
+        def encode(position):
+            return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+        comments = reverse('comments', kwargs={'task_id': self.task.pk})
+        cursors = [
+            (reverse('tasks_assigned'), 'not-a-cursor'),
+            (reverse('tasks_assigned'), encode(['notadate', 1])),
+            (reverse('tasks_assigned'), encode([None, 1])),
+            (reverse('tasks_assigned'), encode(['2026-01-01', 'x'])),
+            (reverse('tasks_reviewing'), encode(['2026-13-01', 1])),
+            (reverse('tasks_assigned'), encode(['2026-01-01', 2 ** 63])),
+            (reverse('tasks_assigned'), encode(['2026-01-01', 0])),
+            (comments, encode(['2026-01-01T00:00:00', -1])),
+            (comments, encode(['notadate', 1])),
+            (comments, encode([None, 1])),
+            (comments, encode(['2026-01-01T25:00:00', 1])),
+        ]
+        for url, cursor in cursors:
+            with self.subTest(url=url, cursor=cursor):
+                self.assertEqual(self.client.get(url, {'cursor': cursor}).status_code, 404)
+
+
+class TaskListFilterTests(APITestCase):
+    """
+    Tests for the filter and ordering parameters of the task lists.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='user@example.com', email='user@example.com')
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.board = Board.objects.create(title='Board', owner=self.user)
+        self.other_board = Board.objects.create(title='Other', owner=self.user)
+        rows = [(self.board, 'to-do', 'high', 1), (self.board, 'done', 'low', 2), (self.board, 'to-do', 'low', 3),
+                (self.other_board, 'to-do', 'high', 2), (self.board, 'review', 'high', 2)]
+        for board, status, priority, day in rows:
+            Task.objects.create(board=board, title='Task', description='', status=status, priority=priority,
+                                due_date=date(2026, 1, day), assignee=self.user, reviewer=self.user)
+
+    def ids(self, queryset):
+        return list(queryset.values_list('id', flat=True))
+
+    def get_ids(self, url_name='tasks_assigned', **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        data = response.data['results'] if 'page_size' in params else response.data
+        return [task['id'] for task in data]
+
+    def test_filters_combine(self):
+        ids = self.get_ids(board=self.board.pk, status='to-do', due_date_after='2026-01-01',
+                           due_date_before='2026-01-02')
+        expected = Task.objects.filter(board=self.board, status='to-do', due_date__lte=date(2026, 1, 2))
+        self.assertEqual(ids, self.ids(expected))
+
+        ids = self.get_ids('tasks_reviewing', priority='high')
+        self.assertEqual(sorted(ids), self.ids(Task.objects.filter(priority='high').order_by('id')))
+
+    def test_descending_order_pages(self):
+        expected = self.ids(Task.objects.order_by('-due_date', '-id'))
+        self.assertEqual(self.get_ids(ordering='-due_date'), expected)
+
+        results = []
+        response = self.client.get(reverse('tasks_assigned'), {'ordering': '-due_date', 'page_size': 2})
+        while True:
+            results.extend(task['id'] for task in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(results, expected)
+
+    def test_parameters_are_validated_once_per_request(self):
+        is_valid = TaskListFilterSerializer.is_valid
+        with mock.patch.object(TaskListFilterSerializer, 'is_valid', autospec=True, side_effect=is_valid) as patched:
+            self.get_ids(ordering='-due_date', page_size=2)
+
+        # Read by the filter and by the pagination
+        self.assertEqual(patched.call_count, 1)
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'status': 'later'}, {'board': 'x'}, {'due_date_after': '2026-13-01'},
+                       {'ordering': 'title'}, {'ordering': 'priority'},
+                       {'due_date_after': '2026-01-03', 'due_date_before': '2026-01-01'}):
+            response = self.client.get(reverse('tasks_assigned'), params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn(next(iter(params)) if len(params) == 1 else 'due_date_before', response.data)
+
+
+class TaskQueryBudgetTests(QueryBudgetTestCase):
+    """
+    Query budgets for every endpoint in tasks_app/api/urls.py.
+    """
+
+    def test_create(self):
+        data = {'board': self.board.pk, 'title': 'New', 'description': 'Text', 'status': 'to-do',
+                'priority': 'low', 'assignee_id': self.user.pk, 'reviewer_id': self.user.pk,
+                'due_date': '2026-01-01'}
+        with self.assertMaxQueries(9):
+            response = self.client.post(reverse('tasks_create'), data)
+        self.assertEqual(response.status_code, 201)
+
+    def test_bulk(self):
+        item = {'board': self.board.pk, 'title': 'New', 'description': 'Text', 'status': 'to-do',
+                'priority': 'low', 'assignee_id': self.user.pk, 'reviewer_id': self.user.pk,
+                'due_date': '2026-01-01'}
+        tasks = self.board.tasks.values_list('pk', flat=True)[:3]
+        data = {'create': [item] * 3, 'update': [{'id': pk, 'status': 'done'} for pk in tasks]}
+        with self.assertMaxQueries(10):
+            response = self.client.post(reverse('tasks_bulk'), data, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_assigned(self):
+        # One of the three queries reads the board versions for the ETag
+        with self.assertMaxQueries(3):
+            response = self.client.get(reverse('tasks_assigned'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_assigned_not_modified(self):
+        etag = self.client.get(reverse('tasks_assigned'))['ETag']
+        token_cache.clear()
+        with self.assertMaxQueries(2):
+            response = self.client.get(reverse('tasks_assigned'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_reviewing(self):
+        with self.assertMaxQueries(3):
+            response = self.client.get(reverse('tasks_reviewing'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_search(self):
+        # Membership, the ranked ids from the search index, then the task rows
+        with self.assertMaxQueries(4):
+            response = self.client.get(reverse('tasks_search'), {'q': 'task'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_summary(self):
+        # Token, membership, the board versions for the ETag, then the aggregate
+        with self.assertMaxQueries(4):
+            response = self.client.get(reverse('summary'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_update(self):
+        # Includes re-reading the stored task for the counter delta
+        with self.assertMaxQueries(10):
+            response = self.client.patch(reverse('tasks_update_delete', kwargs={'pk': self.task.pk}),
+                                         {'status': 'done', 'priority': 'high'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_delete(self):
+        # Includes re-reading the stored task for the counter delta
+        with self.assertMaxQueries(9):
+            response = self.client.delete(reverse('tasks_update_delete', kwargs={'pk': self.task.pk}))
+        self.assertEqual(response.status_code, 204)
+
+    def test_comments_list(self):
+        with self.assertMaxQueries(4):
+            response = self.client.get(reverse('comments', kwargs={'task_id': self.task.pk}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_comments_create(self):
+        # Includes looking up the board, to publish the event to its streams
+        with self.assertMaxQueries(9):
+            response = self.client.post(reverse('comments', kwargs={'task_id': self.task.pk}),
+                                        {'content': 'Looks good'})
+        self.assertEqual(response.status_code, 201)
+
+    def test_comments_delete(self):
+        url = reverse('comments_delete', kwargs={'task_id': self.task.pk, 'pk': self.comment.pk})
+        with self.assertMaxQueries(8):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, 204)
+
+
+class LargeTaskQueryBudgetTests(TaskQueryBudgetTests):
+    seed = LARGE_SEED